@@ -5,6 +5,11 @@ from mongoengine import connect, disconnect
 from datetime import datetime
 from .config import get_settings
 import logging
+import threading
+import time
+
+# Start of the import-to-first-request clock reported in the startup log
+_imported_at = time.perf_counter()
 
 db = MongoEngine()
 login_manager = LoginManager()
@@ -13,8 +18,8 @@ logger = logging.getLogger(__name__)
 @login_manager.user_loader
 def load_user(user_id):
     try:
-        from .models import User
-        return User.objects(id=user_id).first()
+        from .services.user_cache import load_session_user
+        return load_session_user(user_id)
     except Exception as e:
         logger.error(f"Error loading user: {str(e)}")
         return None
@@ -41,6 +46,7 @@ def create_app():
     # Disconnect any existing connections
     disconnect()
     
+    started = time.perf_counter()
     app = Flask(__name__)
     settings = get_settings()
     
@@ -57,9 +63,14 @@ def create_app():
     
     # Initialize extensions
     db.init_app(app)
+    from .services import user_cache  # Connects the session user cache invalidation signals
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     
+    # One set of lazily built services shared by every blueprint
+    from .services.registry import ServiceRegistry
+    app.extensions['services'] = ServiceRegistry()
+    
     # Register Jinja2 filters BEFORE registering blueprints
     app.jinja_env.filters['timeago'] = timeago_filter
     
@@ -67,7 +78,7 @@ def create_app():
     from .blueprints import (
         auth_bp, dashboard_bp, content_bp, 
         comments_bp, settings_bp, posts_bp,
-        strategy_bp
+        strategy_bp, webhooks_bp
     )
     app.register_blueprint(auth_bp)
     app.register_blueprint(dashboard_bp)
@@ -76,5 +87,31 @@ def create_app():
     app.register_blueprint(settings_bp)
     app.register_blueprint(posts_bp)
     app.register_blueprint(strategy_bp)
+    app.register_blueprint(webhooks_bp)
     
+    if settings.QUERY_PLAN_CHECK:
+        # Explaining the hot queries needs MongoDB, so keep it off the startup path
+        from .services.query_plan_check import check_query_plans
+        threading.Thread(target=check_query_plans, name='query-plan-check', daemon=True).start()
+    
+    _log_first_request(app)
+    app.extensions['startup_timings'] = {
+        'create_app_ms': round((time.perf_counter() - started) * 1000),
+        'since_import_ms': round((time.perf_counter() - _imported_at) * 1000)
+    }
+    logger.info(
+        f"App created in {app.extensions['startup_timings']['create_app_ms']}ms "
+        f"({app.extensions['startup_timings']['since_import_ms']}ms since import)"
+    )
     return app
+
+def _log_first_request(app):
+    """Log how long the first request took to arrive and be served after import."""
+    state = {'logged': False}
+    
+    @app.after_request
+    def log_first_request(response):
+        if not state['logged']:
+            state['logged'] = True
+            logger.info(f"First request served {(time.perf_counter() - _imported_at) * 1000:.0f}ms after import")
+        return response
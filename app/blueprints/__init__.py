@@ -5,6 +5,7 @@ from .comments import comments_bp
 from .settings import settings_bp
 from .posts import posts_bp
 from .strategy import strategy_bp
+from .webhooks import webhooks_bp
 
 __all__ = [
     'auth_bp',
@@ -13,7 +14,8 @@ __all__ = [
     'comments_bp',
     'settings_bp',
     'posts_bp',
-    'strategy_bp'
+    'strategy_bp',
+    'webhooks_bp'
 ]
 
 def register_blueprints(app):
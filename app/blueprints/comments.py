@@ -1,31 +1,74 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from ..services.facebook_service import FacebookService
-from ..services.llm_service import LLMService
-from ..services.dashboard_service import DashboardService
-from ..models import PageProfile  # Updated import
+from ..services.registry import service_proxy
+from .sse import sse_response
+from ..models import PageProfile, DashboardSnapshot, Strategy  # Updated import
+from ..config import get_settings
+import asyncio
+import logging
 
 comments_bp = Blueprint('comments', __name__, url_prefix='/comments')
-facebook_service = FacebookService()
-llm_service = LLMService()
-dashboard_service = DashboardService()
+facebook_service = service_proxy('facebook')
+llm_service = service_proxy('llm')
+dashboard_service = service_proxy('dashboard')
+comment_store = service_proxy('comment_store')
+settings = get_settings()
+logger = logging.getLogger(__name__)
+MONITOR_COMMENT_LIMIT = 200
+POST_EXCERPT_LENGTH = 100
 
 @comments_bp.route('/monitor')
 @login_required
-def monitor():
-    posts = facebook_service.get_page_posts()
+async def monitor():
+    comments_data = await _stored_comments()
+    if comments_data is not None:
+        return render_template('comments/monitor.html', comments=comments_data)
+    
+    posts, comments_by_post = await _fetch_posts_with_comments()
     comments_data = []
     
     for post in posts.get('data', []):
-        comments = facebook_service.get_post_comments(post['id'])
+        comments = comments_by_post[post['id']]
         for comment in comments.get('data', []):
-            sentiment = llm_service.analyze_sentiment(comment['message'])
-            comment['sentiment'] = sentiment
-            comment['post_message'] = post.get('message', '')[:100] + '...'
+            comment['post_message'] = _post_excerpt(post.get('message', ''))
             comments_data.append(comment)
     
+    # Classify every comment on the page in as few LLM calls as possible
+    async with llm_service.async_client() as llm_client:
+        sentiments = await llm_service.analyze_sentiment_batch_async(
+            llm_client, [c.get('message', '') for c in comments_data]
+        )
+    for comment, sentiment in zip(comments_data, sentiments):
+        comment['sentiment'] = sentiment
+    
     return render_template('comments/monitor.html', comments=comments_data)
 
+async def _stored_comments(sentiment=None):
+    """Newest comments from the comment store, or None to fall back to a live fetch."""
+    if not settings.COMMENT_STORE_ENABLED:
+        return None
+    try:
+        # Picks up comments posted since the last ingest; a no-op within the interval
+        await asyncio.to_thread(comment_store.ingest_if_due)
+        if not comment_store.has_comments():
+            return None
+        comments = comment_store.get_comments(limit=MONITOR_COMMENT_LIMIT, sentiment=sentiment)
+    except Exception as e:
+        logger.error(f"Error reading comment store: {str(e)}")
+        return None
+    for comment in comments:
+        comment['post_message'] = _post_excerpt(comment['post_message'])
+    return comments
+
+async def _fetch_posts_with_comments():
+    """Fetch the feed and every post's comments on one pooled async client."""
+    async with facebook_service.async_client() as client:
+        posts = await facebook_service.get_page_posts_async(client)
+        comments_by_post = await facebook_service.get_comments_for_posts_async(
+            client, [post['id'] for post in posts.get('data', [])]
+        )
+    return posts, comments_by_post
+
 @comments_bp.route('/list/<post_id>')
 @login_required
 def list_comments(post_id):
@@ -38,6 +81,7 @@ def list_comments(post_id):
 def reply(comment_id):
     message = request.json.get('message')
     response = facebook_service.reply_to_comment(comment_id, message)
+    DashboardSnapshot.mark_stale(current_user)
     return jsonify(response)
 
 @comments_bp.route('/auto-reply/<comment_id>', methods=['POST'])
@@ -49,20 +93,77 @@ def auto_reply(comment_id):
     if not profile:
         return jsonify({'error': 'Page profile not found'}), 404
     
-    context = f"""
-    Page Category: {profile.category}
-    Target Audience: {profile.target_audience}
-    Language: {profile.content_language}
-    """
-    
-    response = llm_service.generate_response(comment_text, context)
+    response = llm_service.generate_response(comment_text, _profile_context(profile), _active_strategy())
     result = facebook_service.reply_to_comment(comment_id, response)
+    DashboardSnapshot.mark_stale(current_user)
     
     return jsonify({
         'reply': response,
         'result': result
     })
 
+@comments_bp.route('/auto-reply/<comment_id>/stream', methods=['POST'])
+@login_required
+def auto_reply_stream(comment_id):
+    """Stream the generated reply as ``token`` events, post it, then send ``done``.
+
+    A reply is only posted if generation finished; if the stream fails
+    part-way an ``error`` event is sent instead and nothing is posted.
+    """
+    comment_text = request.json.get('comment')
+    profile = PageProfile.objects(user=current_user).first()
+    
+    if not profile:
+        return jsonify({'error': 'Page profile not found'}), 404
+    
+    context = _profile_context(profile)
+    strategy = _active_strategy()
+    
+    def events():
+        finished = []
+        for token in llm_service.stream_response(comment_text, context, strategy, on_complete=finished.append):
+            yield 'token', token
+        if not finished:
+            yield 'error', {'error': 'Reply generation was interrupted; nothing was posted'}
+            return
+        response = finished[0]
+        result = facebook_service.reply_to_comment(comment_id, response)
+        DashboardSnapshot.mark_stale(current_user)
+        yield 'done', {'reply': response, 'result': result}
+    
+    return sse_response(events())
+
+@comments_bp.route('/quick-replies/stream', methods=['POST'])
+@login_required
+def quick_replies_stream():
+    """Stream quick reply suggestions for a comment, one ``reply`` event each."""
+    comment_text = request.json.get('comment')
+    if not comment_text:
+        return jsonify({'error': 'Comment is required'}), 400
+    
+    strategy = _active_strategy()
+    
+    def events():
+        for reply in llm_service.stream_quick_replies(comment_text, strategy):
+            yield 'reply', reply
+        yield 'done', {}
+    
+    return sse_response(events())
+
+def _post_excerpt(message):
+    return message[:POST_EXCERPT_LENGTH] + '...' if len(message) > POST_EXCERPT_LENGTH else message
+
+def _active_strategy():
+    """The current user's active strategy; passed to each LLM call, as the service is shared."""
+    return Strategy.objects(user=current_user.id, is_active=True).first()
+
+def _profile_context(profile):
+    return f"""
+    Page Category: {profile.category}
+    Target Audience: {profile.target_audience}
+    Language: {profile.content_language}
+    """
+
 @comments_bp.route('/quick_reply', methods=['POST'])
 @login_required
 def quick_reply():
@@ -79,6 +180,7 @@ def quick_reply():
     if 'error' in result:
         flash(f'Error replying to comment: {result["error"]}', 'error')
     else:
+        DashboardSnapshot.mark_stale(current_user)
         flash('Reply sent successfully!', 'success')
     
     return redirect(url_for('dashboard.index'))
@@ -95,26 +197,38 @@ def api_reply():
     if not comment_id or not message:
         return jsonify({'success': False, 'error': 'Comment ID and message are required'})
     
-    result = facebook_service.reply_to_comment(comment_id, message)
+    result = facebook_service.reply_to_comment(comment_id, message, post_id=data.get('post_id'))
     
     if 'error' in result:
         return jsonify({'success': False, 'error': result['error']})
     
+    DashboardSnapshot.mark_stale(current_user)
     return jsonify({'success': True, 'data': result})
 
 @comments_bp.route('/negative')
 @login_required
-def negative_comments():
-    posts = facebook_service.get_page_posts()
+async def negative_comments():
+    stored = await _stored_comments(sentiment='negative')
+    if stored is not None:
+        return render_template('comments/negative.html', comments=stored)
+    
+    posts, comments_by_post = await _fetch_posts_with_comments()
     negative_comments = []
     
-    for post in posts.get('data', []):
-        comments = facebook_service.get_post_comments(post['id'])
-        for comment in comments.get('data', []):
-            sentiment = llm_service.analyze_sentiment(comment['message'])
-            if sentiment['sentiment'] == 'negative':
-                comment['sentiment'] = sentiment
-                comment['post_message'] = post.get('message', '')[:100] + '...'
-                negative_comments.append(comment)
+    all_comments = [
+        (post, comment)
+        for post in posts.get('data', [])
+        for comment in comments_by_post[post['id']].get('data', [])
+    ]
+    async with llm_service.async_client() as llm_client:
+        sentiments = await llm_service.analyze_sentiment_batch_async(
+            llm_client, [c.get('message', '') for _, c in all_comments]
+        )
+    
+    for (post, comment), sentiment in zip(all_comments, sentiments):
+        if sentiment['sentiment'] == 'negative':
+            comment['sentiment'] = sentiment
+            comment['post_message'] = _post_excerpt(post.get('message', ''))
+            negative_comments.append(comment)
     
     return render_template('comments/negative.html', comments=negative_comments)
@@ -1,12 +1,14 @@
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
-from ..services import FacebookService, LLMService, SchedulingService
+from ..services.registry import service_proxy
+from .sse import sse_response
+from ..models import DashboardSnapshot
 from datetime import datetime
 
 content_bp = Blueprint('content', __name__, url_prefix='/content')
-fb_service = FacebookService()
-llm_service = LLMService()
-scheduling_service = SchedulingService()
+fb_service = service_proxy('facebook')
+llm_service = service_proxy('llm')
+scheduling_service = service_proxy('scheduling')
 
 @content_bp.route('/create', methods=['GET', 'POST'])
 @login_required
@@ -21,6 +23,7 @@ def create():
             flash('Post scheduled successfully!')
         else:
             fb_service.create_post(content)
+            DashboardSnapshot.mark_stale(current_user)
             flash('Post created successfully!')
         
         return redirect(url_for('dashboard.index'))
@@ -56,3 +59,20 @@ def suggest_content():
     # For form submissions, store in session and redirect
     flash('Content suggestion generated!')
     return render_template('content/create.html', suggestion=suggestion, topic=topic)
+
+@content_bp.route('/suggest/stream', methods=['POST'])
+@login_required
+def suggest_content_stream():
+    """Stream a content suggestion as Server-Sent Events: ``token`` events, then ``done``."""
+    topic = (request.get_json(silent=True) or {}).get('topic') or request.form.get('topic')
+    if not topic:
+        return jsonify({'error': 'Topic is required'}), 400
+    
+    def events():
+        suggestion = []
+        for token in llm_service.stream_content_suggestion(topic):
+            suggestion.append(token)
+            yield 'token', token
+        yield 'done', {'suggestion': ''.join(suggestion)}
+    
+    return sse_response(events())
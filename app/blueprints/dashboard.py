@@ -1,24 +1,45 @@
-from flask import Blueprint, render_template, redirect, url_for
+from flask import Blueprint, render_template, redirect, url_for, jsonify
 from flask_login import login_required, current_user
-from ..services.dashboard_service import DashboardService
-from ..services.facebook_service import FacebookService
-from ..services.llm_service import LLMService
+from ..services.registry import service_proxy
+from ..services.webhook_service import get_comment_event_queue
 from ..models import Strategy
+import logging
+
 dashboard_bp = Blueprint('dashboard', __name__)
-dashboard_service = DashboardService()
-facebook_service = FacebookService()
-llm_service = LLMService()
+logger = logging.getLogger(__name__)
+dashboard_service = service_proxy('dashboard')
+facebook_service = service_proxy('facebook')
+llm_service = service_proxy('llm')
+snapshot_service = service_proxy('snapshots')
+
+def _format_age(seconds: float) -> str:
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} minutes ago"
+    return f"{int(seconds // 3600)} hours ago"
+
 @dashboard_bp.route('/')
 @login_required
-def index():
-    """Display the main dashboard."""
+async def index():
+    """Display the main dashboard from the user's precomputed snapshot."""
     try:
-        # Get all dashboard data
-        dashboard_data = dashboard_service.get_dashboard_data()
+        user = current_user._get_current_object()
         
         # Get active strategy
         active_strategy = Strategy.objects(user=current_user.id, is_active=True).first()
         
+        # Serve the stored snapshot (refreshed in the background when stale);
+        # only the very first visit builds it inline
+        snapshot = snapshot_service.get_snapshot(user)
+        if snapshot and snapshot.refreshed_at:
+            dashboard_data = snapshot.data
+            snapshot_age = snapshot.age_seconds
+        else:
+            dashboard_data = await snapshot_service.build_async(user)
+            snapshot_service.save(user, dashboard_data)
+            snapshot_age = 0
+        
         # Extract required data
         posts = dashboard_data.get('posts', {})
         recent_comments = dashboard_data.get('recent_comments', {"data": []})
@@ -26,17 +47,6 @@ def index():
         activity_summary = dashboard_data.get('activity_summary', "No recent activity to summarize.")
         feedback_summary = dashboard_data.get('feedback_summary', {"summary": "No feedback to analyze.", "topics": []})
         
-        # Add suggested replies to each comment
-        for comment in recent_comments.get('data', []):
-            try:
-                comment['suggested_replies'] = llm_service.generate_quick_replies(
-                    comment['message'], 
-                    active_strategy if active_strategy else None
-                )
-            except Exception as e:
-                logger.error(f"Error generating quick replies for comment {comment['id']}: {str(e)}")
-                comment['suggested_replies'] = ["Thank you for your feedback!", "We appreciate your input!"]
-        
         # Prepare stats for the template
         stats = {
             'total_posts': dashboard_data['posts_summary'].get('total_posts', 0),
@@ -52,7 +62,8 @@ def index():
             recent_comments=recent_comments,
             post_suggestions=post_suggestions,
             activity_summary=activity_summary,
-            feedback_summary=feedback_summary
+            feedback_summary=feedback_summary,
+            snapshot_age_text=_format_age(snapshot_age)
         )
     except Exception as e:
         logger.error(f"Error loading dashboard: {str(e)}")
@@ -70,4 +81,20 @@ def index():
             feedback_summary={"summary": "Unable to load feedback analysis.", "topics": []}
         )
 
+@dashboard_bp.route('/metrics')
+@login_required
+def metrics():
+    """Expose runtime counters for monitoring and tuning."""
+    return jsonify({
+        'graph_http': facebook_service.get_http_metrics(),
+        'graph_cache': facebook_service.get_cache_metrics(),
+        'sentiment_cache': llm_service.get_sentiment_cache_metrics(),
+        'llm_rate_limit': llm_service.get_rate_limit_metrics(),
+        'response_cache': llm_service.get_response_cache_metrics(),
+        'prompts': llm_service.get_prompt_metrics(),
+        'webhook_queue': get_comment_event_queue().metrics(),
+        'llm_dispatch': dashboard_service.llm_dispatcher.metrics(),
+        'last_dashboard_graph_calls': dashboard_service.last_api_call_count
+    })
+
 # Add other routes as needed...
@@ -1,11 +1,11 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
-from flask_login import login_required
-from ..services.facebook_service import FacebookService
-from ..services.llm_service import LLMService
+from flask_login import login_required, current_user
+from ..services.registry import service_proxy
+from ..models import DashboardSnapshot
 
 posts_bp = Blueprint('posts', __name__, url_prefix='/posts')  # Added url_prefix
-facebook_service = FacebookService()
-llm_service = LLMService()
+facebook_service = service_proxy('facebook')
+llm_service = service_proxy('llm')
 
 @posts_bp.route('/create', methods=['GET', 'POST'])
 @login_required
@@ -21,6 +21,7 @@ def create_post():
         if 'error' in result:
             flash(f'Error creating post: {result["error"]["message"]}', 'error')
         else:
+            DashboardSnapshot.mark_stale(current_user)
             flash('Post created successfully!', 'success')
             return redirect(url_for('dashboard.index'))
     
@@ -42,6 +43,7 @@ def api_create_post():
         if isinstance(result, dict) and 'error' in result:
             return jsonify({'success': False, 'error': str(result['error'])}), 400
         
+        DashboardSnapshot.mark_stale(current_user)
         return jsonify({'success': True, 'data': result}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
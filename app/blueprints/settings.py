@@ -1,11 +1,11 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify
 from flask_login import login_required, current_user
 from ..models import PageProfile, AutoReplySettings
-from ..services.llm_service import LLMService
+from ..services.registry import service_proxy
 from datetime import datetime  # Add this import
 
 settings_bp = Blueprint('settings', __name__, url_prefix='/settings')
-llm_service = LLMService()
+llm_service = service_proxy('llm')
 
 @settings_bp.route('/profile', methods=['GET', 'POST'])
 @login_required
@@ -0,0 +1,29 @@
+import json
+from typing import Any, Iterable, Tuple
+
+from flask import Response, stream_with_context
+
+
+def format_event(event: str, data: Any) -> str:
+    # JSON keeps newlines in generated text from ending the event early
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events: Iterable[Tuple[str, Any]]) -> Response:
+    """Stream ``(event, data)`` pairs to the client as Server-Sent Events.
+
+    The generator keeps the request context, so it may still use
+    ``current_user`` and the service proxies while streaming.
+    """
+    def generate():
+        for event, data in events:
+            yield format_event(event, data)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Stop nginx from buffering the stream
+        }
+    )
@@ -1,10 +1,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
-from ..models import Strategy  # Updated import
-from ..services.llm_service import LLMService
+from ..models import Strategy, DashboardSnapshot  # Updated import
 
 strategy_bp = Blueprint('strategy', __name__, url_prefix='/strategy')
-llm_service = LLMService()
 
 @strategy_bp.route('/')
 @login_required
@@ -38,7 +36,7 @@ def create():
                 strategy.is_active = True
                 strategy.save()
                 
-                llm_service.set_strategy(strategy)
+                DashboardSnapshot.mark_stale(current_user)
             
             flash('Strategy created successfully!', 'success')
             return redirect(url_for('strategy.index'))
@@ -61,8 +59,8 @@ def activate(strategy_id):
         strategy.is_active = True
         strategy.save()
         
-        # Update LLM service with new strategy
-        llm_service.set_strategy(strategy)
+        # Dashboards pick the new strategy up on their next refresh
+        DashboardSnapshot.mark_stale(current_user)
         
         return jsonify({'success': True})
     except Exception as e:
@@ -0,0 +1,53 @@
+from flask import Blueprint, request, jsonify
+from ..services.webhook_service import verify_signature, extract_comment_events, get_comment_event_queue
+from ..services.registry import get_services
+from ..config import get_settings
+from datetime import datetime
+import json
+import logging
+import os
+import uuid
+
+webhooks_bp = Blueprint('webhooks', __name__, url_prefix='/webhooks')
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+@webhooks_bp.route('/facebook', methods=['GET'])
+def verify():
+    """Answer the subscription handshake Facebook sends when the webhook is set up."""
+    if (request.args.get('hub.mode') == 'subscribe'
+            and settings.FACEBOOK_WEBHOOK_VERIFY_TOKEN
+            and request.args.get('hub.verify_token') == settings.FACEBOOK_WEBHOOK_VERIFY_TOKEN):
+        return request.args.get('hub.challenge', ''), 200
+    return 'Verification failed', 403
+
+@webhooks_bp.route('/facebook', methods=['POST'])
+def receive():
+    """Accept Page feed events and queue new comments for background processing."""
+    payload = request.get_data()
+    if not verify_signature(payload, request.headers.get('X-Hub-Signature-256'), settings.FACEBOOK_APP_SECRET):
+        logger.warning("Rejected webhook delivery with a missing or invalid signature")
+        return 'Invalid signature', 403
+
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return 'Invalid payload', 400
+
+    if settings.WEBHOOK_RECORD_DIR:
+        _record_delivery(payload)
+
+    events = extract_comment_events(data, page_id=settings.FACEBOOK_PAGE_ID)
+    accepted = get_comment_event_queue().submit(events, services=get_services()) if events else 0
+
+    # Facebook retries anything but a fast 200, so never wait on processing here
+    return jsonify({'received': len(events), 'queued': accepted}), 200
+
+def _record_delivery(payload: bytes) -> None:
+    try:
+        os.makedirs(settings.WEBHOOK_RECORD_DIR, exist_ok=True)
+        name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}.json"
+        with open(os.path.join(settings.WEBHOOK_RECORD_DIR, name), 'wb') as f:
+            f.write(payload)
+    except OSError as e:
+        logger.error(f"Error recording webhook delivery: {str(e)}")
@@ -12,15 +12,95 @@ class Settings(BaseSettings):
     FACEBOOK_PAGE_ACCESS_TOKEN: str = os.getenv("FACEBOOK_PAGE_ACCESS_TOKEN", "")
     FACEBOOK_PAGE_ID: str = os.getenv("FACEBOOK_PAGE_ID", "")
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    FACEBOOK_APP_SECRET: str = os.getenv("FACEBOOK_APP_SECRET", "")  # Signs webhook deliveries
+    FACEBOOK_WEBHOOK_VERIFY_TOKEN: str = os.getenv("FACEBOOK_WEBHOOK_VERIFY_TOKEN", "")
     
     # Security Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     
     # LLM Settings
     MODEL_NAME: str = "qwen-2.5-32b"
+    GROQ_BASE_URL: str = ""  # Empty for Groq's API; set to use a compatible server, e.g. the benchmark stand-in
     MAX_TOKENS: int = 4048
     TEMPERATURE: float = 0.5
     
+    # Independent LLM calls behind one page (summaries, suggestions, quick
+    # replies) run concurrently; any still running at the deadline fall back
+    LLM_DASHBOARD_DEADLINE: float = 8.0  # Seconds
+    LLM_DISPATCH_WORKERS: int = 8  # Threads per process for sync dispatches
+    
+    # Client-side Groq budgets per process; set them to your plan's limits
+    # divided by the number of app and worker processes
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 20000
+    LLM_EXPECTED_COMPLETION_TOKENS: int = 300  # Reserved for calls that do not set max_tokens
+    LLM_QUEUE_TIMEOUT: float = 20.0  # Seconds a call may wait for capacity before it falls back
+    
+    # Sentiment tiers: "remote" (LLM only), "local" (lexicon only) or "hybrid"
+    # (lexicon first, LLM only for comments below the confidence threshold)
+    SENTIMENT_MODE: str = "hybrid"
+    SENTIMENT_LOCAL_MIN_CONFIDENCE: float = 0.75
+    
+    # Sentiment result cache
+    SENTIMENT_CACHE_SIZE: int = 10000  # Results kept in memory per process
+    SENTIMENT_CACHE_PERSIST: bool = True  # Back the memory cache with MongoDB
+    
+    # Reply cache for generate_response and generate_quick_replies: "off",
+    # "exact" (same comment after normalization) or "similar" (near-duplicates too).
+    # "similar" can serve a reply to a comment that differs by one meaningful word
+    # ("...when I open it" / "...when I close it"), so it is opt-in.
+    RESPONSE_CACHE_MODE: str = "exact"
+    RESPONSE_CACHE_SIZE: int = 2048  # Replies kept in memory per process
+    RESPONSE_CACHE_TTL: int = 3600  # Seconds
+    RESPONSE_CACHE_SIMILARITY: float = 0.9  # Estimated Jaccard similarity of character 3-grams
+    RESPONSE_CACHE_LENGTH_TOLERANCE: float = 0.1  # Max relative length difference for a near-duplicate
+    
+    # Graph API Settings
+    GRAPH_API_BASE_URL: str = "https://graph.facebook.com/v18.0"
+    GRAPH_MAX_CONCURRENCY: int = 8  # Max in-flight Graph requests per fan-out
+    GRAPH_REQUEST_TIMEOUT: float = 10.0  # Read timeout in seconds per Graph API call
+    GRAPH_CONNECT_TIMEOUT: float = 3.05
+    GRAPH_POOL_SIZE: int = 20  # Keep-alive connections kept per process
+    GRAPH_MAX_RETRIES: int = 3
+    GRAPH_RETRY_BACKOFF: float = 0.5  # Seconds, doubled on every retry
+    
+    # Graph API response cache (per process)
+    GRAPH_CACHE_ENABLED: bool = True
+    GRAPH_CACHE_MAX_ENTRIES: int = 2048
+    GRAPH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    GRAPH_CACHE_TTL_FEED: float = 60.0  # Seconds
+    GRAPH_CACHE_TTL_COMMENTS: float = 30.0
+    GRAPH_CACHE_TTL_POST: float = 120.0
+    GRAPH_CACHE_TTL_INSIGHTS: float = 300.0
+    GRAPH_USE_BATCH: bool = True  # Group per-post reads into /?batch= calls
+    
+    # Dashboard snapshots: served as-is while younger than the TTL, then
+    # served stale while a background refresh rebuilds them
+    DASHBOARD_SNAPSHOT_TTL: int = 300  # Seconds
+    DASHBOARD_REFRESH_INTERVAL: int = 60  # Seconds between background worker sweeps
+    DASHBOARD_REFRESH_LOCK_TIMEOUT: int = 600  # Seconds before an abandoned refresh can be reclaimed
+    
+    # Comment store: comments are ingested incrementally from each post's
+    # high-water mark and dashboard/monitor views read them from MongoDB
+    COMMENT_STORE_ENABLED: bool = True
+    COMMENT_INGEST_INTERVAL: int = 60  # Min seconds between ingests triggered by page views
+    
+    # Page webhook deliveries are queued and processed by background threads
+    WEBHOOK_WORKERS: int = 2
+    WEBHOOK_QUEUE_SIZE: int = 1000  # Events beyond this are dropped and left to the next ingest
+    WEBHOOK_BATCH_SIZE: int = 20  # Max events a worker processes together
+    WEBHOOK_RECORD_DIR: str = ""  # Save raw deliveries here for scripts/replay_webhooks.py
+    
+    # Scheduled post publishing worker (python run.py worker)
+    SCHEDULER_POLL_INTERVAL: int = 15  # Seconds between polls when nothing is due
+    SCHEDULER_BATCH_SIZE: int = 100  # Posts claimed per poll
+    SCHEDULER_CONCURRENCY: int = 8  # Posts published in parallel per worker
+    SCHEDULER_CLAIM_TIMEOUT: int = 600  # Seconds before an unconfirmed claim is marked failed
+    
+    # Session user cache: saves a MongoDB lookup on every authenticated request
+    USER_CACHE_TTL: int = 60  # Seconds; bounds how long other processes see a stale user
+    USER_CACHE_SIZE: int = 1024
+    
     # App Settings
     MONGODB_URI: str = "mongodb://localhost:27017/smartsocial"
     
@@ -30,6 +110,7 @@ class Settings(BaseSettings):
     MONGODB_PORT: int = 27017
     MONGODB_USERNAME: str = ""  # Add if authentication is required
     MONGODB_PASSWORD: str = ""  # Add if authentication is required
+    QUERY_PLAN_CHECK: bool = True  # Explain hot queries at startup and warn on collection scans
     
     class Config:
         env_file = ".env"
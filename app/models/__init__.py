@@ -4,11 +4,19 @@ from .strategy import Strategy
 from .page_profile import PageProfile
 from .scheduled_post import ScheduledPost
 from .auto_reply_settings import AutoReplySettings
+from .sentiment_result import SentimentResult
+from .dashboard_snapshot import DashboardSnapshot
+from .comment import Comment
+from .post_comment_cursor import PostCommentCursor
 
 __all__ = [
     'User',
     'Strategy',
     'PageProfile',
     'ScheduledPost',
-    'AutoReplySettings'
+    'AutoReplySettings',
+    'SentimentResult',
+    'DashboardSnapshot',
+    'Comment',
+    'PostCommentCursor'
 ]
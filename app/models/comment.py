@@ -0,0 +1,40 @@
+from mongoengine import Document, StringField, FloatField, DateTimeField
+from datetime import datetime
+
+class Comment(Document):
+    comment_id = StringField(required=True, unique=True)  # Graph comment ID
+    post_id = StringField(required=True)
+    post_message = StringField()  # Start of the post's text, for listing views
+    message = StringField()
+    author_name = StringField()
+    author_id = StringField()
+    created_time = DateTimeField(required=True)
+    sentiment = StringField(choices=['positive', 'negative', 'neutral'])
+    sentiment_confidence = FloatField(default=0.0)
+    ingested_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'comments',
+        'indexes': [
+            'comment_id',
+            ('post_id', '-created_time'),
+            ('sentiment', '-created_time'),
+            '-created_time'
+        ]
+    }
+
+    def to_graph(self) -> dict:
+        """Return the comment in the shape the Graph API and templates use."""
+        return {
+            'id': self.comment_id,
+            'message': self.message or '',
+            'from': {'name': self.author_name or 'Unknown', 'id': self.author_id},
+            'created_time': self.created_time.strftime('%Y-%m-%dT%H:%M:%S+0000'),
+            'post_id': self.post_id,
+            'post_message': self.post_message or '',
+            'sentiment': {'sentiment': self.sentiment or 'neutral', 'confidence': self.sentiment_confidence}
+        }
+
+    def __str__(self):
+        return f"{self.comment_id} ({self.sentiment})"
+
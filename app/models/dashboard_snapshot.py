@@ -0,0 +1,30 @@
+from mongoengine import Document, ReferenceField, DictField, DateTimeField, BooleanField, StringField
+from datetime import datetime
+from .user import User
+
+class DashboardSnapshot(Document):
+    user = ReferenceField(User, required=True, unique=True)
+    data = DictField()  # Everything the dashboard template renders
+    refreshed_at = DateTimeField()
+    is_stale = BooleanField(default=False)  # Set when something the dashboard shows has changed
+    refresh_started_at = DateTimeField()  # Claimed by the process currently rebuilding it
+    refresh_error = StringField()
+
+    meta = {
+        'collection': 'dashboard_snapshots',
+        'indexes': ['user', 'refreshed_at', 'is_stale']  # Each branch of the refresh sweep's $or
+    }
+
+    @staticmethod
+    def mark_stale(user) -> None:
+        """Flag a user's snapshot for refresh after a change."""
+        DashboardSnapshot.objects(user=user).update(set__is_stale=True)
+
+    @property
+    def age_seconds(self) -> float:
+        if not self.refreshed_at:
+            return float('inf')
+        return (datetime.utcnow() - self.refreshed_at).total_seconds()
+
+    def __str__(self):
+        return f"Dashboard snapshot for {self.user.email} at {self.refreshed_at}"
@@ -3,6 +3,7 @@ from .user import User
 
 class PageProfile(Document):
     user = ReferenceField(User, required=True)
+    page_id = StringField()  # Facebook Page this profile manages; unset means the app's FACEBOOK_PAGE_ID
     category = StringField(required=True)
     target_audience = ListField(StringField())
     content_language = StringField(default='en')
@@ -11,7 +12,7 @@ class PageProfile(Document):
 
     meta = {
         'collection': 'page_profiles',
-        'indexes': ['user']
+        'indexes': ['user', 'page_id']
     }
 
     def __str__(self):
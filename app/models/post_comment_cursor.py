@@ -0,0 +1,26 @@
+from mongoengine import Document, StringField, DateTimeField, IntField
+
+class PostCommentCursor(Document):
+    """Per-post ingestion high-water mark and running comment counters."""
+    post_id = StringField(required=True, unique=True)
+    last_comment_time = DateTimeField()  # Newest comment ingested so far
+    last_synced_at = DateTimeField()
+    comment_count = IntField(default=0)
+    positive_count = IntField(default=0)
+    negative_count = IntField(default=0)
+    neutral_count = IntField(default=0)
+
+    meta = {
+        'collection': 'post_comment_cursors',
+        'indexes': ['post_id']
+    }
+
+    def sentiment_counts(self) -> dict:
+        return {
+            'positive': self.positive_count,
+            'negative': self.negative_count,
+            'neutral': self.neutral_count
+        }
+
+    def __str__(self):
+        return f"{self.post_id}: {self.comment_count} comments up to {self.last_comment_time}"
@@ -1,4 +1,4 @@
-from mongoengine import Document, StringField, ReferenceField, DateTimeField, BooleanField
+from mongoengine import Document, StringField, ReferenceField, DateTimeField, BooleanField, FloatField, IntField
 from .user import User
 from .strategy import Strategy
 
@@ -8,17 +8,21 @@ class ScheduledPost(Document):
     message = StringField(required=True)
     scheduled_time = DateTimeField(required=True)
     is_published = BooleanField(default=False)
-    publish_status = StringField(default='pending', choices=['pending', 'published', 'failed'])
+    publish_status = StringField(default='pending', choices=['pending', 'publishing', 'published', 'failed'])
     fb_post_id = StringField()  # Stores the Facebook post ID after publishing
     error_message = StringField()  # Stores any error that occurred during publishing
+    claimed_by = StringField()  # Worker currently publishing this post
+    claimed_at = DateTimeField()
+    attempts = IntField(default=0)
+    published_at = DateTimeField()
+    publish_latency_ms = FloatField()  # Duration of the Graph API publish call
 
     meta = {
         'collection': 'scheduled_posts',
         'indexes': [
-            'user',
-            'scheduled_time',
-            'is_published',
-            'publish_status'
+            ('publish_status', 'scheduled_time'),  # Worker poll: due pending posts, oldest first
+            ('publish_status', 'claimed_at'),  # Expired claim sweep
+            ('user', 'scheduled_time')  # Schedule page: a user's posts by time
         ],
         'ordering': ['-scheduled_time']
     }
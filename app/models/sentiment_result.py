@@ -0,0 +1,18 @@
+from mongoengine import Document, StringField, FloatField, DateTimeField
+from datetime import datetime
+
+class SentimentResult(Document):
+    key = StringField(required=True, unique=True)  # Hash of normalized text, model and prompt version
+    sentiment = StringField(required=True, choices=['positive', 'negative', 'neutral'])
+    confidence = FloatField(default=0.0)
+    model_name = StringField()
+    prompt_version = StringField()
+    created_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'sentiment_results',
+        'indexes': ['key']
+    }
+
+    def __str__(self):
+        return f"{self.sentiment} ({self.confidence:.2f})"
@@ -16,7 +16,10 @@ class Strategy(Document):
 
     meta = {
         'collection': 'strategies',
-        'indexes': ['user', 'is_active']
+        'indexes': [
+            ('user', 'is_active'),  # A user's active strategy and strategy list
+            'is_active'  # Page-wide active strategy lookup
+        ]
     }
 
     def __str__(self):
@@ -1,13 +1,21 @@
-from .facebook_service import FacebookService
-from .llm_service import LLMService
-from .auth_service import AuthService
-from .dashboard_service import DashboardService
-from .scheduling_service import SchedulingService
+import importlib
 
-__all__ = [
-    'FacebookService',
-    'LLMService',
-    'AuthService',
-    'DashboardService',
-    'SchedulingService'
-]
+# Services are imported on first access so that importing one submodule
+# (e.g. the registry or the user cache) does not pull in every client library
+_SERVICE_MODULES = {
+    'FacebookService': '.facebook_service',
+    'LLMService': '.llm_service',
+    'AuthService': '.auth_service',
+    'DashboardService': '.dashboard_service',
+    'SchedulingService': '.scheduling_service',
+    'DashboardSnapshotService': '.snapshot_service',
+    'CommentIngestionService': '.comment_ingestion_service',
+    'LLMDispatcher': '.llm_dispatcher'
+}
+
+__all__ = list(_SERVICE_MODULES)
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        return getattr(importlib.import_module(_SERVICE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,212 @@
+from .facebook_service import FacebookService
+from .llm_service import LLMService, normalize_sentiment
+from ..models import Comment, PostCommentCursor
+from ..config import get_settings
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+GRAPH_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S+0000'
+SENTIMENT_COUNTERS = {'positive': 'positive_count', 'negative': 'negative_count', 'neutral': 'neutral_count'}
+
+# Shared by every ingestion service in the process so page views trigger at
+# most one ingest per COMMENT_INGEST_INTERVAL
+_last_ingest_at = 0.0
+_ingest_lock = threading.Lock()
+
+class CommentIngestionService:
+    """Incremental comment pipeline backed by the ``comments`` collection.
+
+    Each post keeps a high-water mark (the newest comment ingested so far), so
+    an ingest only asks the Graph API for comments created since then,
+    classifies just those and bumps the post's counters in place. Readers get
+    comments and aggregates from MongoDB, so their cost no longer grows with
+    the page's total comment history.
+    """
+
+    def __init__(self, fb_service: Optional[FacebookService] = None, llm_service: Optional[LLMService] = None):
+        self.fb_service = fb_service or FacebookService()
+        self.llm_service = llm_service or LLMService()
+
+    def ingest(self, posts: Optional[Dict[str, Any]] = None) -> int:
+        """Store the comments posted since the last ingest; returns how many were new."""
+        global _last_ingest_at
+        if posts is None:
+            posts = self.fb_service.get_page_posts()
+        post_list = [post for post in posts.get('data', []) if post.get('id')]
+        if not post_list:
+            return 0
+
+        started = time.perf_counter()
+        synced_at = datetime.utcnow()
+        cursors = self.get_cursors([post['id'] for post in post_list])
+        since_by_post = {
+            post['id']: cursors[post['id']].last_comment_time if post['id'] in cursors else None
+            for post in post_list
+        }
+        fetched = self.fb_service.get_new_comments_for_posts(since_by_post)
+
+        candidates = []
+        for post in post_list:
+            mark = since_by_post[post['id']]
+            for comment in fetched.get(post['id'], {}).get('data', []):
+                created_time = self._parse_time(comment.get('created_time'))
+                # ``since`` is inclusive, so comments at the mark itself come back
+                # again; the unique comment_id index drops them on insert
+                if comment.get('id') and created_time and (mark is None or created_time >= mark):
+                    candidates.append(self._to_document(post, comment, created_time))
+
+        if candidates:
+            self._classify(candidates)
+        inserted = self._insert(candidates) if candidates else []
+        self._update_cursors(inserted, [post['id'] for post in post_list], synced_at)
+        with _ingest_lock:
+            _last_ingest_at = time.monotonic()
+
+        logger.info(
+            f"Ingested {len(inserted)} new comments ({len(candidates)} fetched) "
+            f"from {len(post_list)} posts in {time.perf_counter() - started:.2f}s"
+        )
+        return len(inserted)
+
+    def ingest_if_due(self, posts: Optional[Dict[str, Any]] = None) -> Optional[int]:
+        """Run ``ingest`` unless this process ran one within ``COMMENT_INGEST_INTERVAL``."""
+        global _last_ingest_at
+        with _ingest_lock:
+            previous = _last_ingest_at
+            claimed = time.monotonic()
+            if claimed - previous < settings.COMMENT_INGEST_INTERVAL:
+                return None
+            # Claim the slot before ingesting, so requests arriving meanwhile skip it
+            _last_ingest_at = claimed
+        try:
+            return self.ingest(posts)
+        except Exception as e:
+            logger.error(f"Error ingesting comments: {str(e)}")
+            with _ingest_lock:
+                # Let the next request retry, unless another ingest has run since
+                if _last_ingest_at == claimed:
+                    _last_ingest_at = previous
+            return None
+
+    def record_comments(self, comments: List[Dict[str, Any]]) -> int:
+        """Store comments pushed to us (e.g. by webhooks) that already carry a sentiment.
+
+        Counters are updated but the high-water mark is left alone: pushed
+        events can arrive out of order, so the next ingest still looks from
+        the last polled comment and the unique index skips what is stored.
+        """
+        documents = []
+        for comment in comments:
+            created_time = self._parse_time(comment.get('created_time'))
+            if not comment.get('id') or not comment.get('post_id') or created_time is None:
+                continue
+            document = self._to_document(
+                {'id': comment['post_id'], 'message': comment.get('post_message', '')}, comment, created_time
+            )
+            sentiment = comment.get('sentiment') or {}
+            document.sentiment = normalize_sentiment(sentiment.get('sentiment'))
+            document.sentiment_confidence = sentiment.get('confidence', 0.0)
+            documents.append(document)
+
+        inserted = self._insert(documents) if documents else []
+        self._update_cursors(inserted, [], datetime.utcnow(), advance_mark=False)
+        return len(inserted)
+
+    def has_comments(self) -> bool:
+        return Comment.objects.first() is not None
+
+    def get_cursors(self, post_ids: List[str]) -> Dict[str, PostCommentCursor]:
+        return {cursor.post_id: cursor for cursor in PostCommentCursor.objects(post_id__in=post_ids)}
+
+    def get_comments(self, limit: int = 100, sentiment: Optional[str] = None,
+                     post_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Newest stored comments, optionally filtered by sentiment or post."""
+        query = Comment.objects
+        if sentiment:
+            query = query.filter(sentiment=sentiment)
+        if post_ids is not None:
+            query = query.filter(post_id__in=post_ids)
+        return [comment.to_graph() for comment in query.order_by('-created_time').limit(limit)]
+
+    def get_recent_comments(self, limit: int = 10, post_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Stored counterpart of ``FacebookService.get_recent_comments``."""
+        comments = self.get_comments(limit=limit, post_ids=post_ids)
+        for comment in comments:
+            message = comment['post_message']
+            comment['post_message'] = message[:50] + '...' if len(message) > 50 else message
+        return {"data": comments}
+
+    def _to_document(self, post: Dict[str, Any], comment: Dict[str, Any], created_time: datetime) -> Comment:
+        author = comment.get('from') or {}
+        return Comment(
+            comment_id=comment['id'],
+            post_id=post['id'],
+            post_message=(post.get('message') or '')[:100],
+            message=comment.get('message', ''),
+            author_name=author.get('name'),
+            author_id=author.get('id'),
+            created_time=created_time
+        )
+
+    def _classify(self, candidates: List[Comment]) -> None:
+        messages = [comment.message for comment in candidates if comment.message]
+        sentiments = iter(self.llm_service.analyze_sentiment_batch(messages))
+        for comment in candidates:
+            # Photo and sticker comments have no text to classify
+            result = next(sentiments) if comment.message else {"sentiment": "neutral", "confidence": 0.0}
+            # The counters in _update_cursors only know the three labels
+            comment.sentiment = normalize_sentiment(result.get('sentiment'))
+            comment.sentiment_confidence = result.get('confidence', 0.0)
+
+    def _insert(self, candidates: List[Comment]) -> List[Comment]:
+        """Insert comments not stored yet; returns the inserted ones."""
+        operations = [
+            UpdateOne({'comment_id': comment.comment_id}, {'$setOnInsert': comment.to_mongo().to_dict()}, upsert=True)
+            for comment in candidates
+        ]
+        try:
+            result = Comment._get_collection().bulk_write(operations, ordered=False)
+            upserted = result.upserted_ids.keys()
+        except BulkWriteError as e:
+            # A concurrent ingest inserted some of the same comments first
+            upserted = [item['index'] for item in e.details.get('upserted', [])]
+        return [candidates[index] for index in sorted(upserted)]
+
+    def _update_cursors(self, inserted: List[Comment], post_ids: List[str], synced_at: datetime,
+                        advance_mark: bool = True) -> None:
+        by_post: Dict[str, List[Comment]] = {}
+        for comment in inserted:
+            by_post.setdefault(comment.post_id, []).append(comment)
+
+        for post_id, comments in by_post.items():
+            counters = {f"inc__{field}": 0 for field in SENTIMENT_COUNTERS.values()}
+            for comment in comments:
+                counters[f"inc__{SENTIMENT_COUNTERS[comment.sentiment]}"] += 1
+            if advance_mark:
+                counters['max__last_comment_time'] = max(comment.created_time for comment in comments)
+                counters['set__last_synced_at'] = synced_at
+            PostCommentCursor.objects(post_id=post_id).update_one(
+                upsert=True,
+                inc__comment_count=len(comments),
+                **counters
+            )
+
+        # Posts without new comments only record that they were checked
+        unchanged = [post_id for post_id in post_ids if post_id not in by_post]
+        if unchanged:
+            PostCommentCursor.objects(post_id__in=unchanged).update(set__last_synced_at=synced_at)
+
+    @staticmethod
+    def _parse_time(value: Optional[str]) -> Optional[datetime]:
+        try:
+            return datetime.strptime(value, GRAPH_TIME_FORMAT)
+        except (TypeError, ValueError):
+            return None
@@ -1,66 +1,178 @@
 from .facebook_service import FacebookService
 from .llm_service import LLMService
-from typing import Dict, Any
+from .comment_ingestion_service import CommentIngestionService
+from .llm_dispatcher import LLMDispatcher
+from ..config import get_settings
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from ..models import Strategy
+import asyncio
 import logging
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 class DashboardService:
-    def __init__(self):
-        self.fb_service = FacebookService()
-        self.llm_service = LLMService()
-        self.current_strategy = None
+    def __init__(self, fb_service: Optional[FacebookService] = None, llm_service: Optional[LLMService] = None,
+                 llm_dispatcher: Optional[LLMDispatcher] = None):
+        self.fb_service = fb_service or FacebookService()
+        self.llm_service = llm_service or LLMService()
+        self.llm_dispatcher = llm_dispatcher or LLMDispatcher()
+        self.comment_store = CommentIngestionService(self.fb_service, self.llm_service)
+        self.last_api_call_count = 0  # Graph API calls made by the last dashboard load
 
-    def get_dashboard_data(self) -> Dict[str, Any]:
+    def get_dashboard_data(self, strategy=None) -> Dict[str, Any]:
+        """Build the dashboard, with suggested replies attached to each recent comment.
+
+        ``strategy`` is the dashboard owner's active strategy; it drives both
+        the post suggestions and the quick replies.
+
+        The summaries, post suggestions and every comment's quick replies are
+        independent LLM calls, so they are dispatched together under
+        ``LLM_DASHBOARD_DEADLINE``; calls that miss it use their mock fallbacks.
+        """
         try:
-            # Get active strategy
-            active_strategy = Strategy.objects(is_active=True).first()
-            if active_strategy:
-                self.llm_service.set_strategy(active_strategy)
+            with self.fb_service.count_calls() as graph_calls:
+                posts = self.fb_service.get_page_posts()
+                comment_data = self._comment_data_from_store(posts)
+                if comment_data is None:
+                    # Fetch each post's comments once and share them across all aggregations
+                    comments_by_post = self._fetch_post_comments(posts)
             
-            posts = self.fb_service.get_page_posts()
-            recent_comments = self.fb_service.get_recent_comments(limit=5)
+            if comment_data is None:
+                comment_data = self._comment_data_from_graph(
+                    posts, comments_by_post,
+                    self.llm_service.analyze_sentiment_batch(self._comment_messages(posts, comments_by_post))
+                )
+            recent_comments = comment_data['recent_comments']
+            recent_activity = comment_data['recent_activity']
+            comments = recent_comments.get('data', [])
             profile_settings = self._get_profile_settings()
             location = self._get_user_location()
             
-            # Get recent activity data
-            recent_activity = self._get_recent_activity(posts)
-            
-            # Generate AI summaries
-            activity_summary = self.llm_service.summarize_recent_activity(recent_activity)
-            feedback_summary = self.llm_service.summarize_audience_feedback(recent_comments.get('data', []))
+            llm = self.llm_service
+            calls = {
+                'activity_summary': (
+                    lambda: llm.summarize_recent_activity(recent_activity),
+                    lambda: llm._get_mock_activity_summary(recent_activity)
+                ),
+                'feedback_summary': (
+                    lambda: llm.summarize_audience_feedback(comments),
+                    lambda: llm._get_mock_audience_feedback(comments)
+                ),
+                'post_suggestions': (
+                    lambda: self.fb_service.generate_post_suggestions(
+                        llm, profile_settings=profile_settings, location=location, strategy=strategy
+                    ),
+                    self.fb_service._get_mock_post_suggestions
+                )
+            }
+            for i, comment in enumerate(comments):
+                calls[f'quick_replies:{i}'] = (
+                    lambda message=comment['message']: llm.generate_quick_replies(message, strategy),
+                    llm._get_default_quick_replies
+                )
+            results = self.llm_dispatcher.run(calls)
+            activity_summary, feedback_summary, post_suggestions = self._apply_llm_results(results, comments)
             
-            post_suggestions = self.fb_service.generate_post_suggestions(
-                self.llm_service, 
-                profile_settings=profile_settings,
-                location=location
+            self.last_api_call_count = graph_calls[0]
+            logger.info(
+                f"Dashboard load made {graph_calls[0]} Graph API calls "
+                f"for {len(posts.get('data', []))} posts"
             )
             
-            # Add fallback for missing methods
-            if not hasattr(self.llm_service, 'generate_quick_replies'):
-                logger.warning("LLMService missing generate_quick_replies method")
-                self.llm_service.generate_quick_replies = lambda comment, strategy: [
-                    "Thank you for your feedback!",
-                    "We appreciate your comment!",
-                    "Thanks for sharing!"
-                ]
+            return {
+                'posts': posts,
+                'posts_summary': self._get_posts_summary(posts),
+                'sentiment_analysis': comment_data['sentiment_analysis'],
+                'engagement_metrics': comment_data['engagement_metrics'],
+                'recent_activity': recent_activity,
+                'recent_comments': recent_comments,
+                'post_suggestions': post_suggestions.get('suggestions', []),
+                'activity_summary': activity_summary,
+                'feedback_summary': feedback_summary,
+                'graph_api_calls': graph_calls[0]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in dashboard data retrieval: {str(e)}")
+            return self._get_empty_dashboard_data()
+
+    async def get_dashboard_data_async(self, strategy=None) -> Dict[str, Any]:
+        """Async variant of ``get_dashboard_data``.
+
+        Graph reads share one pooled async client, and the LLM calls are
+        awaited concurrently under the same deadline, as cancellable tasks.
+        """
+        try:
+            with self.fb_service.count_calls() as graph_calls:
+                async with self.fb_service.async_client() as client:
+                    posts = await self.fb_service.get_page_posts_async(client)
+                    # Ingestion is blocking Graph and MongoDB I/O, so keep it off the loop
+                    comment_data = await asyncio.to_thread(self._comment_data_from_store, posts)
+                    if comment_data is None:
+                        comments_by_post = await self.fb_service.get_comments_for_posts_async(
+                            client, [post['id'] for post in posts.get('data', [])]
+                        )
             
-            if not hasattr(self.llm_service, '_parse_post_suggestions'):
-                logger.warning("LLMService missing _parse_post_suggestions method")
-                self.llm_service._parse_post_suggestions = lambda result: []
+            # One Groq client per load: its connections belong to this request's event loop
+            async with self.llm_service.async_client() as llm_client:
+                if comment_data is None:
+                    # Everything below reuses the fetched comments, so no further Graph calls
+                    sentiments = await self.llm_service.analyze_sentiment_batch_async(
+                        llm_client, self._comment_messages(posts, comments_by_post)
+                    )
+                    comment_data = self._comment_data_from_graph(posts, comments_by_post, sentiments)
+                recent_comments = comment_data['recent_comments']
+                recent_activity = comment_data['recent_activity']
+                comments = recent_comments.get('data', [])
+                profile_settings = self._get_profile_settings()
+                location = self._get_user_location()
+            
+                llm = self.llm_service
+                calls = {
+                    'activity_summary': (
+                        lambda: llm.summarize_recent_activity_async(llm_client, recent_activity),
+                        lambda: llm._get_mock_activity_summary(recent_activity)
+                    ),
+                    'feedback_summary': (
+                        lambda: llm.summarize_audience_feedback_async(llm_client, comments),
+                        lambda: llm._get_mock_audience_feedback(comments)
+                    ),
+                    'post_suggestions': (
+                        lambda: self.fb_service.generate_post_suggestions_async(
+                            llm, llm_client, profile_settings=profile_settings, location=location,
+                            strategy=strategy
+                        ),
+                        self.fb_service._get_mock_post_suggestions
+                    )
+                }
+                for i, comment in enumerate(comments):
+                    calls[f'quick_replies:{i}'] = (
+                        lambda message=comment['message']: llm.generate_quick_replies_async(
+                            llm_client, message, strategy
+                        ),
+                        llm._get_default_quick_replies
+                    )
+                results = await self.llm_dispatcher.run_async(calls)
+            activity_summary, feedback_summary, post_suggestions = self._apply_llm_results(results, comments)
+            
+            self.last_api_call_count = graph_calls[0]
+            logger.info(
+                f"Dashboard load made {graph_calls[0]} Graph API calls "
+                f"for {len(posts.get('data', []))} posts"
+            )
             
             return {
                 'posts': posts,
                 'posts_summary': self._get_posts_summary(posts),
-                'sentiment_analysis': self._analyze_comments_sentiment(posts),
-                'engagement_metrics': self._calculate_engagement_metrics(posts),
+                'sentiment_analysis': comment_data['sentiment_analysis'],
+                'engagement_metrics': comment_data['engagement_metrics'],
                 'recent_activity': recent_activity,
                 'recent_comments': recent_comments,
                 'post_suggestions': post_suggestions.get('suggestions', []),
                 'activity_summary': activity_summary,
-                'feedback_summary': feedback_summary
+                'feedback_summary': feedback_summary,
+                'graph_api_calls': graph_calls[0]
             }
             
         except Exception as e:
@@ -78,7 +190,8 @@ class DashboardService:
             'recent_comments': {'data': []},
             'post_suggestions': [],
             'activity_summary': "No recent activity to summarize.",
-            'feedback_summary': {'summary': "No feedback to analyze.", 'topics': []}
+            'feedback_summary': {'summary': "No feedback to analyze.", 'topics': []},
+            'graph_api_calls': 0
         }
 
     def _get_posts_summary(self, posts: Dict[str, Any]) -> Dict[str, Any]:
@@ -89,21 +202,93 @@ class DashboardService:
                 self._is_within_days(post.get('created_time', ''), 7))
         }
 
-    def _analyze_comments_sentiment(self, posts: Dict[str, Any]) -> Dict[str, int]:
+    def _comment_data_from_store(self, posts: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Comment aggregates read from the comment store, after an incremental ingest if one is due.
+
+        Returns None when the store is disabled, unavailable or holds nothing
+        for these posts yet, so the caller falls back to fetching from Graph.
+        """
+        if not settings.COMMENT_STORE_ENABLED:
+            return None
+        try:
+            # At most one ingest per COMMENT_INGEST_INTERVAL; logs and skips on failure
+            self.comment_store.ingest_if_due(posts)
+            post_ids = [post['id'] for post in posts.get('data', [])]
+            cursors = self.comment_store.get_cursors(post_ids)
+            if not cursors:
+                return None
+        except Exception as e:
+            logger.error(f"Error reading comment store: {str(e)}")
+            return None
+        
+        sentiment_analysis = {'positive': 0, 'negative': 0, 'neutral': 0}
+        for cursor in cursors.values():
+            for sentiment, count in cursor.sentiment_counts().items():
+                sentiment_analysis[sentiment] += count
+        total_comments = sum(cursor.comment_count for cursor in cursors.values())
+        
+        return {
+            'recent_comments': self.comment_store.get_recent_comments(limit=5, post_ids=post_ids[:5]),
+            'recent_activity': [
+                {
+                    'post_id': post['id'],
+                    'message': post.get('message', ''),
+                    'created_time': post.get('created_time'),
+                    'comment_count': cursors[post['id']].comment_count if post['id'] in cursors else 0
+                }
+                for post in posts.get('data', [])[:5]
+            ],
+            'sentiment_analysis': sentiment_analysis,
+            'engagement_metrics': {
+                'total_comments': total_comments,
+                'avg_comments_per_post': total_comments / len(post_ids) if post_ids else 0
+            }
+        }
+
+    def _comment_data_from_graph(self, posts: Dict[str, Any], comments_by_post: Dict[str, Dict[str, Any]],
+                                 sentiments: List[dict]) -> Dict[str, Any]:
+        return {
+            'recent_comments': self.fb_service.get_recent_comments(
+                limit=5, posts=posts, comments_by_post=comments_by_post
+            ),
+            'recent_activity': self._get_recent_activity(posts, comments_by_post),
+            'sentiment_analysis': self._count_sentiments(sentiments),
+            'engagement_metrics': self._calculate_engagement_metrics(posts, comments_by_post)
+        }
+
+    def _fetch_post_comments(self, posts: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Request-scoped comment store: each post's comments, fetched once."""
+        post_ids = [post['id'] for post in posts.get('data', [])]
+        return self.fb_service.get_comments_for_posts(post_ids)
+
+    def _get_comments(self, post_id: str, comments_by_post: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+        if comments_by_post is not None and post_id in comments_by_post:
+            return comments_by_post[post_id]
+        return self.fb_service.get_post_comments(post_id)
+
+    def _comment_messages(self, posts: Dict[str, Any],
+                          comments_by_post: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
+        return [
+            comment['message']
+            for post in posts.get('data', [])
+            for comment in self._get_comments(post['id'], comments_by_post).get('data', [])
+            if comment.get('message')
+        ]
+
+    @staticmethod
+    def _count_sentiments(sentiments: List[dict]) -> Dict[str, int]:
         sentiment_counts = {'positive': 0, 'negative': 0, 'neutral': 0}
-        for post in posts.get('data', []):
-            comments = self.fb_service.get_post_comments(post['id'])
-            for comment in comments.get('data', []):
-                sentiment = self.llm_service.analyze_sentiment(comment['message'])
-                sentiment_counts[sentiment['sentiment']] += 1
+        for sentiment in sentiments:
+            sentiment_counts[sentiment['sentiment']] = sentiment_counts.get(sentiment['sentiment'], 0) + 1
         return sentiment_counts
 
-    def _calculate_engagement_metrics(self, posts: Dict[str, Any]) -> Dict[str, Any]:
+    def _calculate_engagement_metrics(self, posts: Dict[str, Any],
+                                      comments_by_post: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         total_likes = 0
         total_comments = 0
         for post in posts.get('data', []):
             post_id = post['id']
-            comments = self.fb_service.get_post_comments(post_id)
+            comments = self._get_comments(post_id, comments_by_post)
             total_comments += len(comments.get('data', []))
         
         return {
@@ -111,10 +296,11 @@ class DashboardService:
             'avg_comments_per_post': total_comments / len(posts.get('data', [])) if posts.get('data') else 0
         }
 
-    def _get_recent_activity(self, posts: Dict[str, Any]) -> list:
+    def _get_recent_activity(self, posts: Dict[str, Any],
+                             comments_by_post: Optional[Dict[str, Dict[str, Any]]] = None) -> list:
         recent_activities = []
         for post in posts.get('data', [])[:5]:  # Last 5 posts
-            comments = self.fb_service.get_post_comments(post['id'])
+            comments = self._get_comments(post['id'], comments_by_post)
             recent_activities.append({
                 'post_id': post['id'],
                 'message': post.get('message', ''),
@@ -148,6 +334,13 @@ class DashboardService:
         # For now, return a default location
         return "United States"
         
+    @staticmethod
+    def _apply_llm_results(results: Dict[str, Any], comments: List[Dict[str, Any]]) -> tuple:
+        """Attach each comment's quick replies; returns the summaries and suggestions."""
+        for i, comment in enumerate(comments):
+            comment['suggested_replies'] = results[f'quick_replies:{i}']
+        return results['activity_summary'], results['feedback_summary'], results['post_suggestions']
+
     def quick_reply_to_comment(self, comment_id: str, message: str) -> Dict[str, Any]:
         """Allow quick replies to comments from the dashboard."""
         return self.fb_service.reply_to_comment(comment_id, message)
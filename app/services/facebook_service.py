@@ -1,31 +1,141 @@
 import requests
-from typing import Any, Dict
+import httpx
+import asyncio
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import islice
+from urllib.parse import urlencode
+import json
 import logging
+import threading
 from ..config import get_settings
+from .graph_session import get_graph_session
+from .cache import TTLCache
 from datetime import datetime, timedelta
+import calendar
 
 settings = get_settings()
-GRAPH_API_BASE_URL = "https://graph.facebook.com/v18.0"
+GRAPH_API_BASE_URL = settings.GRAPH_API_BASE_URL.rstrip('/')
+GRAPH_BATCH_LIMIT = 50  # Max sub-requests the Graph API accepts per batch call
+COMMENT_FIELDS = "id,message,from,created_time"
+POST_FIELDS = "id,message,created_time,permalink_url"
+METRIC_NAMES = "post_impressions,post_engagements"
+COMMENTS_PAGE_SIZE = 100
+
+# Shared by every FacebookService instance in the process
+graph_cache = TTLCache(
+    max_entries=settings.GRAPH_CACHE_MAX_ENTRIES,
+    max_bytes=settings.GRAPH_CACHE_MAX_BYTES,
+    default_ttl=settings.GRAPH_CACHE_TTL_FEED
+)
+
+# Graph calls made inside the current FacebookService.count_calls() block, if any
+_call_counter: ContextVar[Optional[List[int]]] = ContextVar('graph_call_counter', default=None)
+
+class GraphAPIError(Exception):
+    """Raised when the Graph API returns an error instead of a page of data."""
 
 class FacebookService:
     def __init__(self):
         self.page_id = settings.FACEBOOK_PAGE_ID
         self.access_token = settings.FACEBOOK_PAGE_ACCESS_TOKEN
         self.logger = logging.getLogger(__name__)
+        self.api_call_count = 0  # Outbound Graph API calls made by this instance
+        self.max_concurrency = settings.GRAPH_MAX_CONCURRENCY
+        self.use_batch = settings.GRAPH_USE_BATCH
+        self._count_lock = threading.Lock()
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a Graph API request over the shared keep-alive session and count it."""
+        self._count_call()
+        return get_graph_session().request(method, url, **kwargs)
+
+    def _count_call(self) -> None:
+        counter = _call_counter.get()
+        with self._count_lock:
+            self.api_call_count += 1
+            if counter is not None:
+                counter[0] += 1
 
-    def get_page_posts(self) -> Dict[str, Any]:
+    @contextmanager
+    def count_calls(self) -> Iterator[List[int]]:
+        """Count the Graph calls made inside the block, in ``counter[0]``.
+
+        Unlike ``api_call_count``, which every request sharing this instance
+        adds to, only calls made by this block (including its fan-out
+        threads and tasks) are counted.
+        """
+        counter = [0]
+        token = _call_counter.set(counter)
         try:
-            url = f"{GRAPH_API_BASE_URL}/{self.page_id}/feed"
-            params = {
-                "access_token": self.access_token,
-                "fields": "id,message,created_time,permalink_url",
-                "limit": 25
-            }
-            response = requests.get(url, params=params)
-            result = response.json()
+            yield counter
+        finally:
+            _call_counter.reset(token)
+
+    @staticmethod
+    def _in_caller_context(fn: Callable) -> Callable:
+        """Wrap ``fn`` for a worker thread so its calls count towards the caller's ``count_calls``."""
+        counter = _call_counter.get()
+
+        def run(*args):
+            token = _call_counter.set(counter)
+            try:
+                return fn(*args)
+            finally:
+                _call_counter.reset(token)
+        return run
+
+    def get_http_metrics(self) -> Dict[str, Any]:
+        """Pool, retry and latency counters of the shared Graph session."""
+        return get_graph_session().metrics()
+
+    def get_cache_metrics(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters of the shared Graph response cache."""
+        return graph_cache.stats()
+
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        if not settings.GRAPH_CACHE_ENABLED:
+            return None
+        return graph_cache.get(key)
+
+    def _cache_set(self, key: tuple, value: Dict[str, Any], ttl: float) -> None:
+        if settings.GRAPH_CACHE_ENABLED:
+            graph_cache.set(key, value, ttl=ttl)
+
+    def _invalidate_feed(self) -> None:
+        graph_cache.delete_where(lambda key: key[0] == 'feed')
+
+    def _invalidate_post(self, post_id: str) -> None:
+        self._invalidate_feed()
+        graph_cache.delete_where(lambda key: key[0] != 'feed' and key[1] == post_id)
+
+    def _invalidate_comments(self, comment_id: str, post_id: Optional[str] = None) -> None:
+        """Drop the cached comments of the post a comment belongs to."""
+        if post_id:
+            graph_cache.delete(('comments', post_id))
+            return
+        # Comment IDs are "<post object id>_<comment id>" while page post IDs
+        # are "<page id>_<post object id>", so match on the shared object ID
+        object_id = comment_id.split('_')[0]
+        graph_cache.delete_where(
+            lambda key: key[0] == 'comments' and (key[1] == object_id or key[1].endswith(f"_{object_id}"))
+        )
+
+    def get_page_posts(self, limit: int = 25) -> Dict[str, Any]:
+        cache_key = ('feed', self.page_id, limit)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Stops once ``limit`` posts arrived, so a full first page never follows ``paging.next``
+            result = {"data": list(islice(self.iter_page_posts(page_size=limit), limit))}
             
             # Check if we got valid data
-            if 'data' in result and result['data']:
+            if result['data']:
+                self._cache_set(cache_key, result, settings.GRAPH_CACHE_TTL_FEED)
                 return result
             else:
                 return self._get_mock_posts()
@@ -34,31 +144,222 @@ class FacebookService:
             return self._get_mock_posts()
 
     def get_post_comments(self, post_id: str) -> Dict[str, Any]:
+        """Get all comments of a post, following pagination cursors."""
+        cached = self._cache_get(('comments', post_id))
+        if cached is not None:
+            return cached
+        return self._load_post_comments(post_id)
+
+    def _load_post_comments(self, post_id: str) -> Dict[str, Any]:
+        try:
+            comments = {"data": list(self.iter_post_comments(post_id))}
+            self._cache_set(('comments', post_id), comments, settings.GRAPH_CACHE_TTL_COMMENTS)
+            return comments
+        except Exception as e:
+            self.logger.error(f"Error fetching comments: {str(e)}")
+            return self._get_mock_comments(post_id)
+
+    def iter_page_posts(self, since: Optional[Union[datetime, int]] = None,
+                        until: Optional[Union[datetime, int]] = None,
+                        page_size: int = 25) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the page's posts, newest first, one Graph page at a time.
+
+        ``since`` and ``until`` bound the feed by creation time (naive datetimes
+        are taken as UTC). Stopping the iteration early skips the remaining pages.
+        """
+        url = f"{GRAPH_API_BASE_URL}/{self.page_id}/feed"
+        params = {
+            "access_token": self.access_token,
+            "fields": POST_FIELDS,
+            "limit": page_size
+        }
+        if since is not None:
+            params["since"] = self._to_unix_time(since)
+        if until is not None:
+            params["until"] = self._to_unix_time(until)
+        return self._iter_pages(url, params)
+
+    def iter_post_comments(self, post_id: str, page_size: int = COMMENTS_PAGE_SIZE,
+                           since: Optional[Union[datetime, int]] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every comment of a post, following ``paging.next``.
+
+        ``since`` limits the comments to those created at or after that time.
+        """
+        url = f"{GRAPH_API_BASE_URL}/{post_id}/comments"
+        params = {
+            "access_token": self.access_token,
+            "fields": COMMENT_FIELDS,
+            "limit": page_size
+        }
+        if since is not None:
+            params["since"] = self._to_unix_time(since)
+        return self._iter_pages(url, params)
+
+    def _iter_pages(self, url: Optional[str], params: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield items from a paginated Graph edge, fetching one page at a time."""
+        while url:
+            response = self._request('GET', url, params=params)
+            result = response.json()
+            if 'data' not in result:
+                raise GraphAPIError(result.get('error', result))
+            
+            yield from result['data']
+            
+            # The next URL already carries the access token, fields and cursor
+            url = result.get('paging', {}).get('next')
+            params = None
+
+    # Async variants used by the async dashboard view. They share the response
+    # cache, mocks and metrics of the sync methods above.
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled async HTTP client; open it with ``async with`` in the calling event loop."""
+        return get_graph_session().async_client()
+
+    async def _request_async(self, client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+        self._count_call()
+        return await get_graph_session().request_async(client, method, url, **kwargs)
+
+    async def get_page_posts_async(self, client: httpx.AsyncClient, limit: int = 25) -> Dict[str, Any]:
+        cache_key = ('feed', self.page_id, limit)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            url = f"{GRAPH_API_BASE_URL}/{post_id}/comments"
+            url = f"{GRAPH_API_BASE_URL}/{self.page_id}/feed"
             params = {
                 "access_token": self.access_token,
-                "fields": "id,message,from,created_time",
+                "fields": POST_FIELDS,
+                "limit": limit
             }
-            response = requests.get(url, params=params)
+            response = await self._request_async(client, 'GET', url, params=params)
             result = response.json()
             
-            # Check if we got valid data
-            if 'data' in result:
+            if 'data' in result and result['data']:
+                self._cache_set(cache_key, result, settings.GRAPH_CACHE_TTL_FEED)
                 return result
-            else:
-                return self._get_mock_comments(post_id)
+            return self._get_mock_posts()
+        except Exception as e:
+            self.logger.error(f"Error fetching posts: {str(e)}")
+            return self._get_mock_posts()
+
+    async def get_post_comments_async(self, client: httpx.AsyncClient, post_id: str) -> Dict[str, Any]:
+        cached = self._cache_get(('comments', post_id))
+        if cached is not None:
+            return cached
+        return await self._load_post_comments_async(client, post_id)
+
+    async def _load_post_comments_async(self, client: httpx.AsyncClient, post_id: str) -> Dict[str, Any]:
+        url = f"{GRAPH_API_BASE_URL}/{post_id}/comments"
+        params = {
+            "access_token": self.access_token,
+            "fields": COMMENT_FIELDS,
+            "limit": COMMENTS_PAGE_SIZE
+        }
+        try:
+            comments = await self._collect_pages_async(client, url, params)
+            self._cache_set(('comments', post_id), comments, settings.GRAPH_CACHE_TTL_COMMENTS)
+            return comments
         except Exception as e:
             self.logger.error(f"Error fetching comments: {str(e)}")
             return self._get_mock_comments(post_id)
 
+    async def _collect_pages_async(self, client: httpx.AsyncClient, url: Optional[str],
+                                   params: Optional[Dict[str, Any]] = None,
+                                   data: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Collect every item of a paginated Graph edge into ``{"data": [...]}``."""
+        data = list(data or [])
+        while url:
+            response = await self._request_async(client, 'GET', url, params=params)
+            result = response.json()
+            if 'data' not in result:
+                raise GraphAPIError(result.get('error', result))
+            data.extend(result['data'])
+            url = result.get('paging', {}).get('next')
+            params = None
+        return {"data": data}
+
+    async def get_comments_for_posts_async(self, client: httpx.AsyncClient,
+                                           post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Async variant of ``get_comments_for_posts``.
+
+        Batches when ``GRAPH_USE_BATCH`` is on; otherwise awaits one request
+        per post with at most ``max_concurrency`` in flight.
+        """
+        unique_ids = list(dict.fromkeys(post_ids))
+        comments_by_post = {post_id: self._cache_get(('comments', post_id)) for post_id in unique_ids}
+        missing = [post_id for post_id, comments in comments_by_post.items() if comments is None]
+        if not missing:
+            return comments_by_post
+        
+        if self.use_batch and len(missing) > 1:
+            comments_by_post.update(await self._fetch_batched_comments_async(client, missing))
+            return comments_by_post
+        
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+        
+        async def load(post_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._load_post_comments_async(client, post_id)
+        
+        results = await asyncio.gather(*(load(post_id) for post_id in missing))
+        comments_by_post.update(zip(missing, results))
+        return comments_by_post
+
+    async def _fetch_batched_comments_async(self, client: httpx.AsyncClient,
+                                            post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        query = urlencode({"fields": COMMENT_FIELDS, "limit": COMMENTS_PAGE_SIZE})
+        relative_urls = [f"{post_id}/comments?{query}" for post_id in post_ids]
+        chunks = [
+            relative_urls[i:i + GRAPH_BATCH_LIMIT]
+            for i in range(0, len(relative_urls), GRAPH_BATCH_LIMIT)
+        ]
+        chunk_results = await asyncio.gather(*(self._send_batch_async(client, chunk) for chunk in chunks))
+        bodies = [body for chunk in chunk_results for body in chunk]
+        
+        async def complete(post_id: str, body: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if body is None or 'data' not in body:
+                return await self._load_post_comments_async(client, post_id)
+            next_url = body.get('paging', {}).get('next')
+            if next_url:
+                try:
+                    body = await self._collect_pages_async(client, next_url, data=body['data'])
+                except Exception as e:
+                    self.logger.error(f"Error fetching remaining comments for {post_id}: {str(e)}")
+                    body = {"data": body['data']}
+            self._cache_set(('comments', post_id), body, settings.GRAPH_CACHE_TTL_COMMENTS)
+            return body
+        
+        results = await asyncio.gather(*(complete(post_id, body) for post_id, body in zip(post_ids, bodies)))
+        return dict(zip(post_ids, results))
+
+    async def _send_batch_async(self, client: httpx.AsyncClient, relative_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        try:
+            response = await self._request_async(
+                client, 'POST', GRAPH_API_BASE_URL,
+                data=self._batch_form(relative_urls), idempotent=True
+            )
+            result = response.json()
+        except Exception as e:
+            self.logger.error(f"Error sending batch request: {str(e)}")
+            return [None] * len(relative_urls)
+        return self._decode_batch_response(result, len(relative_urls))
+
+    @staticmethod
+    def _to_unix_time(value: Union[datetime, int]) -> int:
+        if isinstance(value, datetime):
+            return calendar.timegm(value.utctimetuple())
+        return int(value)
+
     def create_post(self, message: str) -> Dict[str, Any]:
         url = f"{GRAPH_API_BASE_URL}/{self.page_id}/feed"
         params = {
             "message": message,
             "access_token": self.access_token
         }
-        response = requests.post(url, params=params)
+        response = self._request('POST', url, params=params)
+        self._invalidate_feed()
         return response.json()
 
     def update_post(self, post_id: str, message: str) -> Dict[str, Any]:
@@ -67,7 +368,8 @@ class FacebookService:
             "message": message,
             "access_token": self.access_token
         }
-        response = requests.post(url, params=params)
+        response = self._request('POST', url, params=params)
+        self._invalidate_post(post_id)
         return response.json()
 
     def delete_post(self, post_id: str) -> Dict[str, Any]:
@@ -75,30 +377,43 @@ class FacebookService:
         params = {
             "access_token": self.access_token
         }
-        response = requests.delete(url, params=params)
+        response = self._request('DELETE', url, params=params)
+        self._invalidate_post(post_id)
         return response.json()
 
     def get_post_metrics(self, post_id: str) -> Dict[str, Any]:
+        cached = self._cache_get(('insights', post_id))
+        if cached is not None:
+            return cached
+        
         url = f"{GRAPH_API_BASE_URL}/{post_id}/insights"
         params = {
-            "metric": "post_impressions,post_engagements",
+            "metric": METRIC_NAMES,
             "access_token": self.access_token
         }
-        response = requests.get(url, params=params)
-        return response.json()
+        response = self._request('GET', url, params=params)
+        result = response.json()
+        if 'data' in result:
+            self._cache_set(('insights', post_id), result, settings.GRAPH_CACHE_TTL_INSIGHTS)
+        return result
+
+    def reply_to_comment(self, comment_id: str, message: str, post_id: Optional[str] = None) -> Dict[str, Any]:
+        """Replies to a comment.
 
-    def reply_to_comment(self, comment_id: str, message: str) -> Dict[str, Any]:
-        """Replies to a comment."""
+        Pass ``post_id`` when known so only that post's cached comments are dropped.
+        """
         url = f"{GRAPH_API_BASE_URL}/{comment_id}/comments"  # Changed from 'replies' to 'comments'
         params = {
             "message": message,
             "access_token": self.access_token,
         }
         try:
-            response = requests.post(url, params=params)
+            response = self._request('POST', url, params=params)
             result = response.json()
             if 'error' in result:
                 self.logger.error(f"Error replying to comment: {result['error']}")
+            else:
+                self._invalidate_comments(comment_id, post_id)
             return result
         except Exception as e:
             self.logger.error(f"Error replying to comment: {str(e)}")
@@ -145,14 +460,229 @@ class FacebookService:
             self.logger.error(f"Error processing new comment: {str(e)}")
             return None
 
-    def get_recent_comments(self, limit: int = 10) -> Dict[str, Any]:
+    def get_post(self, post_id: str) -> Dict[str, Any]:
+        cached = self._cache_get(('post', post_id))
+        if cached is not None:
+            return cached
+        
+        url = f"{GRAPH_API_BASE_URL}/{post_id}"
+        params = {
+            "access_token": self.access_token,
+            "fields": POST_FIELDS
+        }
+        response = self._request('GET', url, params=params)
+        result = response.json()
+        if 'id' in result:
+            self._cache_set(('post', post_id), result, settings.GRAPH_CACHE_TTL_POST)
+        return result
+
+    def get_comments_for_posts(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch the comments of several posts, keyed by post ID.
+
+        Uses Graph batch calls when ``GRAPH_USE_BATCH`` is on, otherwise runs
+        one request per post with at most ``max_concurrency`` in flight. The
+        returned dict preserves the order of ``post_ids``. Cached posts are not
+        fetched again.
+        """
+        unique_ids = list(dict.fromkeys(post_ids))
+        comments_by_post = {post_id: self._cache_get(('comments', post_id)) for post_id in unique_ids}
+        missing = [post_id for post_id, comments in comments_by_post.items() if comments is None]
+        if missing:
+            comments_by_post.update(self._fetch_comments_for_posts(missing))
+        return comments_by_post
+
+    def _fetch_comments_for_posts(self, post_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if self.use_batch and len(post_ids) > 1:
+            query = urlencode({"fields": COMMENT_FIELDS, "limit": COMMENTS_PAGE_SIZE})
+            return self._batch_with_fallback(
+                post_ids,
+                [f"{post_id}/comments?{query}" for post_id in post_ids],
+                self._load_post_comments,
+                required_field='data',
+                on_success=self._complete_batched_comments
+            )
+        
+        if len(post_ids) <= 1 or self.max_concurrency <= 1:
+            return {post_id: self._load_post_comments(post_id) for post_id in post_ids}
+        
+        workers = min(self.max_concurrency, len(post_ids))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='graph-fanout') as executor:
+            results = executor.map(self._in_caller_context(self._load_post_comments), post_ids)
+            return dict(zip(post_ids, results))
+
+    def get_new_comments_for_posts(self, since_by_post: Dict[str, Optional[datetime]]) -> Dict[str, Dict[str, Any]]:
+        """Fetch only the comments created since each post's high-water mark.
+
+        ``since_by_post`` maps post IDs to the time of the newest comment already
+        seen (``None`` for a post never fetched). Bypasses the response cache;
+        a post whose comments could not be fetched maps to an empty page.
+        """
+        post_ids = list(since_by_post)
+        
+        def load(post_id: str) -> Dict[str, Any]:
+            return {"data": list(self.iter_post_comments(post_id, since=since_by_post[post_id]))}
+        
+        if self.use_batch and len(post_ids) > 1:
+            relative_urls = []
+            for post_id in post_ids:
+                query = {"fields": COMMENT_FIELDS, "limit": COMMENTS_PAGE_SIZE}
+                if since_by_post[post_id] is not None:
+                    query["since"] = self._to_unix_time(since_by_post[post_id])
+                relative_urls.append(f"{post_id}/comments?{urlencode(query)}")
+            return self._batch_with_fallback(
+                post_ids, relative_urls, load,
+                required_field='data',
+                on_success=self._with_remaining_pages
+            )
+        
+        def load_or_empty(post_id: str) -> Dict[str, Any]:
+            try:
+                return load(post_id)
+            except Exception as e:
+                self.logger.error(f"Error fetching new comments for {post_id}: {str(e)}")
+                return {"data": []}
+        
+        if len(post_ids) <= 1 or self.max_concurrency <= 1:
+            return {post_id: load_or_empty(post_id) for post_id in post_ids}
+        
+        workers = min(self.max_concurrency, len(post_ids))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='graph-fanout') as executor:
+            return dict(zip(post_ids, executor.map(self._in_caller_context(load_or_empty), post_ids)))
+
+    def _complete_batched_comments(self, post_id: str, first_page: Dict[str, Any]) -> Dict[str, Any]:
+        comments = self._with_remaining_pages(post_id, first_page)
+        self._cache_set(('comments', post_id), comments, settings.GRAPH_CACHE_TTL_COMMENTS)
+        return comments
+
+    def _with_remaining_pages(self, post_id: str, first_page: Dict[str, Any]) -> Dict[str, Any]:
+        """Complete a first page of comments by following its cursor."""
+        next_url = first_page.get('paging', {}).get('next')
+        if not next_url:
+            return first_page
+        try:
+            return {"data": first_page['data'] + list(self._iter_pages(next_url))}
+        except Exception as e:
+            self.logger.error(f"Error fetching remaining comments for {post_id}: {str(e)}")
+            return first_page
+
+    def get_posts_by_ids(self, post_ids: List[str]) -> Dict[str, Any]:
+        """Look up several posts in batch calls, returned in feed shape."""
+        unique_ids = list(dict.fromkeys(post_ids))
+        query = urlencode({"fields": POST_FIELDS})
+        posts = self._batch_with_fallback(
+            unique_ids,
+            [f"{post_id}?{query}" for post_id in unique_ids],
+            self.get_post,
+            required_field='id',
+            on_success=lambda post_id, body: self._cached(('post', post_id), body, settings.GRAPH_CACHE_TTL_POST)
+        )
+        return {"data": [post for post in posts.values() if 'id' in post]}
+
+    def _batch_with_fallback(self, keys: List[str], relative_urls: List[str],
+                             fallback: Callable[[str], Dict[str, Any]],
+                             required_field: str,
+                             on_success: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None
+                             ) -> Dict[str, Dict[str, Any]]:
+        """Run GET sub-requests in batches, retrying failed ones as single calls."""
+        results = {}
+        failed = 0
+        for key, body in zip(keys, self._batch_get(relative_urls)):
+            if body is not None and required_field in body:
+                results[key] = on_success(key, body) if on_success else body
+                continue
+            
+            failed += 1
+            try:
+                results[key] = fallback(key)
+            except Exception as e:
+                self.logger.error(f"Error in single-call fallback for {key}: {str(e)}")
+                results[key] = {"data": []} if required_field == 'data' else {}
+        
+        if failed:
+            self.logger.warning(f"{failed} of {len(keys)} batch sub-requests fell back to single calls")
+        return results
+
+    def _cached(self, key: tuple, value: Dict[str, Any], ttl: float) -> Dict[str, Any]:
+        self._cache_set(key, value, ttl)
+        return value
+
+    def _batch_get(self, relative_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Send GET sub-requests through the Graph batch endpoint.
+
+        Returns one decoded body per relative URL, in order, or ``None`` for a
+        sub-request that failed.
+        """
+        chunks = [
+            relative_urls[i:i + GRAPH_BATCH_LIMIT]
+            for i in range(0, len(relative_urls), GRAPH_BATCH_LIMIT)
+        ]
+        if len(chunks) > 1 and self.max_concurrency > 1:
+            workers = min(self.max_concurrency, len(chunks))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='graph-batch') as executor:
+                chunk_results = list(executor.map(self._in_caller_context(self._send_batch), chunks))
+        else:
+            chunk_results = [self._send_batch(chunk) for chunk in chunks]
+        return [body for chunk in chunk_results for body in chunk]
+
+    def _send_batch(self, relative_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        try:
+            # Batches only carry GETs, so they are safe to retry
+            response = self._request('POST', GRAPH_API_BASE_URL, data=self._batch_form(relative_urls), idempotent=True)
+            result = response.json()
+        except Exception as e:
+            self.logger.error(f"Error sending batch request: {str(e)}")
+            return [None] * len(relative_urls)
+        return self._decode_batch_response(result, len(relative_urls))
+
+    def _batch_form(self, relative_urls: List[str]) -> Dict[str, str]:
+        batch = [{"method": "GET", "relative_url": url} for url in relative_urls]
+        return {
+            "access_token": self.access_token,
+            "batch": json.dumps(batch),
+            "include_headers": "false"
+        }
+
+    def _decode_batch_response(self, result: Any, size: int) -> List[Optional[Dict[str, Any]]]:
+        if not isinstance(result, list):
+            self.logger.error(f"Batch request rejected: {result.get('error') if isinstance(result, dict) else result}")
+            return [None] * size
+        
+        bodies = [self._decode_batch_item(item) for item in result[:size]]
+        return bodies + [None] * (size - len(bodies))
+
+    def _decode_batch_item(self, item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Decode one batch sub-response, or return None if it failed."""
+        # Sub-requests that timed out on Facebook's side come back as null
+        if not item or item.get('code') != 200:
+            return None
+        try:
+            body = json.loads(item.get('body') or '{}')
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(body, dict) or 'error' in body:
+            return None
+        return body
+
+    def get_recent_comments(self, limit: int = 10, posts: Optional[Dict[str, Any]] = None,
+                            comments_by_post: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Get the most recent comments across the last posts.
+
+        Callers that already hold the feed and its comments (e.g. the dashboard)
+        can pass them in to avoid fetching them again.
+        """
         try:
             comments = []
-            posts = self.get_page_posts()
+            if posts is None:
+                posts = self.get_page_posts()
+            if comments_by_post is None:
+                comments_by_post = self.get_comments_for_posts(
+                    [post['id'] for post in posts.get('data', [])[:5]]
+                )
             
             for post in posts.get('data', [])[:5]:  # Check last 5 posts for comments
-                post_comments = self.get_post_comments(post['id'])
+                post_comments = comments_by_post.get(post['id']) or self.get_post_comments(post['id'])
                 for comment in post_comments.get('data', []):
+                    comment = dict(comment)
                     comment['post_id'] = post['id']
                     comment['post_message'] = post.get('message', '')[:50] + '...' if len(post.get('message', '')) > 50 else post.get('message', '')
                     comments.append(comment)
@@ -250,40 +780,52 @@ class FacebookService:
         all_comments.sort(key=lambda x: x.get('created_time', ''), reverse=True)
         return {"data": all_comments[:limit]}
     
-    def generate_post_suggestions(self, llm_service, profile_settings=None, location=None) -> Dict[str, Any]:
-        """Generates post suggestions based on profile settings and location."""
+    def generate_post_suggestions(self, llm_service, profile_settings=None, location=None,
+                                  strategy=None) -> Dict[str, Any]:
+        """Generates post suggestions based on profile settings, location and the page's strategy."""
         try:
-            # Current date for calendar-based suggestions
-            now = datetime.now()
-            date_context = f"Today is {now.strftime('%A, %B %d, %Y')}."
-            
-            # Location context
-            location_context = f"Target audience location is {location}." if location else ""
-            
-            # Profile settings context
-            profile_context = ""
-            if profile_settings:
-                if profile_settings.get('tone'):
-                    profile_context += f"Content tone should be {profile_settings.get('tone')}. "
-                if profile_settings.get('topics'):
-                    profile_context += f"Preferred topics include: {', '.join(profile_settings.get('topics'))}. "
-                if profile_settings.get('industry'):
-                    profile_context += f"Industry is {profile_settings.get('industry')}. "
+            prompt = self.build_post_suggestions_prompt(profile_settings, location)
+            suggestions = llm_service.generate_post_suggestions(prompt, strategy)
+            return {"suggestions": suggestions}
             
-            # Generate suggestions
-            prompt = f"""Based on the following context, suggest 3 social media posts:
+        except Exception as e:
+            self.logger.error(f"Error generating post suggestions: {str(e)}")
+            return self._get_mock_post_suggestions()
+
+    async def generate_post_suggestions_async(self, llm_service, llm_client, profile_settings=None,
+                                              location=None, strategy=None) -> Dict[str, Any]:
+        try:
+            prompt = self.build_post_suggestions_prompt(profile_settings, location)
+            suggestions = await llm_service.generate_post_suggestions_async(llm_client, prompt, strategy)
+            return {"suggestions": suggestions}
+        except Exception as e:
+            self.logger.error(f"Error generating post suggestions: {str(e)}")
+            return self._get_mock_post_suggestions()
+
+    def build_post_suggestions_prompt(self, profile_settings=None, location=None) -> str:
+        # Current date for calendar-based suggestions
+        now = datetime.now()
+        date_context = f"Today is {now.strftime('%A, %B %d, %Y')}."
+        
+        # Location context
+        location_context = f"Target audience location is {location}." if location else ""
+        
+        # Profile settings context
+        profile_context = ""
+        if profile_settings:
+            if profile_settings.get('tone'):
+                profile_context += f"Content tone should be {profile_settings.get('tone')}. "
+            if profile_settings.get('topics'):
+                profile_context += f"Preferred topics include: {', '.join(profile_settings.get('topics'))}. "
+            if profile_settings.get('industry'):
+                profile_context += f"Industry is {profile_settings.get('industry')}. "
+        
+        return f"""Based on the following context, suggest 3 social media posts:
             {date_context}
             {location_context}
             {profile_context}
             Each suggestion should include a post message and a brief explanation why it would engage the audience.
             """
-            
-            suggestions = llm_service.generate_post_suggestions(prompt)
-            return {"suggestions": suggestions}
-            
-        except Exception as e:
-            self.logger.error(f"Error generating post suggestions: {str(e)}")
-            return self._get_mock_post_suggestions()
     
     def _get_mock_post_suggestions(self) -> Dict[str, Any]:
         """Generate mock post suggestions for development/testing."""
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Graph error codes that mean "throttled, try again later"
+GRAPH_RATE_LIMIT_CODES = {4, 17, 32, 613, 80001, 80004}
+RETRY_STATUS_CODES = {500, 502, 503, 504}
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class GraphSession:
+    """Process-wide keep-alive session for Graph API calls.
+
+    Wraps a pooled ``requests.Session`` with default connect/read timeouts and
+    exponential backoff on 5xx responses and Graph rate-limit errors, and keeps
+    counters for tuning the pool under load.
+    """
+
+    def __init__(self, pool_size: int, connect_timeout: float, read_timeout: float,
+                 max_retries: int, backoff_factor: float):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._errors = 0
+        self._latency_buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """Send a request, retrying 5xx and rate-limit responses with backoff.
+
+        POSTs are only retried when ``idempotent`` is set, so a write is never
+        sent twice.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in ('GET', 'DELETE')
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.ConnectionError:
+                self._record((time.perf_counter() - started) * 1000, error=True)
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+            else:
+                self._record((time.perf_counter() - started) * 1000, error=response.status_code >= 400)
+                if not idempotent or attempt >= self.max_retries or not self._should_retry(response):
+                    return response
+
+            attempt += 1
+            with self._lock:
+                self._retries += 1
+            delay = self.backoff_factor * (2 ** (attempt - 1)) * (1 + random.random() / 2)
+            logger.warning(f"Retrying {method} {url.split('?')[0]} in {delay:.2f}s (attempt {attempt})")
+            time.sleep(delay)
+
+    def async_client(self) -> httpx.AsyncClient:
+        """A pooled async client with the same limits and timeouts as the session.
+
+        Use it as an async context manager inside a single event loop.
+        """
+        connect_timeout, read_timeout = self.timeout
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+        )
+
+    async def request_async(self, client: httpx.AsyncClient, method: str, url: str,
+                            idempotent: Optional[bool] = None, **kwargs) -> httpx.Response:
+        """Async variant of ``request`` with the same retry and metrics behaviour."""
+        if idempotent is None:
+            idempotent = method.upper() in ('GET', 'DELETE')
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self._record((time.perf_counter() - started) * 1000, error=True)
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+            else:
+                self._record((time.perf_counter() - started) * 1000, error=response.status_code >= 400)
+                if not idempotent or attempt >= self.max_retries or not self._should_retry(response):
+                    return response
+
+            attempt += 1
+            with self._lock:
+                self._retries += 1
+            delay = self.backoff_factor * (2 ** (attempt - 1)) * (1 + random.random() / 2)
+            logger.warning(f"Retrying {method} {url.split('?')[0]} in {delay:.2f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _should_retry(response) -> bool:
+        if response.status_code in RETRY_STATUS_CODES:
+            return True
+        if response.status_code < 400:
+            return False
+        try:
+            error = response.json().get('error', {})
+        except (ValueError, AttributeError):
+            return False
+        return error.get('code') in GRAPH_RATE_LIMIT_CODES
+
+    def _record(self, latency_ms: float, error: bool = False):
+        with self._lock:
+            self._requests += 1
+            if error:
+                self._errors += 1
+            self._latency_buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Request, retry, pool and latency counters since process start."""
+        connections = 0
+        pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                pooled_requests += pool.num_requests
+
+        with self._lock:
+            histogram = {f"le_{bound}ms": count for bound, count in zip(LATENCY_BUCKETS_MS, self._latency_buckets)}
+            histogram["gt_{}ms".format(LATENCY_BUCKETS_MS[-1])] = self._latency_buckets[-1]
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'errors': self._errors,
+                'connections_opened': connections,
+                'pool_hits': max(pooled_requests - connections, 0),
+                'latency_histogram': histogram
+            }
+
+
+_graph_session: Optional[GraphSession] = None
+_graph_session_pid: Optional[int] = None
+_graph_session_lock = threading.Lock()
+
+
+def get_graph_session() -> GraphSession:
+    """Return this process's shared GraphSession, creating it on first use.
+
+    The session is rebuilt after a fork so worker processes never share
+    sockets with their parent.
+    """
+    global _graph_session, _graph_session_pid
+    if _graph_session is None or _graph_session_pid != os.getpid():
+        with _graph_session_lock:
+            if _graph_session is None or _graph_session_pid != os.getpid():
+                _graph_session = GraphSession(
+                    pool_size=settings.GRAPH_POOL_SIZE,
+                    connect_timeout=settings.GRAPH_CONNECT_TIMEOUT,
+                    read_timeout=settings.GRAPH_REQUEST_TIMEOUT,
+                    max_retries=settings.GRAPH_MAX_RETRIES,
+                    backoff_factor=settings.GRAPH_RETRY_BACKOFF
+                )
+                _graph_session_pid = os.getpid()
+    return _graph_session
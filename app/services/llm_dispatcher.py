@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..config import get_settings
+from .rate_limiter import call_deadline
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# name -> (call, fallback); the fallback is returned if the call fails or misses the deadline
+Calls = Dict[str, Tuple[Callable[[], Any], Callable[[], Any]]]
+AsyncCalls = Dict[str, Tuple[Callable[[], Awaitable[Any]], Callable[[], Any]]]
+
+
+class LLMDispatcher:
+    """Run independent LLM calls concurrently under one shared deadline.
+
+    A page that needs several completions waits for the slowest of them
+    rather than their sum, and never longer than the deadline: any call
+    still running by then is answered with its fallback (the services'
+    existing mock responses). Sync calls run on a shared thread pool and
+    cannot be cancelled, so they carry the deadline with them: a call gives
+    up waiting for rate limit capacity, and its request times out, once the
+    deadline passes, rather than holding a pool thread for later pages.
+    Async calls are cancelled.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.LLM_DISPATCH_WORKERS,
+            thread_name_prefix='llm-dispatch'
+        )
+        self._lock = threading.Lock()
+        self._stats = {'dispatches': 0, 'calls': 0, 'failed': 0, 'missed_deadline': 0, 'last_elapsed_ms': 0.0}
+
+    def run(self, calls: Calls, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Run every call on the pool and return each one's result by name."""
+        deadline = deadline or settings.LLM_DASHBOARD_DEADLINE
+        started = time.perf_counter()
+        expires_at = time.monotonic() + deadline
+        futures = {name: self._executor.submit(self._call_by, expires_at, call) for name, (call, _) in calls.items()}
+        wait(futures.values(), timeout=deadline)
+
+        results = {}
+        missed = []
+        failed = []
+        for name, future in futures.items():
+            fallback = calls[name][1]
+            if not future.done():
+                future.cancel()  # Only stops calls that never started
+                missed.append(name)
+                results[name] = fallback()
+            elif future.exception() is not None:
+                logger.error(f"LLM call '{name}' failed: {str(future.exception())}")
+                failed.append(name)
+                results[name] = fallback()
+            else:
+                results[name] = future.result()
+
+        self._record(len(calls), missed, failed, started, deadline)
+        return results
+
+    @staticmethod
+    def _call_by(expires_at: float, call: Callable[[], Any]) -> Any:
+        token = call_deadline.set(expires_at)
+        try:
+            return call()
+        finally:
+            call_deadline.reset(token)
+
+    async def run_async(self, calls: AsyncCalls, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Async variant of ``run``; calls still pending at the deadline are cancelled."""
+        deadline = deadline or settings.LLM_DASHBOARD_DEADLINE
+        started = time.perf_counter()
+        tasks = {name: asyncio.ensure_future(call()) for name, (call, _) in calls.items()}
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=deadline)
+
+        results = {}
+        missed = []
+        failed = []
+        for name, task in tasks.items():
+            fallback = calls[name][1]
+            if not task.done():
+                task.cancel()
+                missed.append(name)
+                results[name] = fallback()
+            elif task.exception() is not None:
+                logger.error(f"LLM call '{name}' failed: {str(task.exception())}")
+                failed.append(name)
+                results[name] = fallback()
+            else:
+                results[name] = task.result()
+
+        self._record(len(calls), missed, failed, started, deadline)
+        return results
+
+    def _record(self, calls: int, missed: list, failed: list, started: float, deadline: float) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats['dispatches'] += 1
+            self._stats['calls'] += calls
+            self._stats['failed'] += len(failed)
+            self._stats['missed_deadline'] += len(missed)
+            self._stats['last_elapsed_ms'] = round(elapsed_ms, 1)
+        if missed:
+            logger.warning(
+                f"{len(missed)}/{calls} LLM calls missed the {deadline:.1f}s deadline and used fallbacks: "
+                f"{', '.join(missed)}"
+            )
+        logger.info(f"Dispatched {calls} LLM calls in {elapsed_ms:.0f}ms")
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
@@ -1,100 +1,445 @@
-from langchain_groq import ChatGroq
 import groq
+import asyncio
+import hashlib
 import json
 import logging
+import re
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from ..config import get_settings
+from .sentiment_cache import SentimentCache
+from .local_sentiment import LocalSentimentAnalyzer
+from .response_cache import ResponseCache
+from . import prompts
+from .rate_limiter import LLMRateLimiter, call_deadline, PRIORITY_INTERACTIVE, PRIORITY_DASHBOARD, PRIORITY_BATCH
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Cached sentiment results are keyed by this, so a reworded prompt starts afresh;
+# keep prompts.SENTIMENT and prompts.SENTIMENT_BATCH on the same version
+SENTIMENT_PROMPT_VERSION = prompts.SENTIMENT_BATCH.version
+SENTIMENTS = ('positive', 'negative', 'neutral')
+
+# Batch sentiment sizing, in estimated tokens
+SENTIMENT_OUTPUT_TOKENS_PER_ITEM = 24  # One {"id": .., "sentiment": .., "confidence": ..} object
+SENTIMENT_MAX_COMMENT_CHARS = 600
+
+# Shortest request timeout given to a call admitted just before its deadline
+MIN_REQUEST_TIMEOUT = 1.0
+
+# Shared by every LLMService instance in the process
+sentiment_cache = SentimentCache(
+    model_name=settings.MODEL_NAME,
+    prompt_version=SENTIMENT_PROMPT_VERSION,
+    max_entries=settings.SENTIMENT_CACHE_SIZE,
+    persist=settings.SENTIMENT_CACHE_PERSIST
+)
+local_sentiment = LocalSentimentAnalyzer()
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL,
+    mode=settings.RESPONSE_CACHE_MODE,
+    threshold=settings.RESPONSE_CACHE_SIMILARITY,
+    length_tolerance=settings.RESPONSE_CACHE_LENGTH_TOLERANCE
+)
+
+def normalize_sentiment(label: Any) -> str:
+    """One of ``SENTIMENTS`` for a model's label; case is ignored and anything else counts as neutral."""
+    label = str(label or '').strip().lower()
+    return label if label in SENTIMENTS else 'neutral'
+
+rate_limiter = LLMRateLimiter(
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    timeout=settings.LLM_QUEUE_TIMEOUT
+)
+
 class LLMService:
     def __init__(self):
-        self.groq_client = groq.Groq(api_key=settings.GROQ_API_KEY)
-        self.chat_model = ChatGroq(
-            groq_api_key=settings.GROQ_API_KEY,
-            model_name=settings.MODEL_NAME,
-            temperature=settings.TEMPERATURE,
-            max_tokens=settings.MAX_TOKENS
+        # Built on first use; async views build their own client per request
+        self._groq_client = None
+
+    @property
+    def groq_client(self) -> groq.Groq:
+        if self._groq_client is None:
+            self._groq_client = groq.Groq(api_key=settings.GROQ_API_KEY, base_url=settings.GROQ_BASE_URL or None)
+        return self._groq_client
+
+    def async_client(self) -> groq.AsyncGroq:
+        """A Groq client for the async variants below.
+
+        Flask runs each async view in its own event loop, and pooled
+        connections cannot outlive the loop that opened them, so build one
+        per request and use it as an async context manager inside that loop.
+        """
+        return groq.AsyncGroq(api_key=settings.GROQ_API_KEY, base_url=settings.GROQ_BASE_URL or None)
+
+    def _create(self, request: Dict[str, Any], priority: int, **options):
+        """Send one chat completion once the process-wide rate limiter admits it."""
+        reserved = self._request_tokens(request)
+        waited = rate_limiter.acquire(reserved, priority)
+        if waited > 1:
+            logger.info(f"LLM call waited {waited:.1f}s for rate limit capacity")
+        expires_at = call_deadline.get()
+        if expires_at is not None:
+            # Nobody waits for the answer past the deadline, so don't hold the thread for it
+            options.setdefault('timeout', max(expires_at - time.monotonic(), MIN_REQUEST_TIMEOUT))
+        completion = self.groq_client.chat.completions.create(**request, **options)
+        if not options.get('stream'):
+            self._settle(reserved, completion)
+        return completion
+
+    async def _create_async(self, client: groq.AsyncGroq, request: Dict[str, Any], priority: int):
+        reserved = self._request_tokens(request)
+        waited = await rate_limiter.acquire_async(reserved, priority)
+        if waited > 1:
+            logger.info(f"LLM call waited {waited:.1f}s for rate limit capacity")
+        completion = await client.chat.completions.create(**request)
+        self._settle(reserved, completion)
+        return completion
+
+    def _request_tokens(self, request: Dict[str, Any]) -> int:
+        """Estimate a call's token cost: its prompt plus the completion it may produce."""
+        prompt = sum(self._estimate_tokens(message['content']) for message in request['messages'])
+        return prompt + (request.get('max_tokens') or settings.LLM_EXPECTED_COMPLETION_TOKENS)
+
+    @staticmethod
+    def _settle(reserved: int, completion) -> None:
+        """Log the provider's token counts and correct the rate limiter's reservation."""
+        usage = getattr(completion, 'usage', None)
+        if usage is None:
+            return
+        cached = getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', None) or 0
+        logger.debug(
+            f"LLM call used {usage.prompt_tokens} prompt tokens ({cached} cached) "
+            f"and {usage.completion_tokens} completion tokens"
         )
-        self.current_strategy = None
+        rate_limiter.settle(reserved, usage.total_tokens)
 
-    def set_strategy(self, strategy):
-        """Set the current strategy for content generation."""
-        self.current_strategy = strategy
+    def _complete(self, request: Dict[str, Any], parse: Callable[[str], Any],
+                  fallback: Callable[[], Any], action: str, priority: int = PRIORITY_DASHBOARD) -> Any:
+        """Run one chat completion, returning ``fallback()`` if it fails."""
+        try:
+            completion = self._create(request, priority)
+            return parse(completion.choices[0].message.content)
+        except Exception as e:
+            logger.error(f"Error {action}: {str(e)}")
+            return fallback()
 
-    def _get_strategy_context(self) -> str:
-        """Generate context string from current strategy."""
-        if not self.current_strategy:
-            return ""
-        
-        return f"""Business Context:
-- Type: {self.current_strategy.business_type}
-- Target Audience: {', '.join(self.current_strategy.target_audience)}
-- Objectives: {', '.join(self.current_strategy.key_objectives)}
-- Tone: {self.current_strategy.tone_of_voice}
-- Value Props: {', '.join(self.current_strategy.value_propositions)}
-"""
+    async def _complete_async(self, client: groq.AsyncGroq, request: Dict[str, Any], parse: Callable[[str], Any],
+                              fallback: Callable[[], Any], action: str, priority: int = PRIORITY_DASHBOARD) -> Any:
+        """Async variant of ``_complete`` on the non-blocking Groq client."""
+        try:
+            completion = await self._create_async(client, request, priority)
+            return parse(completion.choices[0].message.content)
+        except Exception as e:
+            logger.error(f"Error {action}: {str(e)}")
+            return fallback()
+
+    def _stream(self, request: Dict[str, Any], fallback: Callable[[], str], action: str,
+                priority: int = PRIORITY_INTERACTIVE,
+                on_complete: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        """Yield a completion's text as Groq produces it, logging time-to-first-token.
+
+        If the call fails before any text arrived, ``fallback()`` is yielded
+        instead; a failure mid-stream just ends it. ``on_complete`` receives
+        the full text, only for a stream that finished normally.
+        """
+        started = time.perf_counter()
+        first_token_ms = None
+        chunks = []
+        try:
+            stream = self._create(request, priority, stream=True)
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                chunks.append(delta)
+                yield delta
+            if on_complete and chunks:
+                on_complete("".join(chunks))
+        except Exception as e:
+            logger.error(f"Error {action}: {str(e)}")
+            if first_token_ms is None:
+                yield fallback()
+        finally:
+            total_ms = (time.perf_counter() - started) * 1000
+            first_token = f"{first_token_ms:.0f}ms" if first_token_ms is not None else "n/a"
+            logger.info(f"Streamed {action}: first token {first_token}, {len(chunks)} chunks in {total_ms:.0f}ms")
 
     def analyze_sentiment(self, text: str) -> dict:
+        local = self._local_sentiment(text)
+        if local is not None:
+            return local
+        
+        cached = sentiment_cache.get(text)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""Analyze the sentiment of this text and provide a JSON response with sentiment (positive/negative/neutral) and confidence score: '{text}'"""
-            
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=settings.MODEL_NAME,
-                temperature=settings.TEMPERATURE,
-            )
-            
-            result = completion.choices[0].message.content
-            return self._parse_sentiment_result(result)
+            completion = self._create({
+                "messages": prompts.SENTIMENT.render(text=text),
+                "model": settings.MODEL_NAME,
+                "temperature": settings.TEMPERATURE,
+            }, PRIORITY_BATCH)
+            
+            result = self._parse_sentiment_result(completion.choices[0].message.content)
+            sentiment_cache.set(text, result)
+            return result
         except Exception as e:
             logger.error(f"Error analyzing sentiment: {str(e)}")
             
-            # Provide a mock response if the API call fails
-            # Determine sentiment based on text content for more realistic results
-            text_lower = text.lower()
-            if any(word in text_lower for word in ['great', 'love', 'amazing', 'excellent', 'good', 'thank']):
-                return {"sentiment": "positive", "confidence": 0.85}
-            elif any(word in text_lower for word in ['bad', 'terrible', 'awful', 'poor', 'disappointed']):
-                return {"sentiment": "negative", "confidence": 0.78}
+            # Fall back to the local classifier if the API call fails
+            return local_sentiment.classify(text)
+
+    def _local_sentiment(self, text: str):
+        """Answer from the in-process classifier when the configured tier allows it."""
+        if settings.SENTIMENT_MODE == 'remote':
+            return None
+        result = local_sentiment.classify(text)
+        if settings.SENTIMENT_MODE == 'local' or result['confidence'] >= settings.SENTIMENT_LOCAL_MIN_CONFIDENCE:
+            return result
+        # Ambiguous comment: leave it to the LLM
+        return None
+
+    def analyze_sentiment_batch(self, texts: List[str], max_retries: int = 1) -> List[dict]:
+        """Classify many comments with as few completions as possible.
+
+        Comments the local tier settles and cached texts are answered without
+        a call, duplicates are classified once, and the rest are packed into
+        prompts sized to fit ``Settings.MAX_TOKENS``. Items missing or
+        malformed in a response are re-queried up to ``max_retries`` times
+        before falling back to the local classifier. Results come back in the
+        order of ``texts``.
+        """
+        results, originals, pending = self._start_sentiment_batch(texts)
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            batches = self._split_sentiment_batches([originals[key] for key in pending])
+            classified = [self._classify_sentiment_batch(batch) for batch in batches]
+            pending = self._merge_sentiment_batches(results, batches, classified, attempt < max_retries)
+        return self._finish_sentiment_batch(texts, results, originals, pending)
+
+    async def analyze_sentiment_batch_async(self, client: groq.AsyncGroq, texts: List[str],
+                                            max_retries: int = 1) -> List[dict]:
+        """Async variant of ``analyze_sentiment_batch``; each round's batches run concurrently."""
+        results, originals, pending = self._start_sentiment_batch(texts)
+        for attempt in range(max_retries + 1):
+            if not pending:
+                break
+            batches = self._split_sentiment_batches([originals[key] for key in pending])
+            classified = await asyncio.gather(*(self._classify_sentiment_batch_async(client, batch) for batch in batches))
+            pending = self._merge_sentiment_batches(results, batches, classified, attempt < max_retries)
+        return self._finish_sentiment_batch(texts, results, originals, pending)
+
+    def _start_sentiment_batch(self, texts: List[str]) -> Tuple[Dict[str, dict], Dict[str, str], List[str]]:
+        """Answer what the local tier and cache can; return the normalized texts still pending."""
+        results: Dict[str, dict] = {}
+        originals: Dict[str, str] = {}
+        pending: List[str] = []
+        for text in texts:
+            key = sentiment_cache.normalize(text)
+            if key in originals:
+                continue
+            originals[key] = text
+            local = self._local_sentiment(text)
+            if local is not None:
+                results[key] = local
+                continue
+            cached = sentiment_cache.get(text)
+            if cached is not None:
+                results[key] = cached
             else:
-                return {"sentiment": "neutral", "confidence": 0.65}
+                pending.append(key)
+        return results, originals, pending
 
-    def generate_response(self, comment: str, context: str) -> str:
-        strategy_context = self._get_strategy_context()
-        enhanced_context = f"{strategy_context}\n{context}" if strategy_context else context
-        
+    def _merge_sentiment_batches(self, results: Dict[str, dict], batches: List[List[str]],
+                                 classified: List[Dict[int, dict]], retrying: bool) -> List[str]:
+        """Store parsed batch results; return the normalized texts that are still missing."""
+        missing = []
+        for batch, batch_results in zip(batches, classified):
+            for index, text in enumerate(batch):
+                key = sentiment_cache.normalize(text)
+                if index in batch_results:
+                    results[key] = batch_results[index]
+                    sentiment_cache.set(text, batch_results[index])
+                else:
+                    missing.append(key)
+        if missing and retrying:
+            logger.warning(f"Re-querying sentiment for {len(missing)} unparsed comments")
+        return missing
+
+    def _finish_sentiment_batch(self, texts: List[str], results: Dict[str, dict],
+                                originals: Dict[str, str], pending: List[str]) -> List[dict]:
+        for key, result in zip(pending, local_sentiment.classify_batch([originals[key] for key in pending])):
+            results[key] = result
+        return [results[sentiment_cache.normalize(text)] for text in texts]
+
+    def _split_sentiment_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts so each batch's prompt and answer fit the token budget."""
+        budget = settings.MAX_TOKENS // 2  # Half for the comments, half for the answer
+        batches, current, used = [], [], 0
+        for text in texts:
+            cost = self._estimate_tokens(text[:SENTIMENT_MAX_COMMENT_CHARS]) + SENTIMENT_OUTPUT_TOKENS_PER_ITEM
+            if current and used + cost > budget:
+                batches.append(current)
+                current, used = [], 0
+            current.append(text)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        return prompts.estimate_tokens(text)
+
+    def _classify_sentiment_batch(self, texts: List[str]) -> Dict[int, dict]:
+        """Classify one batch, returning results keyed by position; bad items are left out."""
+        return self._complete(
+            self._sentiment_batch_request(texts),
+            lambda result: self._parse_sentiment_batch(result, len(texts)),
+            dict,
+            "analyzing sentiment batch",
+            PRIORITY_BATCH
+        )
+
+    async def _classify_sentiment_batch_async(self, client: groq.AsyncGroq, texts: List[str]) -> Dict[int, dict]:
+        return await self._complete_async(
+            client,
+            self._sentiment_batch_request(texts),
+            lambda result: self._parse_sentiment_batch(result, len(texts)),
+            dict,
+            "analyzing sentiment batch",
+            PRIORITY_BATCH
+        )
+
+    def _sentiment_batch_request(self, texts: List[str]) -> Dict[str, Any]:
+        items = [{"id": index, "text": text[:SENTIMENT_MAX_COMMENT_CHARS]} for index, text in enumerate(texts)]
+        return {
+            "messages": prompts.SENTIMENT_BATCH.render(comments=json.dumps(items, ensure_ascii=False)),
+            "model": settings.MODEL_NAME,
+            "temperature": settings.TEMPERATURE,
+            "max_tokens": min(settings.MAX_TOKENS, len(texts) * SENTIMENT_OUTPUT_TOKENS_PER_ITEM + 64)
+        }
+
+    def _parse_sentiment_batch(self, result: str, size: int) -> Dict[int, dict]:
+        """Parse a JSON array of sentiment objects, skipping anything malformed."""
+        # Models sometimes wrap the array in prose or code fences
+        match = re.search(r'\[.*\]', result or '', re.DOTALL)
+        if not match:
+            return {}
         try:
-            prompt = f"""Context: {enhanced_context}
-            
-            Please generate a professional response to this comment on our social media page: '{comment}'
-            
-            The response should:
-            - Align with our business strategy and objectives
-            - Be conversational and personable
-            - Address the specific points in the comment
-            - Be around 2-3 sentences
-            - Match our defined tone of voice
-            - Include appropriate emojis if relevant
-            """
-            
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=settings.MODEL_NAME,
-                temperature=0.6,
-            )
-            
-            return completion.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Error generating response: {str(e)}")
-            return "We appreciate your feedback and will get back to you soon."
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        
+        parsed = {}
+        for item in data if isinstance(data, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.get('id'))
+                sentiment = str(item.get('sentiment', '')).strip().lower()
+                confidence = min(max(float(item.get('confidence', 0.5)), 0.0), 1.0)
+            except (TypeError, ValueError):
+                continue
+            if 0 <= index < size and sentiment in SENTIMENTS:
+                parsed[index] = {"sentiment": sentiment, "confidence": confidence}
+        return parsed
+
+    def get_sentiment_cache_metrics(self) -> dict:
+        """Hit-rate counters of the shared sentiment result cache."""
+        return sentiment_cache.stats()
+
+    def get_rate_limit_metrics(self) -> dict:
+        """Queue depth and wait times of the shared Groq rate limiter."""
+        return rate_limiter.metrics()
+
+    def get_response_cache_metrics(self) -> dict:
+        """Hit ratio and lookup time of the shared reply cache."""
+        return response_cache.stats()
+
+    def get_prompt_metrics(self) -> dict:
+        """Estimated prompt tokens per template, split into the cacheable prefix and per-call input."""
+        return prompts.prompt_stats.snapshot()
+
+    def generate_response(self, comment: str, context: str, strategy=None) -> str:
+        scope = self._reply_cache_scope(prompts.RESPONSE, strategy, context)
+        cached = response_cache.get(scope, comment)
+        if cached is not None:
+            return cached
+        
+        response = self._complete(
+            self._response_request(comment, context, strategy),
+            lambda result: result,
+            self._get_default_response,
+            "generating response",
+            PRIORITY_INTERACTIVE
+        )
+        if response != self._get_default_response():
+            response_cache.set(scope, comment, response)
+        return response
+
+    def stream_response(self, comment: str, context: str, strategy=None,
+                        on_complete: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+        """Streaming variant of ``generate_response``; yields text as it is generated.
+
+        ``on_complete`` receives the whole reply once it is known to be
+        complete: a cached one, or a stream that finished normally. It is not
+        called for a stream that failed, so callers can tell a finished reply
+        from one cut off mid-stream (or the fallback text).
+        """
+        scope = self._reply_cache_scope(prompts.RESPONSE, strategy, context)
+        cached = response_cache.get(scope, comment)
+        if cached is not None:
+            yield cached
+            if on_complete:
+                on_complete(cached)
+            return
+        
+        def complete(response):
+            response_cache.set(scope, comment, response)
+            if on_complete:
+                on_complete(response)
+        
+        yield from self._stream(
+            self._response_request(comment, context, strategy),
+            self._get_default_response,
+            "generating response",
+            on_complete=complete
+        )
+
+    def _reply_cache_scope(self, template: prompts.PromptTemplate, strategy=None, context: str = "") -> str:
+        """Everything other than the comment that shapes a reply; cached replies never cross scopes."""
+        strategy_id = str(getattr(strategy, 'id', None) or '') if strategy else ''
+        # The rendered context changes whenever the strategy or page profile is edited
+        strategy_context = prompts.render_strategy_context(strategy)
+        digest = hashlib.sha1(f"{strategy_context}\x00{context}".encode('utf-8')).hexdigest()
+        return f"{template.key}:{settings.MODEL_NAME}:{strategy_id}:{digest}"
+
+    def _response_request(self, comment: str, context: str, strategy=None) -> Dict[str, Any]:
+        return {
+            "messages": prompts.RESPONSE.render(
+                prompts.render_strategy_context(strategy), page_context=context.strip(), comment=comment
+            ),
+            "model": settings.MODEL_NAME,
+            "temperature": 0.6,
+        }
+
+    def _get_default_response(self) -> str:
+        return "We appreciate your feedback and will get back to you soon."
 
     def _parse_sentiment_result(self, result: str) -> dict:
         try:
             # Try to parse JSON from the result
             data = json.loads(result)
             return {
-                "sentiment": data.get("sentiment", "neutral"),
+                "sentiment": normalize_sentiment(data.get("sentiment")),
                 "confidence": float(data.get("confidence", 0.5))
             }
         except json.JSONDecodeError:
@@ -108,41 +453,58 @@ class LLMService:
             return {"sentiment": "neutral", "confidence": 0.0}
 
     def generate_content_suggestion(self, topic: str) -> str:
-        try:
-            prompt = f"""Generate a creative, engaging social media post about: {topic}. 
-            The post should be around 100-150 words and include hashtags. Make it sound natural and conversational."""
-            
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=settings.MODEL_NAME,
-                temperature=0.7,  # Slightly higher temperature for creativity
-            )
-            
-            return completion.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Error generating content suggestion: {str(e)}")
-            return "Unable to generate suggestion at this time."
+        return self._complete(
+            self._content_suggestion_request(topic),
+            lambda result: result,
+            self._get_default_content_suggestion,
+            "generating content suggestion",
+            PRIORITY_INTERACTIVE
+        )
+
+    def stream_content_suggestion(self, topic: str) -> Iterator[str]:
+        """Streaming variant of ``generate_content_suggestion``."""
+        return self._stream(
+            self._content_suggestion_request(topic),
+            self._get_default_content_suggestion,
+            "generating content suggestion"
+        )
 
-    def generate_post_suggestions(self, prompt: str) -> list:
+    def _content_suggestion_request(self, topic: str) -> Dict[str, Any]:
+        return {
+            "messages": prompts.CONTENT_SUGGESTION.render(topic=topic),
+            "model": settings.MODEL_NAME,
+            "temperature": 0.7,  # Slightly higher temperature for creativity
+        }
+
+    def _get_default_content_suggestion(self) -> str:
+        return "Unable to generate suggestion at this time."
+
+    def generate_post_suggestions(self, prompt: str, strategy=None) -> list:
         """Generate social media post suggestions based on the given prompt."""
-        strategy_context = self._get_strategy_context()
-        enhanced_prompt = f"{strategy_context}\n{prompt}"
-        
-        try:
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": enhanced_prompt}],
-                model=settings.MODEL_NAME,
-                temperature=0.7,
-            )
-            
-            # Try to parse the suggestions from the AI response
-            result = completion.choices[0].message.content
-            return self._parse_post_suggestions(result)
-        except Exception as e:
-            logger.error(f"Error generating post suggestions: {str(e)}")
-            return self._get_mock_strategy_suggestions()
+        return self._complete(
+            self._post_suggestions_request(prompt, strategy),
+            lambda result: self._parse_post_suggestions(result, strategy),
+            lambda: self._get_mock_strategy_suggestions(strategy),
+            "generating post suggestions"
+        )
+
+    async def generate_post_suggestions_async(self, client: groq.AsyncGroq, prompt: str, strategy=None) -> list:
+        return await self._complete_async(
+            client,
+            self._post_suggestions_request(prompt, strategy),
+            lambda result: self._parse_post_suggestions(result, strategy),
+            lambda: self._get_mock_strategy_suggestions(strategy),
+            "generating post suggestions"
+        )
 
-    def _parse_post_suggestions(self, result: str) -> list:
+    def _post_suggestions_request(self, prompt: str, strategy=None) -> Dict[str, Any]:
+        return {
+            "messages": prompts.POST_SUGGESTIONS.render(prompts.render_strategy_context(strategy), prompt=prompt),
+            "model": settings.MODEL_NAME,
+            "temperature": 0.7,
+        }
+
+    def _parse_post_suggestions(self, result: str, strategy=None) -> list:
         """Parse suggestions from LLM response."""
         try:
             # Attempt to parse as JSON first
@@ -168,22 +530,22 @@ class LLMService:
             if current_suggestion:
                 suggestions.append(current_suggestion)
                 
-            return suggestions if suggestions else self._get_mock_strategy_suggestions()
+            return suggestions if suggestions else self._get_mock_strategy_suggestions(strategy)
             
         except Exception as e:
             logger.error(f"Error parsing post suggestions: {str(e)}")
-            return self._get_mock_strategy_suggestions()
+            return self._get_mock_strategy_suggestions(strategy)
 
-    def _get_mock_strategy_suggestions(self) -> list:
+    def _get_mock_strategy_suggestions(self, strategy=None) -> list:
         """Generate strategy-aligned mock suggestions."""
-        if not self.current_strategy:
+        if not strategy:
             return self._get_default_suggestions()
         
         # Example for a SaaS product strategy
-        if self.current_strategy.business_type == "SaaS":
+        if strategy.business_type == "SaaS":
             return [
                 {
-                    "message": f"🚀 Streamline your {self.current_strategy.target_audience[0]} workflow with AI-powered automation! See how {self.current_strategy.value_propositions[0]}. Book a demo today! #AITechnology #Productivity",
+                    "message": f"🚀 Streamline your {strategy.target_audience[0]} workflow with AI-powered automation! See how {strategy.value_propositions[0]}. Book a demo today! #AITechnology #Productivity",
                     "reason": "Highlights value proposition and targets specific audience pain points."
                 },
                 {
@@ -216,158 +578,214 @@ class LLMService:
 
     def summarize_recent_activity(self, activities: list) -> str:
         """Generates a concise summary of recent page activities."""
-        try:
-            if not activities:
-                return "No recent activity to summarize."
-                
-            # Create a condensed representation of activities to respect token limits
-            activity_summary = "\n".join([
-                f"- Post: '{act.get('message', '')[:50]}...' with {act.get('comment_count', 0)} comments"
-                for act in activities[:5]
-            ])
-            
-            prompt = f"""Provide a very concise summary (max 2-3 sentences) of the following social media activities:
-            {activity_summary}
-            
-            Focus on key engagement patterns and notable changes. Be brief but insightful."""
-            
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=settings.MODEL_NAME,
-                temperature=0.4,
-                max_tokens=100  # Strict token limit for concise response
-            )
-            
-            return completion.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Error summarizing recent activity: {str(e)}")
-            
-            # Provide a mock summary instead of an error message
-            post_count = len(activities)
-            comment_count = sum(act.get('comment_count', 0) for act in activities)
-            
-            return f"Your page has {post_count} recent posts generating {comment_count} comments. Engagement appears highest on posts about product updates and questions that invite audience participation."
+        if not activities:
+            return "No recent activity to summarize."
+        return self._complete(
+            self._activity_summary_request(activities),
+            lambda result: result,
+            lambda: self._get_mock_activity_summary(activities),
+            "summarizing recent activity"
+        )
+
+    async def summarize_recent_activity_async(self, client: groq.AsyncGroq, activities: list) -> str:
+        if not activities:
+            return "No recent activity to summarize."
+        return await self._complete_async(
+            client,
+            self._activity_summary_request(activities),
+            lambda result: result,
+            lambda: self._get_mock_activity_summary(activities),
+            "summarizing recent activity"
+        )
+
+    def _activity_summary_request(self, activities: list) -> Dict[str, Any]:
+        # Create a condensed representation of activities to respect token limits
+        activity_summary = "\n".join([
+            f"- Post: '{act.get('message', '')[:50]}...' with {act.get('comment_count', 0)} comments"
+            for act in activities[:5]
+        ])
+        
+        return {
+            "messages": prompts.ACTIVITY_SUMMARY.render(activities=activity_summary),
+            "model": settings.MODEL_NAME,
+            "temperature": 0.4,
+            "max_tokens": 100  # Strict token limit for concise response
+        }
+
+    def _get_mock_activity_summary(self, activities: list) -> str:
+        """Provide a mock summary instead of an error message."""
+        post_count = len(activities)
+        comment_count = sum(act.get('comment_count', 0) for act in activities)
+        
+        return f"Your page has {post_count} recent posts generating {comment_count} comments. Engagement appears highest on posts about product updates and questions that invite audience participation."
             
     def summarize_audience_feedback(self, comments: list) -> dict:
         """Analyzes comments to identify common topics and sentiment."""
+        if not comments or len(comments) < 3:
+            return {"summary": "Not enough recent comments to analyze audience feedback.", "topics": []}
+        return self._complete(
+            self._audience_feedback_request(comments),
+            self._parse_audience_feedback,
+            lambda: self._get_mock_audience_feedback(comments),
+            "summarizing audience feedback"
+        )
+
+    async def summarize_audience_feedback_async(self, client: groq.AsyncGroq, comments: list) -> dict:
+        if not comments or len(comments) < 3:
+            return {"summary": "Not enough recent comments to analyze audience feedback.", "topics": []}
+        return await self._complete_async(
+            client,
+            self._audience_feedback_request(comments),
+            self._parse_audience_feedback,
+            lambda: self._get_mock_audience_feedback(comments),
+            "summarizing audience feedback"
+        )
+
+    def _audience_feedback_request(self, comments: list) -> Dict[str, Any]:
+        # Create a condensed representation of comments to respect token limits
+        comment_text = "\n".join([
+            f"- {comment.get('message', '')[:70]}"
+            for comment in comments[:10]
+        ])
+        
+        return {
+            "messages": prompts.AUDIENCE_FEEDBACK.render(comments=comment_text),
+            "model": settings.MODEL_NAME,
+            "temperature": 0.3,
+            "max_tokens": 200  # Limited token count
+        }
+
+    def _parse_audience_feedback(self, result: str) -> dict:
         try:
-            if not comments or len(comments) < 3:
-                return {"summary": "Not enough recent comments to analyze audience feedback.", "topics": []}
-                
-            # Create a condensed representation of comments to respect token limits
-            comment_text = "\n".join([
-                f"- {comment.get('message', '')[:70]}"
-                for comment in comments[:10]
-            ])
-            
-            prompt = f"""Analyze these social media comments and identify:
-            1. The 2-3 main topics being discussed
-            2. Overall sentiment towards each topic
-            3. A very brief summary (maximum 2 sentences)
-            
-            Comments:
-            {comment_text}
-            
-            Return in simple JSON format with keys: summary, topics (array of objects with name and sentiment)"""
-            
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=settings.MODEL_NAME,
-                temperature=0.3,
-                max_tokens=200  # Limited token count
-            )
-            
-            result = completion.choices[0].message.content
-            
-            try:
-                # Try to parse the JSON response
-                return json.loads(result)
-            except json.JSONDecodeError:
-                # Fallback if the response isn't valid JSON
-                return {
-                    "summary": result[:100] + "...",
-                    "topics": []
-                }
-                
-        except Exception as e:
-            logger.error(f"Error summarizing audience feedback: {str(e)}")
-            
-            # Provide mock analysis instead of error message
-            topics_count = {}
-            sentiments = {}
-            
-            # Count occurrences of common topics and track sentiment
-            for comment in comments:
-                text = comment.get('message', '').lower()
-                
-                # Simple topic detection
-                for topic, keywords in {
-                    "Product Features": ["feature", "update", "new", "latest"],
-                    "Customer Support": ["help", "support", "issue", "problem", "fix"],
-                    "User Experience": ["experience", "interface", "using", "works", "easy"],
-                    "Pricing": ["price", "cost", "expensive", "cheap", "worth"],
-                    "Mobile App": ["app", "mobile", "phone", "android", "ios"]
-                }.items():
-                    if any(keyword in text for keyword in keywords):
-                        topics_count[topic] = topics_count.get(topic, 0) + 1
-                        
-                        # Simple sentiment detection
-                        sentiment = "neutral"
-                        if any(pos in text for pos in ["great", "good", "love", "amazing", "thanks"]):
-                            sentiment = "positive"
-                        elif any(neg in text for neg in ["bad", "issue", "problem", "hate", "difficult"]):
-                            sentiment = "negative"
-                            
-                        sentiments[topic] = sentiments.get(topic, []) + [sentiment]
-            
-            # Get top topics
-            top_topics = sorted(topics_count.items(), key=lambda x: x[1], reverse=True)[:3]
-            
-            # Calculate dominant sentiment for each topic
-            topic_sentiments = []
-            for topic, _ in top_topics:
-                s_counts = {"positive": 0, "neutral": 0, "negative": 0}
-                for s in sentiments.get(topic, []):
-                    s_counts[s] += 1
-                dominant = max(s_counts.items(), key=lambda x: x[1])[0]
-                topic_sentiments.append({"name": topic, "sentiment": dominant})
-            
+            # Try to parse the JSON response
+            return json.loads(result)
+        except json.JSONDecodeError:
+            # Fallback if the response isn't valid JSON
             return {
-                "summary": f"Comments focus primarily on {', '.join(t[0] for t in top_topics[:2])}. Overall sentiment is mixed with the most engaged topics receiving both positive and negative feedback.",
-                "topics": topic_sentiments
+                "summary": result[:100] + "...",
+                "topics": []
             }
 
+    def _get_mock_audience_feedback(self, comments: list) -> dict:
+        """Provide mock analysis instead of an error message."""
+        topics_count = {}
+        sentiments = {}
+        
+        # Count occurrences of common topics and track sentiment
+        for comment in comments:
+            text = comment.get('message', '').lower()
+            
+            # Simple topic detection
+            for topic, keywords in {
+                "Product Features": ["feature", "update", "new", "latest"],
+                "Customer Support": ["help", "support", "issue", "problem", "fix"],
+                "User Experience": ["experience", "interface", "using", "works", "easy"],
+                "Pricing": ["price", "cost", "expensive", "cheap", "worth"],
+                "Mobile App": ["app", "mobile", "phone", "android", "ios"]
+            }.items():
+                if any(keyword in text for keyword in keywords):
+                    topics_count[topic] = topics_count.get(topic, 0) + 1
+                    
+                    # Simple sentiment detection
+                    sentiment = "neutral"
+                    if any(pos in text for pos in ["great", "good", "love", "amazing", "thanks"]):
+                        sentiment = "positive"
+                    elif any(neg in text for neg in ["bad", "issue", "problem", "hate", "difficult"]):
+                        sentiment = "negative"
+                        
+                    sentiments[topic] = sentiments.get(topic, []) + [sentiment]
+        
+        # Get top topics
+        top_topics = sorted(topics_count.items(), key=lambda x: x[1], reverse=True)[:3]
+        
+        # Calculate dominant sentiment for each topic
+        topic_sentiments = []
+        for topic, _ in top_topics:
+            s_counts = {"positive": 0, "neutral": 0, "negative": 0}
+            for s in sentiments.get(topic, []):
+                s_counts[s] += 1
+            dominant = max(s_counts.items(), key=lambda x: x[1])[0]
+            topic_sentiments.append({"name": topic, "sentiment": dominant})
+        
+        return {
+            "summary": f"Comments focus primarily on {', '.join(t[0] for t in top_topics[:2])}. Overall sentiment is mixed with the most engaged topics receiving both positive and negative feedback.",
+            "topics": topic_sentiments
+        }
+
     def generate_quick_replies(self, comment: str, strategy=None) -> list:
         """Generate quick reply suggestions for a comment."""
-        try:
-            strategy_context = self._get_strategy_context() if strategy else ""
-            prompt = f"""Context: {strategy_context}
-            
-            Generate 3 quick, professional, and friendly replies to this comment: '{comment}'
-            Each reply should:
-            - Be concise (1-2 sentences)
-            - Match our tone of voice
-            - Be relevant to the comment context
-            - Include emojis where appropriate
-            """
-            
-            completion = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model=settings.MODEL_NAME,
-                temperature=0.7,
-            )
-            
-            # Get the response and split into individual replies
-            replies = completion.choices[0].message.content.split('\n')
-            return [r.strip() for r in replies if r.strip()]
-            
-        except Exception as e:
-            logger.error(f"Error generating quick replies: {str(e)}")
-            return [
-                "Thank you for your feedback! 🙏",
-                "We appreciate your input! 👍",
-                "Thanks for sharing your thoughts with us! 😊"
-            ]
+        scope = self._reply_cache_scope(prompts.QUICK_REPLIES, strategy)
+        cached = response_cache.get(scope, comment)
+        if cached is not None:
+            return cached
+        
+        replies = self._complete(
+            self._quick_replies_request(comment, strategy),
+            self._parse_quick_replies,
+            self._get_default_quick_replies,
+            "generating quick replies"
+        )
+        self._cache_quick_replies(scope, comment, replies)
+        return replies
+
+    async def generate_quick_replies_async(self, client: groq.AsyncGroq, comment: str, strategy=None) -> list:
+        scope = self._reply_cache_scope(prompts.QUICK_REPLIES, strategy)
+        cached = response_cache.get(scope, comment)
+        if cached is not None:
+            return cached
+        
+        replies = await self._complete_async(
+            client,
+            self._quick_replies_request(comment, strategy),
+            self._parse_quick_replies,
+            self._get_default_quick_replies,
+            "generating quick replies"
+        )
+        self._cache_quick_replies(scope, comment, replies)
+        return replies
+
+    def _cache_quick_replies(self, scope: str, comment: str, replies: list) -> None:
+        # Fallbacks are not cached, so the next view retries the LLM
+        if replies and replies != self._get_default_quick_replies():
+            response_cache.set(scope, comment, replies)
+
+    def stream_quick_replies(self, comment: str, strategy=None) -> Iterator[str]:
+        """Yield each quick reply as soon as its line is complete."""
+        scope = self._reply_cache_scope(prompts.QUICK_REPLIES, strategy)
+        cached = response_cache.get(scope, comment)
+        if cached is not None:
+            yield from cached
+            return
+        
+        buffer = ""
+        stream = self._stream(
+            self._quick_replies_request(comment, strategy),
+            lambda: "\n".join(self._get_default_quick_replies()),
+            "generating quick replies",
+            on_complete=lambda result: self._cache_quick_replies(scope, comment, self._parse_quick_replies(result))
+        )
+        for text in stream:
+            buffer += text
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if line.strip():
+                    yield line.strip()
+        if buffer.strip():
+            yield buffer.strip()
+
+    def _quick_replies_request(self, comment: str, strategy=None) -> Dict[str, Any]:
+        return {
+            "messages": prompts.QUICK_REPLIES.render(prompts.render_strategy_context(strategy), comment=comment),
+            "model": settings.MODEL_NAME,
+            "temperature": 0.7,
+        }
+
+    def _get_default_quick_replies(self) -> list:
+        return [
+            "Thank you for your feedback! 🙏",
+            "We appreciate your input! 👍",
+            "Thanks for sharing your thoughts with us! 😊"
+        ]
 
     def _parse_quick_replies(self, result: str) -> list:
         """Parse quick replies from the LLM response."""
@@ -0,0 +1,142 @@
+import math
+import re
+from typing import Dict, List
+
+# Word valences on a -4..4 scale
+LEXICON: Dict[str, float] = {
+    # Positive
+    'amazing': 3.1, 'awesome': 3.1, 'excellent': 3.2, 'fantastic': 3.2, 'great': 3.0,
+    'love': 3.2, 'loved': 2.9, 'loving': 2.9, 'perfect': 3.0, 'wonderful': 3.0,
+    'brilliant': 2.9, 'outstanding': 3.0, 'incredible': 2.9, 'superb': 3.0, 'best': 3.0,
+    'good': 1.9, 'nice': 1.8, 'cool': 1.3, 'happy': 2.7, 'glad': 2.0, 'pleased': 2.0,
+    'enjoy': 2.2, 'enjoyed': 2.2, 'like': 1.5, 'liked': 1.6, 'helpful': 1.9, 'useful': 1.8,
+    'easy': 1.4, 'fast': 1.2, 'beautiful': 2.9, 'impressive': 2.3, 'recommend': 1.9,
+    'thanks': 1.9, 'thank': 1.9, 'thx': 1.5, 'appreciate': 2.0, 'appreciated': 2.0,
+    'excited': 2.2, 'exciting': 2.2, 'cant wait': 1.8, 'finally': 1.0, 'works': 1.0,
+    'congrats': 2.4, 'congratulations': 2.4, 'wow': 2.0, 'yay': 2.4, 'fun': 2.3,
+    'smooth': 1.4, 'reliable': 1.8, 'worth': 1.4, 'satisfied': 1.9, 'fixed': 1.1,
+    # Negative
+    'bad': -2.5, 'terrible': -3.0, 'awful': -3.1, 'horrible': -3.1, 'worst': -3.1,
+    'hate': -2.7, 'hated': -3.0, 'poor': -2.1, 'disappointed': -2.2, 'disappointing': -2.3,
+    'annoying': -1.9, 'annoyed': -1.9, 'angry': -2.3, 'useless': -2.6, 'broken': -2.1,
+    'bug': -1.6, 'buggy': -2.1, 'crash': -2.2, 'crashes': -2.2, 'crashing': -2.2,
+    'slow': -1.5, 'expensive': -1.3, 'overpriced': -2.1, 'scam': -3.0, 'fraud': -3.0,
+    'problem': -1.7, 'problems': -1.7, 'issue': -1.3, 'issues': -1.3, 'fail': -2.1,
+    'failed': -2.2, 'fails': -2.1, 'error': -1.5, 'wrong': -2.1, 'waste': -2.3,
+    'refund': -1.4, 'unacceptable': -2.6, 'frustrating': -2.2, 'frustrated': -2.2,
+    'confusing': -1.5, 'difficult': -1.3, 'sad': -2.1, 'ugly': -2.3, 'rude': -2.3,
+    'unhappy': -2.3, 'sucks': -2.6, 'lame': -1.9, 'stupid': -2.4,
+}
+
+EMOJI_LEXICON: Dict[str, float] = {
+    '😍': 3.0, '❤': 3.0, '😊': 2.5, '🙂': 1.6, '😀': 2.4, '😃': 2.4,
+    '👍': 2.0, '🙏': 1.8, '🎉': 2.6, '🔥': 2.0, '👏': 2.2,
+    '😡': -3.0, '😠': -2.7, '👎': -2.0, '😞': -2.3, '😢': -2.2, '😭': -2.4, '🤬': -3.1,
+}
+
+NEGATIONS = {
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor', 'without',
+    'isnt', 'arent', 'wasnt', 'werent', 'dont', 'doesnt', 'didnt', 'cant', 'cannot',
+    'couldnt', 'wont', 'wouldnt', 'shouldnt', 'hasnt', 'havent', 'aint',
+}
+
+INTENSIFIERS: Dict[str, float] = {
+    'very': 0.3, 'really': 0.3, 'so': 0.3, 'extremely': 0.5, 'super': 0.4, 'totally': 0.4,
+    'absolutely': 0.5, 'incredibly': 0.5, 'too': 0.2, 'most': 0.3, 'completely': 0.4,
+    'slightly': -0.3, 'somewhat': -0.3, 'barely': -0.4, 'kinda': -0.3, 'little': -0.2,
+}
+
+NEGATION_SCALAR = -0.74  # Negated words flip and soften, e.g. "not great" is mildly negative
+NEGATION_WINDOW = 3  # Words a negation reaches forward
+CONTRAST_WORDS = {'but', 'however', 'although', 'though'}
+NORMALIZATION_ALPHA = 15.0
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?|[!?]")
+
+
+class LocalSentimentAnalyzer:
+    """In-process, lexicon-based sentiment classifier.
+
+    Scores each word from a valence lexicon, flips words within reach of a
+    negation, scales them by preceding intensifiers and weights the clause
+    after a contrast word ("..., but ...") more heavily. No network access,
+    so classifying a comment takes microseconds.
+    """
+
+    def classify(self, text: str) -> dict:
+        score, evidence = self._score(text or '')
+        compound = score / math.sqrt(score * score + NORMALIZATION_ALPHA)
+
+        if evidence == 0:
+            # Nothing to go on: neutral, but not confidently so
+            return {"sentiment": "neutral", "confidence": 0.5}
+        if abs(compound) < 0.05:
+            return {"sentiment": "neutral", "confidence": 0.6}
+
+        # Stronger scores and more sentiment-bearing words raise confidence
+        confidence = 0.5 + abs(compound) * 0.4 + min(evidence, 4) * 0.025
+        return {
+            "sentiment": "positive" if compound > 0 else "negative",
+            "confidence": round(min(confidence, 0.99), 3)
+        }
+
+    def classify_batch(self, texts: List[str]) -> List[dict]:
+        """Classify many texts, scoring each distinct text once.
+
+        This is not vectorized: numpy is not a dependency, and with a dict
+        lookup per token over short, ragged comments, padding them into
+        arrays would cost more than it saves. Batches gain from scoring
+        repeated comments ("Thanks!", "Price?") only once.
+        """
+        results: Dict[str, dict] = {}
+        for text in texts:
+            if text not in results:
+                results[text] = self.classify(text)
+        return [results[text] for text in texts]
+
+    def _score(self, text: str):
+        lowered = text.lower()
+        tokens = _TOKEN.findall(lowered.replace("n't", "nt"))
+
+        score = 0.0
+        evidence = 0
+        clause_weight = 1.0
+        for i, token in enumerate(tokens):
+            if token in CONTRAST_WORDS:
+                # What follows "but" usually carries the commenter's verdict
+                score *= 0.5
+                clause_weight = 1.5
+                continue
+
+            valence = LEXICON.get(token)
+            if valence is None and i + 1 < len(tokens):
+                valence = LEXICON.get(f"{token} {tokens[i + 1]}")
+            if valence is None:
+                continue
+
+            for back in range(1, NEGATION_WINDOW + 1):
+                if i - back < 0:
+                    break
+                if tokens[i - back] in NEGATIONS:
+                    valence *= NEGATION_SCALAR
+                    break
+
+            if i > 0 and tokens[i - 1] in INTENSIFIERS:
+                boost = INTENSIFIERS[tokens[i - 1]]
+                valence += boost if valence > 0 else -boost
+
+            score += valence * clause_weight
+            evidence += 1
+
+        for emoji, valence in EMOJI_LEXICON.items():
+            count = lowered.count(emoji)
+            if count:
+                score += valence * count
+                evidence += count
+
+        # Exclamation marks amplify whatever direction the comment leans
+        exclamations = min(tokens.count('!'), 4)
+        if score and exclamations:
+            score += exclamations * 0.29 * (1 if score > 0 else -1)
+
+        return score, evidence
@@ -0,0 +1,212 @@
+import logging
+import string
+import textwrap
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+
+class PromptTemplate:
+    """A versioned prompt, parsed once at import.
+
+    The fixed instructions are sent first, as the system message, followed
+    by the strategy context when one applies, so every call with the same
+    template and strategy shares the same prefix and provider-side prompt
+    caching can reuse it. Only the per-call input goes in the user message.
+    Bump ``version`` whenever the wording changes; results cached against a
+    prompt (e.g. sentiment) are keyed by it.
+    """
+
+    def __init__(self, name: str, version: str, instructions: str, user_input: str):
+        self.name = name
+        self.version = version
+        self.key = f"{name}@{version}"
+        self.instructions = textwrap.dedent(instructions).strip()
+        self.instruction_tokens = estimate_tokens(self.instructions) if self.instructions else 0
+        # (literal text, field name) pairs; rendering just joins them
+        self._parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(textwrap.dedent(user_input).strip())]
+
+    def render(self, strategy_context: str = "", **values: Any) -> List[Dict[str, str]]:
+        """Build the chat messages for one call from the template's input fields."""
+        text = "".join(literal + (str(values[field]) if field is not None else "") for literal, field in self._parts)
+        system = "\n\n".join(part for part in (self.instructions, strategy_context) if part)
+
+        context_tokens = estimate_tokens(strategy_context) if strategy_context else 0
+        input_tokens = estimate_tokens(text)
+        prompt_stats.record(self.key, self.instruction_tokens, context_tokens, input_tokens)
+        logger.debug(
+            f"Prompt {self.key}: ~{self.instruction_tokens} instruction + ~{context_tokens} context "
+            f"+ ~{input_tokens} input tokens"
+        )
+
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": text})
+        return messages
+
+
+class PromptStats:
+    """Estimated prompt tokens per template, split into the reusable prefix and the per-call input."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, key: str, instruction_tokens: int, context_tokens: int, input_tokens: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(key, {'calls': 0, 'prefix_tokens': 0, 'input_tokens': 0})
+            stats['calls'] += 1
+            stats['prefix_tokens'] += instruction_tokens + context_tokens
+            stats['input_tokens'] += input_tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {key: dict(stats) for key, stats in self._stats.items()}
+
+
+prompt_stats = PromptStats()
+
+
+STRATEGY_CONTEXT_CACHE_SIZE = 256
+
+_strategy_contexts: "OrderedDict[Tuple[str, Tuple[Any, ...]], str]" = OrderedDict()
+_strategy_contexts_lock = threading.Lock()
+
+
+def render_strategy_context(strategy) -> str:
+    """The business context block for a strategy, or "" without one.
+
+    Callers pass the strategy into each call, as LLMService is shared.
+    Blocks are memoized by strategy ID and content, so a strategy is
+    rendered once until it is edited, however many calls use it.
+    """
+    if not strategy:
+        return ""
+    fields = (
+        strategy.business_type,
+        tuple(strategy.target_audience),
+        tuple(strategy.key_objectives),
+        strategy.tone_of_voice,
+        tuple(strategy.value_propositions)
+    )
+    key = (str(getattr(strategy, 'id', None) or ''), fields)
+    with _strategy_contexts_lock:
+        rendered = _strategy_contexts.get(key)
+        if rendered is not None:
+            _strategy_contexts.move_to_end(key)
+            return rendered
+
+    business_type, target_audience, key_objectives, tone_of_voice, value_propositions = fields
+    rendered = f"""Business Context:
+- Type: {business_type}
+- Target Audience: {', '.join(target_audience)}
+- Objectives: {', '.join(key_objectives)}
+- Tone: {tone_of_voice}
+- Value Props: {', '.join(value_propositions)}"""
+    with _strategy_contexts_lock:
+        _strategy_contexts[key] = rendered
+        while len(_strategy_contexts) > STRATEGY_CONTEXT_CACHE_SIZE:
+            _strategy_contexts.popitem(last=False)
+    return rendered
+
+
+SENTIMENT = PromptTemplate(
+    'sentiment', 'v2',
+    instructions="""
+        Analyze the sentiment of the text and provide a JSON response with sentiment (positive/negative/neutral) and confidence score.
+    """,
+    user_input="Text: '{text}'"
+)
+
+SENTIMENT_BATCH = PromptTemplate(
+    'sentiment_batch', 'v2',
+    instructions="""
+        Classify the sentiment of each social media comment below as positive, negative or neutral.
+        Return only a JSON array with one object per comment, using the keys id, sentiment and confidence (0 to 1).
+        Keep the ids exactly as given.
+    """,
+    user_input="""
+        Comments:
+        {comments}
+    """
+)
+
+RESPONSE = PromptTemplate(
+    'response', 'v1',
+    instructions="""
+        Please generate a professional response to a comment on our social media page.
+
+        The response should:
+        - Align with our business strategy and objectives
+        - Be conversational and personable
+        - Address the specific points in the comment
+        - Be around 2-3 sentences
+        - Match our defined tone of voice
+        - Include appropriate emojis if relevant
+    """,
+    user_input="""
+        Context: {page_context}
+
+        Comment: '{comment}'
+    """
+)
+
+CONTENT_SUGGESTION = PromptTemplate(
+    'content_suggestion', 'v1',
+    instructions="""
+        Generate a creative, engaging social media post about the given topic.
+        The post should be around 100-150 words and include hashtags. Make it sound natural and conversational.
+    """,
+    user_input="Topic: {topic}"
+)
+
+# The instructions arrive with the prompt, built by FacebookService from profile settings
+POST_SUGGESTIONS = PromptTemplate(
+    'post_suggestions', 'v1',
+    instructions="",
+    user_input="{prompt}"
+)
+
+ACTIVITY_SUMMARY = PromptTemplate(
+    'activity_summary', 'v1',
+    instructions="""
+        Provide a very concise summary (max 2-3 sentences) of the following social media activities.
+        Focus on key engagement patterns and notable changes. Be brief but insightful.
+    """,
+    user_input="{activities}"
+)
+
+AUDIENCE_FEEDBACK = PromptTemplate(
+    'audience_feedback', 'v1',
+    instructions="""
+        Analyze these social media comments and identify:
+        1. The 2-3 main topics being discussed
+        2. Overall sentiment towards each topic
+        3. A very brief summary (maximum 2 sentences)
+
+        Return in simple JSON format with keys: summary, topics (array of objects with name and sentiment)
+    """,
+    user_input="""
+        Comments:
+        {comments}
+    """
+)
+
+QUICK_REPLIES = PromptTemplate(
+    'quick_replies', 'v1',
+    instructions="""
+        Generate 3 quick, professional, and friendly replies to the comment.
+        Each reply should:
+        - Be concise (1-2 sentences)
+        - Match our tone of voice
+        - Be relevant to the comment context
+        - Include emojis where appropriate
+    """,
+    user_input="Comment: '{comment}'"
+)
@@ -0,0 +1,71 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator
+
+from bson import ObjectId
+from mongoengine.queryset.visitor import Q
+
+from ..models import ScheduledPost, Strategy, Comment, DashboardSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+def _hot_queries() -> Dict[str, Callable[[], Any]]:
+    """The queries served on every page view or worker poll, in their real shapes."""
+    now = datetime.utcnow()
+    user_id = ObjectId()  # Any user; only the plan matters
+    return {
+        'scheduled_posts: worker poll': lambda: ScheduledPost.objects(
+            publish_status='pending', scheduled_time__lte=now
+        ).order_by('scheduled_time'),
+        'scheduled_posts: expired claims': lambda: ScheduledPost.objects(
+            publish_status='publishing', claimed_at__lt=now
+        ),
+        'scheduled_posts: schedule page': lambda: ScheduledPost.objects(user=user_id).order_by('scheduled_time'),
+        'strategies: user active strategy': lambda: Strategy.objects(user=user_id, is_active=True),
+        'strategies: page active strategy': lambda: Strategy.objects(is_active=True),
+        'comments: monitor': lambda: Comment.objects.order_by('-created_time'),
+        'comments: negative': lambda: Comment.objects(sentiment='negative').order_by('-created_time'),
+        'comments: recent for posts': lambda: Comment.objects(post_id__in=['']).order_by('-created_time'),
+        'dashboard_snapshots: refresh sweep': lambda: DashboardSnapshot.objects(
+            Q(is_stale=True) | Q(refreshed_at=None) | Q(refreshed_at__lt=now - timedelta(minutes=5))
+        ),
+    }
+
+
+def _stages(plan: Any) -> Iterator[str]:
+    # Plans nest stages under inputStage(s), and newer servers under queryPlan
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _stages(value)
+
+
+def check_query_plans() -> Dict[str, str]:
+    """Explain each hot query and warn about any that would scan a whole collection.
+
+    Returns each query's verdict: ``ok``, ``COLLSCAN`` or ``error``.
+    """
+    results = {}
+    for name, build in _hot_queries().items():
+        try:
+            explain = build().limit(1).explain()
+            stages = set(_stages(explain.get('queryPlanner', {}).get('winningPlan', {})))
+        except Exception as e:
+            logger.warning(f"Could not explain hot query '{name}': {str(e)}")
+            results[name] = 'error'
+            continue
+
+        if 'COLLSCAN' in stages:
+            logger.warning(f"Hot query '{name}' runs a collection scan; check its indexes")
+            results[name] = 'COLLSCAN'
+        else:
+            results[name] = 'ok'
+
+    scans = sum(1 for verdict in results.values() if verdict == 'COLLSCAN')
+    logger.info(f"Checked {len(results)} hot query plans, {scans} collection scans")
+    return results
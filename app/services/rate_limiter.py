@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0  # A user is waiting on this reply
+PRIORITY_DASHBOARD = 1  # Summaries, suggestions and quick replies behind a page or snapshot
+PRIORITY_BATCH = 2  # Sentiment classification for ingestion and monitoring
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_DASHBOARD: 'dashboard',
+    PRIORITY_BATCH: 'batch'
+}
+
+# Async waiters are not woken by the condition, so they re-check at least this often
+ASYNC_POLL_INTERVAL = 0.05
+
+# Monotonic time by which the current call's result stops being useful, e.g. a
+# dispatch deadline; waits for capacity give up then rather than at the timeout
+call_deadline: ContextVar[Optional[float]] = ContextVar('llm_call_deadline', default=None)
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a call waited longer than the limiter's timeout for capacity."""
+
+
+class TokenBucket:
+    """A bucket refilled continuously at ``per_minute`` units a minute, holding at most a minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available; 0 if it already is."""
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate) if self.rate else float('inf')
+
+    def take(self, amount: float) -> None:
+        # May go negative when a call used more than it reserved; later calls then wait it off
+        self.level -= min(amount, self.capacity)
+
+    def give(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class LLMRateLimiter:
+    """Process-wide request and token budgets for LLM calls, with priority queuing.
+
+    Every call reserves one request and its estimated tokens (prompt plus
+    expected completion) before it is sent. Callers wait in a single queue
+    ordered by priority, then arrival, so interactive replies overtake
+    queued dashboard and batch work. Waiting longer than ``timeout`` raises
+    ``RateLimitTimeout``, which callers treat like any other failed call;
+    so does outliving ``call_deadline``, when the caller set one.
+    Threads and coroutines (from any event loop) share the same queue.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, timeout: float):
+        self.timeout = timeout
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._condition = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []  # Heap of (priority, arrival)
+        self._arrivals = itertools.count()
+        self._stats = {
+            name: {'acquired': 0, 'timeouts': 0, 'wait_ms_total': 0.0, 'wait_ms_max': 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_DASHBOARD) -> float:
+        """Block until the call may be sent; returns the time waited in seconds."""
+        started = time.monotonic()
+        timeout = self._timeout(started)
+        with self._condition:
+            ticket = self._enqueue(priority)
+            while True:
+                delay = self._try_take(ticket, tokens)
+                if delay is None:
+                    break
+                remaining = started + timeout - time.monotonic()
+                if remaining <= 0:
+                    self._abandon(ticket)
+                    raise RateLimitTimeout(f"No LLM capacity after {max(timeout, 0.0):.1f}s")
+                self._condition.wait(min(delay, remaining))
+            return self._record(priority, started)
+
+    async def acquire_async(self, tokens: int, priority: int = PRIORITY_DASHBOARD) -> float:
+        """Async variant of ``acquire``; waits without blocking the event loop."""
+        started = time.monotonic()
+        timeout = self._timeout(started)
+        with self._condition:
+            ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._condition:
+                    delay = self._try_take(ticket, tokens)
+                    if delay is None:
+                        return self._record(priority, started)
+                    remaining = started + timeout - time.monotonic()
+                    if remaining <= 0:
+                        self._abandon(ticket)
+                        raise RateLimitTimeout(f"No LLM capacity after {max(timeout, 0.0):.1f}s")
+                await asyncio.sleep(min(delay, remaining, ASYNC_POLL_INTERVAL))
+        except asyncio.CancelledError:
+            # e.g. a dispatch deadline passed; a ticket left behind would block the queue
+            with self._condition:
+                self._abandon(ticket, timed_out=False)
+            raise
+
+    def settle(self, reserved: int, used: Optional[int]) -> None:
+        """Correct a reservation once the provider reports the tokens a call actually used."""
+        if used is None:
+            return
+        with self._condition:
+            self._tokens.refill(time.monotonic())
+            if used < reserved:
+                self._tokens.give(reserved - used)
+                self._condition.notify_all()
+            else:
+                self._tokens.take(used - reserved)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            queued = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiting:
+                queued[PRIORITY_NAMES[priority]] += 1
+            by_priority = {}
+            for name, stats in self._stats.items():
+                acquired = stats['acquired']
+                by_priority[name] = {
+                    'queued': queued[name],
+                    'acquired': acquired,
+                    'timeouts': stats['timeouts'],
+                    'avg_wait_ms': round(stats['wait_ms_total'] / acquired, 1) if acquired else 0.0,
+                    'max_wait_ms': round(stats['wait_ms_max'], 1)
+                }
+            return {
+                'queue_depth': len(self._waiting),
+                'requests_available': int(self._requests.level),
+                'tokens_available': int(self._tokens.level),
+                'by_priority': by_priority
+            }
+
+    def _timeout(self, now: float) -> float:
+        """How long a call arriving ``now`` may wait: the timeout, capped by its ``call_deadline``."""
+        expires_at = call_deadline.get()
+        return self.timeout if expires_at is None else min(self.timeout, expires_at - now)
+
+    # The helpers below expect self._condition to be held
+
+    def _enqueue(self, priority: int) -> Tuple[int, int]:
+        ticket = (priority, next(self._arrivals))
+        heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _try_take(self, ticket: Tuple[int, int], tokens: int) -> Optional[float]:
+        """Take capacity for ``ticket`` if it is first in line; else return how long to wait."""
+        if self._waiting[0] != ticket:
+            return ASYNC_POLL_INTERVAL  # Woken by notify_all when the head moves on
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        delay = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+        if delay > 0:
+            return delay
+        self._requests.take(1)
+        self._tokens.take(tokens)
+        heapq.heappop(self._waiting)
+        self._condition.notify_all()
+        return None
+
+    def _abandon(self, ticket: Tuple[int, int], timed_out: bool = True) -> None:
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        if timed_out:
+            self._stats[PRIORITY_NAMES[ticket[0]]]['timeouts'] += 1
+        self._condition.notify_all()
+
+    def _record(self, priority: int, started: float) -> float:
+        waited = time.monotonic() - started
+        stats = self._stats[PRIORITY_NAMES[priority]]
+        stats['acquired'] += 1
+        stats['wait_ms_total'] += waited * 1000
+        stats['wait_ms_max'] = max(stats['wait_ms_max'], waited * 1000)
+        return waited
@@ -0,0 +1,77 @@
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """App-scoped services, built on first use and shared by every blueprint.
+
+    ``create_app`` attaches one registry to ``app.extensions['services']``.
+    Blueprints reach it through ``service_proxy`` so nothing (and in
+    particular no Groq client) is constructed at import time, and every
+    blueprint talks to the same Graph session, LLM clients and caches.
+    """
+
+    def __init__(self):
+        self._services: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        service = self._services.get(name)
+        if service is None:
+            with self._lock:
+                service = self._services.get(name)
+                if service is None:
+                    service = factory()
+                    self._services[name] = service
+                    logger.debug(f"Constructed {type(service).__name__}")
+        return service
+
+    @property
+    def facebook(self):
+        from .facebook_service import FacebookService
+        return self._get('facebook', FacebookService)
+
+    @property
+    def llm(self):
+        from .llm_service import LLMService
+        return self._get('llm', LLMService)
+
+    @property
+    def llm_dispatcher(self):
+        from .llm_dispatcher import LLMDispatcher
+        return self._get('llm_dispatcher', LLMDispatcher)
+
+    @property
+    def dashboard(self):
+        from .dashboard_service import DashboardService
+        return self._get('dashboard', lambda: DashboardService(self.facebook, self.llm, self.llm_dispatcher))
+
+    @property
+    def snapshots(self):
+        from .snapshot_service import DashboardSnapshotService
+        return self._get('snapshots', lambda: DashboardSnapshotService(self.dashboard))
+
+    @property
+    def comment_store(self):
+        from .comment_ingestion_service import CommentIngestionService
+        return self._get('comment_store', lambda: CommentIngestionService(self.facebook, self.llm))
+
+    @property
+    def scheduling(self):
+        from .scheduling_service import SchedulingService
+        return self._get('scheduling', lambda: SchedulingService(self.facebook))
+
+
+def get_services() -> ServiceRegistry:
+    return current_app.extensions['services']
+
+
+def service_proxy(name: str) -> LocalProxy:
+    """A module-level stand-in for the current app's ``name`` service."""
+    return LocalProxy(lambda: getattr(get_services(), name))
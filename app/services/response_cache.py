@@ -0,0 +1,214 @@
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+_NON_WORD = re.compile(r'[^\w\s]+')
+_WHITESPACE = re.compile(r'\s+')
+
+SHINGLE_SIZE = 3
+MAX_SHINGLED_CHARS = 300  # Long comments are rarely repeated; bound the hashing cost
+_EMPTY = -1  # A signature slot no shingle hashed into
+
+
+class _Entry(NamedTuple):
+    expires_at: float
+    scope: str
+    length: int  # Of the normalized comment
+    signature: Tuple[int, ...]
+    payload: str
+
+
+class ResponseCache:
+    """Generated replies keyed by normalized comment text, with near-duplicate lookup.
+
+    Every entry belongs to a scope: the prompt template, model, strategy
+    and any other context the reply depends on, so a strategy change never
+    serves a reply written for another one. Within a scope, a comment that
+    normalizes (case, punctuation, whitespace) to a cached one is an exact
+    hit. In ``similar`` mode a miss then checks for a near-duplicate: each
+    comment gets a one-permutation MinHash signature of its character
+    3-grams (each 3-gram is hashed once, keeping lookups well under a
+    millisecond), indexed with LSH bands, and the closest candidate whose
+    estimated Jaccard similarity reaches ``threshold`` is served, provided
+    the two comments' lengths differ by at most ``length_tolerance``. Entries
+    expire after ``ttl`` seconds and the least recently used are evicted
+    beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, mode: str = 'exact', threshold: float = 0.9,
+                 length_tolerance: float = 0.1, slots: int = 32, bands: int = 8):
+        if slots % bands:
+            raise ValueError("slots must be a multiple of bands")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.mode = mode
+        self.threshold = threshold
+        self.length_tolerance = length_tolerance
+        self._slots = slots
+        self._rows = slots // bands
+        self._bands = bands
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in ('exact', 'similar')
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        text = _NON_WORD.sub(' ', (text or '').lower())
+        return _WHITESPACE.sub(' ', text).strip()
+
+    def get(self, scope: str, text: str) -> Optional[Any]:
+        """Return the reply cached for ``text`` (or a near-duplicate of it) in ``scope``."""
+        if not self.enabled:
+            return None
+        normalized = self.normalize(text)
+        if not normalized:
+            return None
+
+        started = time.perf_counter()
+        key = self._key(scope, normalized)
+        with self._lock:
+            entry = self._live(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                self._lookup_seconds += time.perf_counter() - started
+                return json.loads(entry.payload)
+
+        payload = None
+        if self.mode == 'similar':
+            signature = self._signature(normalized)
+            with self._lock:
+                match = self._nearest(scope, len(normalized), signature)
+                if match is not None:
+                    self._entries.move_to_end(match)
+                    self.similar_hits += 1
+                    payload = self._entries[match].payload
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            self._lookup_seconds += time.perf_counter() - started
+        return json.loads(payload) if payload is not None else None
+
+    def set(self, scope: str, text: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        normalized = self.normalize(text)
+        if not normalized:
+            return
+
+        key = self._key(scope, normalized)
+        signature = self._signature(normalized) if self.mode == 'similar' else ()
+        entry = _Entry(time.monotonic() + self.ttl, scope, len(normalized), signature, json.dumps(value))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            for band in self._band_keys(scope, signature):
+                self._buckets.setdefault(band, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.similar_hits
+            lookups = hits + self.misses
+            return {
+                'mode': self.mode,
+                'entries': len(self._entries),
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                'avg_lookup_us': round(self._lookup_seconds / lookups * 1e6, 1) if lookups else 0.0
+            }
+
+    # The helpers below that touch entries or buckets expect self._lock to be held
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return hashlib.sha256(f"{scope}\x00{normalized}".encode('utf-8')).hexdigest()
+
+    def _live(self, key: str) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        return entry
+
+    def _nearest(self, scope: str, length: int, signature: Tuple[int, ...]) -> Optional[str]:
+        candidates: Set[str] = set()
+        for band in self._band_keys(scope, signature):
+            candidates |= self._buckets.get(band, set())
+
+        best, best_similarity = None, self.threshold
+        for key in candidates:
+            entry = self._live(key)
+            if entry is None or abs(entry.length - length) > self.length_tolerance * max(entry.length, length):
+                continue
+            similarity = self._similarity(signature, entry.signature)
+            if similarity >= best_similarity:
+                best, best_similarity = key, similarity
+        return best
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for band in self._band_keys(entry.scope, entry.signature):
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def _band_keys(self, scope: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        if not signature:
+            return []
+        rows = self._rows
+        bands = [(scope, band, signature[band * rows:(band + 1) * rows]) for band in range(self._bands)]
+        # Bands with no shingles in them would make every short comment a candidate
+        return [band for band in bands if any(value != _EMPTY for value in band[2])]
+
+    def _signature(self, normalized: str) -> Tuple[int, ...]:
+        text = normalized[:MAX_SHINGLED_CHARS]
+        if len(text) <= SHINGLE_SIZE:
+            shingles = {text}
+        else:
+            shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+        signature = [_EMPTY] * self._slots
+        for shingle in shingles:
+            # The low bits of the hash pick a slot; the rest compete for that slot's minimum
+            rank, slot = divmod(zlib.crc32(shingle.encode('utf-8')), self._slots)
+            current = signature[slot]
+            if current == _EMPTY or rank < current:
+                signature[slot] = rank
+        return tuple(signature)
+
+    @staticmethod
+    def _similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity, over the slots either comment filled."""
+        filled = matched = 0
+        for x, y in zip(a, b):
+            if x != _EMPTY or y != _EMPTY:
+                filled += 1
+                matched += x == y
+        return matched / filled if filled else 0.0
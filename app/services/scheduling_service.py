@@ -1,47 +1,188 @@
-from ..models import ScheduledPost, User
+from ..models import ScheduledPost, User, DashboardSnapshot
+from ..config import get_settings
 from .facebook_service import FacebookService
-from typing import List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import UpdateOne
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import logging
+import os
+import socket
+import time
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 class SchedulingService:
-    def __init__(self):
-        self.fb_service = FacebookService()
+    def __init__(self, fb_service: Optional[FacebookService] = None):
+        self.fb_service = fb_service or FacebookService()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
 
     def schedule_post(self, user: User, content: str, scheduled_time: datetime) -> ScheduledPost:
         scheduled_post = ScheduledPost(
             user=user,
-            content=content,
+            message=content,
             scheduled_time=scheduled_time,
-            status='pending'
+            publish_status='pending'
         ).save()
         return scheduled_post
 
     def get_pending_posts(self) -> List[ScheduledPost]:
         return ScheduledPost.objects(
-            status='pending',
+            publish_status='pending',
             scheduled_time__lte=datetime.utcnow()
         )
 
-    def process_scheduled_posts(self) -> None:
-        pending_posts = self.get_pending_posts()
-        for post in pending_posts:
-            try:
-                # Attempt to publish the post
-                response = self.fb_service.create_post(post.content)
-                if response.get('id'):
-                    post.status = 'published'
-                else:
-                    post.status = 'failed'
-            except Exception as e:
-                post.status = 'failed'
-            finally:
-                post.save()
+    def process_scheduled_posts(self, batch_size: Optional[int] = None,
+                                concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Claim due posts and publish them; returns counts and latencies for the run.
+
+        Each post is claimed with a single findAndModify that flips it from
+        ``pending`` to ``publishing``, so any number of workers can poll the
+        same collection without publishing a post twice.
+        """
+        batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+        concurrency = concurrency or settings.SCHEDULER_CONCURRENCY
+        expired = self._fail_expired_claims()
+
+        claimed = []
+        while len(claimed) < batch_size:
+            post = self._claim_next()
+            if post is None:
+                break
+            claimed.append(post)
+
+        outcomes = []
+        write_ms = 0.0
+        if claimed:
+            workers = min(concurrency, len(claimed))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='publish') as executor:
+                outcomes = list(executor.map(self._publish, claimed))
+            write_ms = self._write_outcomes(outcomes)
+
+        published = [outcome for outcome in outcomes if outcome['published']]
+        if published:
+            DashboardSnapshot.objects(user__in=list({outcome['user'] for outcome in published})).update(
+                set__is_stale=True
+            )
+
+        latencies = sorted(outcome['latency_ms'] for outcome in outcomes)
+        stats = {
+            'claimed': len(claimed),
+            'published': len(published),
+            'failed': len(outcomes) - len(published),
+            'expired_claims': expired,
+            'latency_p50_ms': round(latencies[len(latencies) // 2], 1) if latencies else 0.0,
+            'latency_max_ms': round(latencies[-1], 1) if latencies else 0.0,
+            'max_delay_seconds': max((outcome['delay_seconds'] for outcome in outcomes), default=0.0),
+            'write_ms': round(write_ms, 1)
+        }
+        if claimed or expired:
+            logger.info(
+                f"Worker {self.worker_id} published {stats['published']}/{stats['claimed']} scheduled posts "
+                f"(p50 {stats['latency_p50_ms']}ms, max {stats['latency_max_ms']}ms, "
+                f"max delay {stats['max_delay_seconds']:.1f}s, status write {stats['write_ms']}ms)"
+            )
+        return stats
+
+    def _claim_next(self) -> Optional[ScheduledPost]:
+        now = datetime.utcnow()
+        return ScheduledPost.objects(
+            publish_status='pending',
+            scheduled_time__lte=now
+        ).order_by('scheduled_time').modify(
+            new=True,
+            set__publish_status='publishing',
+            set__claimed_by=self.worker_id,
+            set__claimed_at=now,
+            inc__attempts=1
+        )
+
+    def _publish(self, post: ScheduledPost) -> Dict[str, Any]:
+        started = time.perf_counter()
+        fb_post_id = None
+        error_message = None
+        try:
+            response = self.fb_service.create_post(post.message)
+            fb_post_id = response.get('id')
+            if not fb_post_id:
+                error_message = str(response.get('error', 'No post ID returned'))
+        except Exception as e:
+            error_message = str(e)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        published_at = datetime.utcnow()
+        if fb_post_id:
+            update = {
+                '$set': {
+                    'publish_status': 'published',
+                    'is_published': True,
+                    'fb_post_id': fb_post_id,
+                    'published_at': published_at,
+                    'publish_latency_ms': latency_ms
+                },
+                '$unset': {'error_message': ''}
+            }
+        else:
+            logger.error(f"Error publishing scheduled post {post.id}: {error_message}")
+            update = {
+                '$set': {
+                    'publish_status': 'failed',
+                    'error_message': error_message,
+                    'publish_latency_ms': latency_ms
+                }
+            }
+
+        return {
+            'id': post.id,
+            'user': post.to_mongo().get('user'),  # Raw ID, without dereferencing the user
+            'published': bool(fb_post_id),
+            'latency_ms': latency_ms,
+            'delay_seconds': (published_at - post.scheduled_time).total_seconds(),
+            'update': update
+        }
+
+    def _write_outcomes(self, outcomes: List[Dict[str, Any]]) -> float:
+        """Apply every post's status transition in one unordered bulk write.
+
+        Returns the write latency in milliseconds. Posts this worker no longer
+        holds the claim on (e.g. failed by the expired-claim sweep) are left untouched.
+        """
+        operations = [
+            UpdateOne(
+                {'_id': outcome['id'], 'claimed_by': self.worker_id, 'publish_status': 'publishing'},
+                outcome['update']
+            )
+            for outcome in outcomes
+        ]
+        started = time.perf_counter()
+        try:
+            result = ScheduledPost._get_collection().bulk_write(operations, ordered=False)
+            if result.matched_count < len(operations):
+                logger.warning(f"{len(operations) - result.matched_count} scheduled posts were no longer claimed by {self.worker_id}")
+        except Exception as e:
+            # Unwritten posts stay "publishing" until their claim expires
+            logger.error(f"Error writing scheduled post statuses: {str(e)}")
+        write_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Wrote {len(operations)} scheduled post statuses in {write_ms:.1f}ms")
+        return write_ms
+
+    def _fail_expired_claims(self) -> int:
+        # A worker that died mid-publish may or may not have created the post,
+        # so expired claims are failed for review rather than retried. The claim
+        # is released too, so a late write from the original worker cannot match.
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.SCHEDULER_CLAIM_TIMEOUT)
+        return ScheduledPost.objects(publish_status='publishing', claimed_at__lt=cutoff).update(
+            set__publish_status='failed',
+            set__error_message='Publishing was not confirmed before the claim expired',
+            unset__claimed_by=True
+        )
 
     def get_user_scheduled_posts(self, user: User) -> List[ScheduledPost]:
         return ScheduledPost.objects(user=user).order_by('scheduled_time')
 
     def cancel_scheduled_post(self, post_id: str, user: User) -> Optional[ScheduledPost]:
-        post = ScheduledPost.objects(id=post_id, user=user, status='pending').first()
+        post = ScheduledPost.objects(id=post_id, user=user, publish_status='pending').first()
         if post:
             post.delete()
             return post
@@ -0,0 +1,90 @@
+import hashlib
+import logging
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+from ..models import SentimentResult
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class SentimentCache:
+    """Content-addressed store of sentiment results.
+
+    Entries are keyed on a hash of the normalized comment text, the model name
+    and the prompt version, so a comment is classified once for its lifetime
+    and a model or prompt change naturally starts a fresh cache. An in-memory
+    LRU sits in front of an optional MongoDB collection.
+    """
+
+    def __init__(self, model_name: str, prompt_version: str, max_entries: int, persist: bool = True):
+        self.model_name = model_name
+        self.prompt_version = prompt_version
+        self.persist = persist
+        self.memory = TTLCache(max_entries=max_entries, max_bytes=max_entries * 512, default_ttl=None)
+        self._lock = threading.Lock()
+        self.store_hits = 0
+        self.store_errors = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return _WHITESPACE.sub(' ', text or '').strip().lower()
+
+    def key_for(self, text: str) -> str:
+        material = f"{self.prompt_version}\x00{self.model_name}\x00{self.normalize(text)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        key = self.key_for(text)
+        result = self.memory.get(key)
+        if result is not None or not self.persist:
+            return result
+
+        try:
+            stored = SentimentResult.objects(key=key).first()
+        except Exception as e:
+            self._store_error(f"Error reading sentiment cache: {str(e)}")
+            return None
+        if stored is None:
+            return None
+
+        result = {"sentiment": stored.sentiment, "confidence": stored.confidence}
+        self.memory.set(key, result)
+        with self._lock:
+            self.store_hits += 1
+        return result
+
+    def set(self, text: str, result: Dict[str, Any]) -> None:
+        key = self.key_for(text)
+        self.memory.set(key, result)
+        if not self.persist:
+            return
+
+        try:
+            SentimentResult.objects(key=key).update_one(
+                upsert=True,
+                set__sentiment=result['sentiment'],
+                set__confidence=result.get('confidence', 0.0),
+                set__model_name=self.model_name,
+                set__prompt_version=self.prompt_version
+            )
+        except Exception as e:
+            self._store_error(f"Error writing sentiment cache: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        # A memory miss that the store answered is still a cache hit overall
+        lookups = stats['hits'] + stats['misses']
+        stats['store_hits'] = self.store_hits
+        stats['store_errors'] = self.store_errors
+        stats['overall_hit_rate'] = round((stats['hits'] + self.store_hits) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def _store_error(self, message: str) -> None:
+        with self._lock:
+            self.store_errors += 1
+        logger.warning(message)
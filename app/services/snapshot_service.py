@@ -0,0 +1,101 @@
+from .dashboard_service import DashboardService
+from ..models import DashboardSnapshot, Strategy, User
+from ..config import get_settings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from mongoengine.queryset.visitor import Q
+from typing import Any, Dict, Optional
+import logging
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class DashboardSnapshotService:
+    """Materialized per-user dashboards with stale-while-revalidate reads.
+
+    The dashboard view renders a stored snapshot; snapshots older than
+    ``DASHBOARD_SNAPSHOT_TTL`` or flagged stale are still served while a
+    background thread (or the ``refresh-dashboards`` worker) rebuilds them.
+    A refresh is claimed atomically so only one process rebuilds a snapshot.
+    """
+
+    def __init__(self, dashboard_service: Optional[DashboardService] = None):
+        self.dashboard_service = dashboard_service or DashboardService()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='snapshot-refresh')
+
+    def get_snapshot(self, user) -> Optional[DashboardSnapshot]:
+        """Return the user's snapshot, scheduling a refresh if it is stale."""
+        snapshot = DashboardSnapshot.objects(user=user).first()
+        if snapshot and snapshot.refreshed_at and self._needs_refresh(snapshot):
+            self.refresh_in_background(user)
+        return snapshot
+
+    def refresh_in_background(self, user) -> None:
+        self._executor.submit(self._refresh_by_id, user.id)
+
+    def refresh(self, user) -> Optional[DashboardSnapshot]:
+        """Rebuild a user's snapshot unless another process is already doing it."""
+        if not self._claim(user):
+            return None
+        try:
+            return self.save(user, self.build(user))
+        except Exception as e:
+            logger.error(f"Error refreshing dashboard snapshot for {user.id}: {str(e)}")
+            DashboardSnapshot.objects(user=user).update_one(
+                set__refresh_error=str(e), unset__refresh_started_at=True
+            )
+            return None
+
+    def refresh_due(self) -> int:
+        """Refresh every stale or expired snapshot; returns how many were rebuilt."""
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.DASHBOARD_SNAPSHOT_TTL)
+        due = DashboardSnapshot.objects(
+            Q(is_stale=True) | Q(refreshed_at=None) | Q(refreshed_at__lt=cutoff)
+        ).only('user')
+
+        refreshed = 0
+        for snapshot in due:
+            if self.refresh(snapshot.user):
+                refreshed += 1
+        return refreshed
+
+    def build(self, user) -> Dict[str, Any]:
+        active_strategy = Strategy.objects(user=user.id, is_active=True).first()
+        return self.dashboard_service.get_dashboard_data(strategy=active_strategy)
+
+    async def build_async(self, user) -> Dict[str, Any]:
+        active_strategy = Strategy.objects(user=user.id, is_active=True).first()
+        return await self.dashboard_service.get_dashboard_data_async(strategy=active_strategy)
+
+    def save(self, user, data: Dict[str, Any]) -> DashboardSnapshot:
+        return DashboardSnapshot.objects(user=user).modify(
+            upsert=True,
+            new=True,
+            set__data=data,
+            set__refreshed_at=datetime.utcnow(),
+            set__is_stale=False,
+            unset__refresh_started_at=True,
+            unset__refresh_error=True
+        )
+
+    def _claim(self, user) -> bool:
+        now = datetime.utcnow()
+        lock_cutoff = now - timedelta(seconds=settings.DASHBOARD_REFRESH_LOCK_TIMEOUT)
+        # Make sure the document exists so the conditional claim below can match it
+        DashboardSnapshot.objects(user=user).update_one(upsert=True, set_on_insert__is_stale=True)
+        claimed = DashboardSnapshot.objects(
+            Q(user=user) & (Q(refresh_started_at=None) | Q(refresh_started_at__lt=lock_cutoff))
+        ).modify(set__refresh_started_at=now)
+        return claimed is not None
+
+    def _refresh_by_id(self, user_id) -> None:
+        try:
+            user = User.objects(id=user_id).first()
+            if user:
+                self.refresh(user)
+        except Exception as e:
+            logger.error(f"Background dashboard refresh failed for {user_id}: {str(e)}")
+
+    @staticmethod
+    def _needs_refresh(snapshot: DashboardSnapshot) -> bool:
+        return snapshot.is_stale or snapshot.age_seconds > settings.DASHBOARD_SNAPSHOT_TTL
@@ -0,0 +1,49 @@
+import logging
+from typing import Optional
+
+from bson import ObjectId
+from mongoengine import signals
+
+from .cache import TTLCache
+from ..config import get_settings
+from ..models import User
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# All Flask-Login and the templates read from the session user
+AUTH_FIELDS = ('email', 'name', 'is_active')
+
+# Per process; other processes see a change once their entry expires
+session_user_cache = TTLCache(
+    max_entries=settings.USER_CACHE_SIZE,
+    max_bytes=settings.USER_CACHE_SIZE * 512,
+    default_ttl=settings.USER_CACHE_TTL
+)
+
+
+def load_session_user(user_id: str) -> Optional[User]:
+    """Return the user for a session, loading only the auth fields on a cache miss.
+
+    Every call builds a fresh ``User`` from the cached fields, so requests
+    never share a document instance. The user is only partially loaded:
+    fetch the full document before editing or saving it.
+    """
+    fields = session_user_cache.get(user_id)
+    if fields is None:
+        user = User.objects(id=user_id).only(*AUTH_FIELDS).first()
+        if user is None:
+            return None
+        fields = {name: getattr(user, name) for name in AUTH_FIELDS}
+        session_user_cache.set(user_id, fields)
+
+    return User._from_son({'_id': ObjectId(user_id), **fields})
+
+
+def invalidate_session_user(sender, document, **kwargs) -> None:
+    session_user_cache.delete(str(document.pk))
+
+
+# Queryset .update() calls bypass these; such changes show up after USER_CACHE_TTL
+signals.post_save.connect(invalidate_session_user, sender=User)
+signals.post_delete.connect(invalidate_session_user, sender=User)
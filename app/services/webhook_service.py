@@ -0,0 +1,244 @@
+import hashlib
+import hmac
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from mongoengine.queryset.visitor import Q
+
+from ..models import AutoReplySettings, DashboardSnapshot, PageProfile
+from ..config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+GRAPH_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S+0000'
+SIGNATURE_PREFIX = 'sha256='
+
+
+def verify_signature(payload: bytes, signature_header: Optional[str], app_secret: str) -> bool:
+    """Check an ``X-Hub-Signature-256`` header against the raw request body."""
+    if not app_secret or not signature_header or not signature_header.startswith(SIGNATURE_PREFIX):
+        return False
+    expected = hmac.new(app_secret.encode('utf-8'), payload, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len(SIGNATURE_PREFIX):])
+
+
+def sign_payload(payload: bytes, app_secret: str) -> str:
+    """Build the ``X-Hub-Signature-256`` header Facebook would send for ``payload``."""
+    return SIGNATURE_PREFIX + hmac.new(app_secret.encode('utf-8'), payload, hashlib.sha256).hexdigest()
+
+
+def extract_comment_events(payload: Dict[str, Any], page_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Turn a Page ``feed`` webhook payload into new comments in Graph shape.
+
+    Only newly added comments are kept. Comments written by the page itself
+    are skipped so auto-replies never trigger further replies.
+    """
+    if payload.get('object') != 'page':
+        return []
+
+    comments = []
+    for entry in payload.get('entry', []):
+        entry_page_id = entry.get('id') or page_id
+        for change in entry.get('changes', []):
+            value = change.get('value') or {}
+            if change.get('field') != 'feed' or value.get('item') != 'comment' or value.get('verb') != 'add':
+                continue
+
+            author = value.get('from') or {}
+            if page_id and author.get('id') == page_id:
+                continue
+
+            created_time = value.get('created_time')
+            if isinstance(created_time, (int, float)):
+                created_time = datetime.utcfromtimestamp(created_time).strftime(GRAPH_TIME_FORMAT)
+
+            comments.append({
+                'id': value.get('comment_id'),
+                'message': value.get('message', ''),
+                'from': {'name': author.get('name', 'Unknown'), 'id': author.get('id')},
+                'created_time': created_time,
+                'post_id': value.get('post_id'),
+                'parent_id': value.get('parent_id'),
+                'page_id': entry_page_id
+            })
+    return [comment for comment in comments if comment['id']]
+
+
+class CommentEventQueue:
+    """Bounded in-process queue of webhook comment events.
+
+    The webhook view only enqueues and returns. A small pool of daemon threads
+    drains the queue in batches of up to ``batch_size``: each batch is
+    classified in one sentiment call, then every comment goes through
+    ``FacebookService.process_new_comment`` (auto-reply) and into the comment
+    store. When the queue is full new events are dropped; the periodic ingest
+    picks those comments up later.
+    """
+
+    def __init__(self, workers: int, max_size: int, batch_size: int):
+        self.workers = workers
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.services = None  # The app's ServiceRegistry, bound by the first submit
+        self.received = 0
+        self.dropped = 0
+        self.processed = 0
+        self.failed = 0
+
+    def submit(self, events: List[Dict[str, Any]], services=None) -> int:
+        """Enqueue events without blocking; returns how many were accepted."""
+        if self.services is None:
+            self.services = services
+        self._ensure_workers()
+        accepted = 0
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+                accepted += 1
+            except queue.Full:
+                break
+
+        with self._lock:
+            self.received += len(events)
+            self.dropped += len(events) - accepted
+        if accepted < len(events):
+            logger.warning(f"Webhook queue full, dropped {len(events) - accepted} comment events")
+        return accepted
+
+    def join(self) -> None:
+        """Block until every queued event has been processed."""
+        self._queue.join()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'received': self.received,
+                'dropped': self.dropped,
+                'processed': self.processed,
+                'failed': self.failed,
+                'workers': len(self._threads)
+            }
+
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'webhook-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                logger.error(f"Error processing webhook batch: {str(e)}")
+                with self._lock:
+                    self.failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _process_batch(self, comments: List[Dict[str, Any]]) -> None:
+        if self.services is None:
+            # Submitted outside an app; build a registry of our own
+            from .registry import ServiceRegistry
+            self.services = ServiceRegistry()
+        fb_service, llm_service, comment_store = (
+            self.services.facebook, self.services.llm, self.services.comment_store
+        )
+
+        # One batched call classifies everything and warms the sentiment cache
+        # that process_new_comment reads
+        llm_service.analyze_sentiment_batch([comment['message'] for comment in comments if comment['message']])
+
+        # Each page's owners, and the auto-reply settings of the first owner who enabled them
+        owners_by_page = {}
+        auto_reply_by_page = {}
+        for page_id in {comment.get('page_id') or settings.FACEBOOK_PAGE_ID for comment in comments}:
+            owners = get_page_owners(page_id)
+            owners_by_page[page_id] = owners
+            auto_reply_by_page[page_id] = (
+                AutoReplySettings.objects(user__in=owners, enabled=True).order_by('id').first() if owners else None
+            )
+
+        processed = []
+        for comment in comments:
+            if not comment['message']:
+                # Photo and sticker comments: nothing to classify or answer
+                processed.append(dict(comment, sentiment={"sentiment": "neutral", "confidence": 0.0}))
+                continue
+            page_id = comment.get('page_id') or settings.FACEBOOK_PAGE_ID
+            result = fb_service.process_new_comment(comment, llm_service, auto_reply_by_page[page_id])
+            if result is None:
+                with self._lock:
+                    self.failed += 1
+                continue
+            processed.append(dict(comment, sentiment=result['sentiment']))
+
+        if processed:
+            # Webhook events carry no post text; the lookup is batched and cached
+            posts = fb_service.get_posts_by_ids([comment['post_id'] for comment in processed if comment['post_id']])
+            post_messages = {post['id']: post.get('message', '') for post in posts.get('data', [])}
+            for comment in processed:
+                comment['post_message'] = post_messages.get(comment['post_id'], '')
+            comment_store.record_comments(processed)
+            # Only the dashboards of the pages these comments landed on
+            owners = {
+                owner.id: owner
+                for comment in processed
+                for owner in owners_by_page[comment.get('page_id') or settings.FACEBOOK_PAGE_ID]
+            }
+            if owners:
+                DashboardSnapshot.objects(user__in=list(owners.values())).update(set__is_stale=True)
+        with self._lock:
+            self.processed += len(processed)
+
+
+def get_page_owners(page_id: Optional[str]) -> list:
+    """Users whose page profile manages ``page_id``.
+
+    Profiles saved without a page ID belong to the app's configured page
+    (``FACEBOOK_PAGE_ID``).
+    """
+    query = Q(page_id=page_id)
+    if not page_id or page_id == settings.FACEBOOK_PAGE_ID:
+        query = query | Q(page_id=None) | Q(page_id='')
+    return list(PageProfile.objects(query).distinct('user'))
+
+
+_comment_event_queue: Optional[CommentEventQueue] = None
+_comment_event_queue_pid: Optional[int] = None
+_comment_event_queue_lock = threading.Lock()
+
+
+def get_comment_event_queue() -> CommentEventQueue:
+    """Return this process's webhook queue; worker threads do not survive a fork."""
+    global _comment_event_queue, _comment_event_queue_pid
+    if _comment_event_queue is None or _comment_event_queue_pid != os.getpid():
+        with _comment_event_queue_lock:
+            if _comment_event_queue is None or _comment_event_queue_pid != os.getpid():
+                _comment_event_queue = CommentEventQueue(
+                    workers=settings.WEBHOOK_WORKERS,
+                    max_size=settings.WEBHOOK_QUEUE_SIZE,
+                    batch_size=settings.WEBHOOK_BATCH_SIZE
+                )
+                _comment_event_queue_pid = os.getpid()
+    return _comment_event_queue
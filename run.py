@@ -2,12 +2,11 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler
 import click
-from app import create_app
-from app.models import User, PageProfile, Strategy, ScheduledPost, AutoReplySettings
 import colorama
 from colorama import Fore, Style
-from mongoengine import connect, disconnect
-from pymongo import MongoClient
+
+# The app, MongoDB drivers and client libraries are imported inside the
+# commands that need them, so e.g. health-check and --help start fast
 
 # Initialize colorama for Windows support
 colorama.init()
@@ -30,8 +29,12 @@ def setup_logging(app):
     app.logger.addHandler(console_handler)
     app.logger.setLevel(logging.INFO)
     app.logger.info('SmartSocial startup')
+    timings = app.extensions.get('startup_timings')
+    if timings:
+        app.logger.info(f"App created in {timings['create_app_ms']}ms ({timings['since_import_ms']}ms since import)")
 
 def check_mongodb():
+    from pymongo import MongoClient
     try:
         client = MongoClient('mongodb://localhost:27017/')
         client.server_info()
@@ -60,6 +63,8 @@ def cli():
 @click.option('--debug', is_flag=True, help='Enable debug mode')
 def run(debug):
     """Run the SmartSocial application"""
+    from app import create_app
+    from mongoengine import disconnect
     click.echo(f"{Fore.CYAN}Starting SmartSocial...{Style.RESET_ALL}")
     
     # Startup checks
@@ -96,6 +101,9 @@ def run(debug):
 @cli.command()
 def init_db():
     """Initialize the database"""
+    from app import create_app
+    from app.models import User, PageProfile, Strategy, ScheduledPost, AutoReplySettings
+    from mongoengine import disconnect
     click.echo(f"{Fore.CYAN}Initializing database...{Style.RESET_ALL}")
     
     if not check_mongodb():
@@ -126,6 +134,9 @@ def init_db():
 @click.option('--password', prompt=True, hide_input=True, confirmation_prompt=True, help='Admin user password')
 def create_admin(email, password):
     """Create an admin user"""
+    from app import create_app
+    from app.models import User
+    from mongoengine import disconnect
     if not check_mongodb():
         return
         
@@ -152,6 +163,81 @@ def create_admin(email, password):
     finally:
         disconnect()
 
+@cli.command()
+@click.option('--interval', type=int, default=None, help='Seconds between sweeps (defaults to DASHBOARD_REFRESH_INTERVAL)')
+@click.option('--once', is_flag=True, help='Run a single sweep and exit')
+def refresh_dashboards(interval, once):
+    """Refresh stale dashboard snapshots in the background"""
+    import time
+    from app import create_app
+    from app.config import get_settings
+    from mongoengine import disconnect
+    
+    if not check_mongodb():
+        return
+    
+    interval = interval or get_settings().DASHBOARD_REFRESH_INTERVAL
+    click.echo(f"{Fore.CYAN}Refreshing dashboard snapshots every {interval}s...{Style.RESET_ALL}")
+    
+    try:
+        disconnect()
+        app = create_app()
+        setup_logging(app)
+        
+        with app.app_context():
+            snapshot_service = app.extensions['services'].snapshots
+            while True:
+                started = time.perf_counter()
+                refreshed = snapshot_service.refresh_due()
+                app.logger.info(f"Refreshed {refreshed} dashboard snapshots in {time.perf_counter() - started:.2f}s")
+                if once:
+                    break
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo(f"\n{Fore.YELLOW}Dashboard refresh worker stopped{Style.RESET_ALL}")
+    finally:
+        disconnect()
+
+@cli.command()
+@click.option('--interval', type=int, default=None, help='Seconds between polls when nothing is due (defaults to SCHEDULER_POLL_INTERVAL)')
+@click.option('--concurrency', type=int, default=None, help='Posts published in parallel (defaults to SCHEDULER_CONCURRENCY)')
+@click.option('--batch-size', type=int, default=None, help='Posts claimed per poll (defaults to SCHEDULER_BATCH_SIZE)')
+@click.option('--once', is_flag=True, help='Process the posts that are due now and exit')
+def worker(interval, concurrency, batch_size, once):
+    """Publish scheduled posts as they come due (run several for more throughput)"""
+    import time
+    from app import create_app
+    from app.config import get_settings
+    from mongoengine import disconnect
+    
+    if not check_mongodb():
+        return
+    
+    settings = get_settings()
+    interval = interval or settings.SCHEDULER_POLL_INTERVAL
+    batch_size = batch_size or settings.SCHEDULER_BATCH_SIZE
+    
+    try:
+        disconnect()
+        app = create_app()
+        setup_logging(app)
+        
+        with app.app_context():
+            scheduling_service = app.extensions['services'].scheduling
+            click.echo(f"{Fore.CYAN}Publishing worker {scheduling_service.worker_id} polling every {interval}s...{Style.RESET_ALL}")
+            while True:
+                stats = scheduling_service.process_scheduled_posts(batch_size=batch_size, concurrency=concurrency)
+                if stats['claimed'] >= batch_size:
+                    # A full batch means more posts are probably due; poll again right away
+                    continue
+                if once:
+                    break
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo(f"\n{Fore.YELLOW}Publishing worker stopped{Style.RESET_ALL}")
+    finally:
+        disconnect()
+
 @cli.command()
 def health_check():
     """Check system health"""
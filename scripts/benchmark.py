@@ -0,0 +1,338 @@
+"""Benchmark the hot paths against local stand-ins for the Graph API and Groq.
+
+The fake servers from ``fake_apis.py`` start on free ports and the app is
+pointed at them through GRAPH_API_BASE_URL and GROQ_BASE_URL, so runs are
+repeatable and never touch the real APIs. Each scenario reports p50/p95/p99
+latency, outbound calls per iteration (by route) and peak Python memory.
+Results are saved under benchmark_results/ named by time and git revision;
+pass an earlier file to --compare to flag regressions. MongoDB must be
+running locally; the benchmark uses its own database.
+
+    python scripts/benchmark.py run                                   # every scenario
+    python scripts/benchmark.py run -s monitor --posts 50 --graph-latency 120
+    python scripts/benchmark.py run --compare benchmark_results/<baseline>.json
+    python scripts/benchmark.py serve --graph-port 8901 --groq-port 8902
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import click
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_apis import PAGE_ID, FakeGraphAPI, FakeGroqAPI  # noqa: E402
+
+BENCH_DB = 'smartsocial_bench'
+BENCH_USER_EMAIL = 'bench@example.com'
+# Extra run-to-run noise allowed on top of --threshold before a latency change counts
+LATENCY_NOISE_MS = 5.0
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of ``values`` (0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def git_revision():
+    def git(*args):
+        result = subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else ''
+    return git('rev-parse', '--short', 'HEAD') or 'unknown', bool(git('status', '--porcelain', '--untracked-files=no'))
+
+
+class Bench:
+    """The app under test, wired to the fake servers, plus the helpers scenarios share."""
+
+    def __init__(self, graph, groq, cold):
+        self.graph = graph
+        self.groq = groq
+        self.cold = cold
+        # Settings are read once per process, so the environment has to be in place before the app is imported
+        os.environ.update({
+            'GRAPH_API_BASE_URL': graph.base_url,
+            'GROQ_BASE_URL': groq.base_url,
+            'GROQ_API_KEY': 'bench-key',
+            'FACEBOOK_PAGE_ID': PAGE_ID,
+            'FACEBOOK_PAGE_ACCESS_TOKEN': 'bench-token',
+            'MONGODB_DB': BENCH_DB,
+            'QUERY_PLAN_CHECK': 'false',
+            # Measure the live Graph and Groq paths rather than what MongoDB already holds
+            'COMMENT_STORE_ENABLED': 'false',
+            'SENTIMENT_CACHE_PERSIST': 'false',
+        })
+        from app import create_app
+        self.app = create_app()
+        self.app.config['TESTING'] = True
+
+    def services(self):
+        return self.app.extensions['services']
+
+    def bench_user(self):
+        from app.models import User
+        user = User.objects(email=BENCH_USER_EMAIL).first()
+        if user is None:
+            user = User(email=BENCH_USER_EMAIL, name='Benchmark')
+            user.set_password('bench')
+            user.save()
+        return user
+
+    def reset_caches(self):
+        """Drop every in-process cache so each iteration pays for its outbound calls."""
+        from app.services.facebook_service import graph_cache
+        from app.services.llm_service import response_cache, sentiment_cache
+        graph_cache.clear()
+        sentiment_cache.memory.clear()
+        response_cache.clear()
+
+    def dashboard(self):
+        service = self.services().dashboard
+
+        def run():
+            with self.app.app_context():
+                service.get_dashboard_data()
+        return None, run
+
+    def monitor(self):
+        client = self.app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(self.bench_user().id)
+            session['_fresh'] = True
+
+        def run():
+            response = client.get('/comments/monitor')
+            if response.status_code != 200:
+                raise click.ClickException(f"/comments/monitor returned {response.status_code}")
+        return None, run
+
+    def scheduler(self, posts_per_run=20):
+        from app.models import ScheduledPost
+        user = self.bench_user()
+        service = self.services().scheduling
+
+        def prepare():
+            ScheduledPost.objects(user=user).delete()
+            due = datetime.utcnow() - timedelta(seconds=1)
+            ScheduledPost.objects.insert([
+                ScheduledPost(user=user, message=f"Benchmark post {number}", scheduled_time=due)
+                for number in range(posts_per_run)
+            ])
+
+        def run():
+            with self.app.app_context():
+                stats = service.process_scheduled_posts(batch_size=posts_per_run)
+            if stats['claimed'] != posts_per_run:
+                raise click.ClickException(f"Scheduler claimed {stats['claimed']} of {posts_per_run} posts")
+        return prepare, run
+
+    def measure(self, name, iterations, warmup):
+        prepare, run = getattr(self, name)()
+
+        def once():
+            if self.cold:
+                self.reset_caches()
+            if prepare:
+                prepare()
+            self.graph.reset_counts()
+            self.groq.reset_counts()
+            started = time.perf_counter()
+            run()
+            return (time.perf_counter() - started) * 1000
+
+        for _ in range(warmup):
+            once()
+
+        latencies = []
+        routes = {}
+        details = {}
+        for _ in range(iterations):
+            latencies.append(once())
+            for source, counts in (('graph', self.graph.counts()), ('groq', self.groq.counts())):
+                for route, count in counts.items():
+                    key = f"{source} {route}"
+                    routes[key] = routes.get(key, 0) + count
+            for source, counts in (('graph', self.graph.details()), ('groq', self.groq.details())):
+                for key, count in counts.items():
+                    details[f"{source} {key}"] = details.get(f"{source} {key}", 0) + count
+
+        # Tracing slows allocation-heavy code down, so memory gets an iteration of its own
+        tracemalloc.start()
+        once()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        per_iteration = {key: round(count / iterations, 2) for key, count in sorted(routes.items())}
+        return {
+            'iterations': iterations,
+            'p50_ms': round(percentile(latencies, 50), 1),
+            'p95_ms': round(percentile(latencies, 95), 1),
+            'p99_ms': round(percentile(latencies, 99), 1),
+            'mean_ms': round(sum(latencies) / iterations, 1),
+            'max_ms': round(max(latencies), 1),
+            'graph_calls': round(sum(v for k, v in per_iteration.items() if k.startswith('graph ')), 2),
+            'groq_calls': round(sum(v for k, v in per_iteration.items() if k.startswith('groq ')), 2),
+            'calls_by_route': per_iteration,
+            'details': {key: round(count / iterations, 2) for key, count in sorted(details.items())},
+            'peak_traced_kib': round(peak / 1024, 1),
+            'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        }
+
+
+SCENARIOS = ('dashboard', 'monitor', 'scheduler')
+
+
+def compare(results, baseline, threshold):
+    """Print each metric's change from ``baseline``; returns the regressions found."""
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        click.echo(f"\n{name} vs {baseline['meta']['revision']}:")
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'graph_calls', 'groq_calls', 'peak_traced_kib'):
+            old, new = previous.get(metric), current.get(metric)
+            if old is None:
+                continue
+            change = (new - old) / old * 100 if old else (0.0 if new == old else float('inf'))
+            allowed = old * (1 + threshold / 100) + (LATENCY_NOISE_MS if metric.endswith('_ms') else 0)
+            # Call counts are deterministic, so any increase is a regression
+            regressed = new > old if metric.endswith('_calls') else new > allowed
+            flag = '  REGRESSION' if regressed else ''
+            click.echo(f"  {metric:>16}: {old:>10} -> {new:>10} ({change:+.1f}%){flag}")
+            if regressed:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def fake_options(command):
+    options = [
+        click.option('--graph-latency', type=float, default=60.0, help='Graph API latency per call in ms'),
+        click.option('--groq-latency', type=float, default=250.0, help='Groq time to first token in ms'),
+        click.option('--ms-per-token', type=float, default=1.0, help='Groq generation time per completion token'),
+        click.option('--jitter', type=float, default=0.2, help='Latency varies by up to this fraction'),
+        click.option('--error-rate', type=float, default=0.0, help='Share of calls answered with 500/429'),
+        click.option('--posts', type=int, default=25, help='Posts on the fake page'),
+        click.option('--comments-per-post', type=int, default=20, help='Comments on each fake post'),
+        click.option('--seed', type=int, default=1),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def start_fakes(graph_latency, groq_latency, ms_per_token, jitter, error_rate, posts, comments_per_post, seed,
+                graph_port=0, groq_port=0):
+    graph = FakeGraphAPI(
+        posts=posts, comments_per_post=comments_per_post, latency_ms=graph_latency, jitter=jitter,
+        error_rate=error_rate, seed=seed, port=graph_port
+    ).start()
+    groq = FakeGroqAPI(
+        ms_per_token=ms_per_token, latency_ms=groq_latency, jitter=jitter, error_rate=error_rate,
+        seed=seed, port=groq_port
+    ).start()
+    return graph, groq
+
+
+@click.group()
+def cli():
+    """Benchmarks against local Graph API and Groq stand-ins."""
+
+
+@cli.command()
+@click.option('--scenario', '-s', 'scenarios', multiple=True, type=click.Choice(SCENARIOS),
+              help='Scenario to run (repeatable; default: all)')
+@click.option('--iterations', '-n', type=int, default=20)
+@click.option('--warmup', type=int, default=2)
+@click.option('--cold/--warm', default=True, help='Clear in-process caches before every iteration')
+@click.option('--output-dir', default=os.path.join(ROOT, 'benchmark_results'), type=click.Path(file_okay=False))
+@click.option('--compare', 'baseline_path', type=click.Path(exists=True, dir_okay=False),
+              help='Earlier results file to compare against')
+@click.option('--threshold', type=float, default=10.0, help='Percent slowdown or growth that counts as a regression')
+@fake_options
+def run(scenarios, iterations, warmup, cold, output_dir, baseline_path, threshold, **fake_config):
+    """Run scenarios, save the results and optionally compare them with a baseline."""
+    graph, groq = start_fakes(**fake_config)
+    try:
+        bench = Bench(graph, groq, cold)
+        results = {}
+        for name in scenarios or SCENARIOS:
+            click.echo(f"Running {name} ({iterations} iterations)...")
+            results[name] = bench.measure(name, iterations, warmup)
+            summary = results[name]
+            click.echo(
+                f"  p50 {summary['p50_ms']}ms  p95 {summary['p95_ms']}ms  p99 {summary['p99_ms']}ms  "
+                f"graph {summary['graph_calls']}/it  groq {summary['groq_calls']}/it  "
+                f"peak {summary['peak_traced_kib']}KiB"
+            )
+    finally:
+        graph.stop()
+        groq.stop()
+
+    revision, dirty = git_revision()
+    report = {
+        'meta': {
+            'revision': revision,
+            'dirty': dirty,
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'python': sys.version.split()[0],
+            'iterations': iterations,
+            'warmup': warmup,
+            'cold': cold,
+            'fakes': fake_config
+        },
+        'scenarios': results
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    path = os.path.join(output_dir, f"{stamp}_{revision}{'-dirty' if dirty else ''}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"Saved {path}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('fakes') != fake_config:
+            click.echo("Warning: the baseline used different fake server settings")
+        regressions = compare(report, baseline, threshold)
+        if regressions:
+            click.echo(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        click.echo("\nNo regressions")
+
+
+@cli.command()
+@click.option('--graph-port', type=int, default=8901)
+@click.option('--groq-port', type=int, default=8902)
+@fake_options
+def serve(graph_port, groq_port, **fake_config):
+    """Run the fake servers until interrupted, e.g. behind a local dev server."""
+    graph, groq = start_fakes(graph_port=graph_port, groq_port=groq_port, **fake_config)
+    click.echo(f"GRAPH_API_BASE_URL={graph.base_url}")
+    click.echo(f"GROQ_BASE_URL={groq.base_url}")
+    click.echo(f"FACEBOOK_PAGE_ID={PAGE_ID}")
+    try:
+        while True:
+            time.sleep(60)
+            click.echo(json.dumps({'graph': graph.counts(), 'groq': groq.counts()}))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        graph.stop()
+        groq.stop()
+
+
+if __name__ == '__main__':
+    cli()
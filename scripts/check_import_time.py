@@ -0,0 +1,95 @@
+"""Fail when cold-start import time or the set of eagerly imported modules regresses.
+
+Each target is imported in a fresh interpreter under ``python -X importtime``.
+The script sums the cumulative time of the top-level imports and compares it
+to the target's budget. It also checks that modules the target must not pay
+for (e.g. langchain for the CLI) were not imported at all. The median of
+several runs is used, since a single cold import is noisy.
+
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --runs 7 --scale 1.5   # slower CI machines
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name: (statement, budget in ms, modules that must not be imported)
+TARGETS = {
+    'cli': (
+        'import run',
+        150,
+        ('app', 'pymongo', 'mongoengine', 'groq', 'langchain', 'langchain_groq', 'httpx', 'pandas', 'plotly'),
+    ),
+    'app': (
+        'from app import create_app',
+        600,
+        ('groq', 'langchain', 'langchain_groq', 'pandas', 'plotly'),
+    ),
+    'create_app': (
+        'from app import create_app; create_app()',
+        1500,
+        ('groq', 'langchain', 'langchain_groq', 'pandas', 'plotly'),
+    ),
+}
+
+_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure(statement):
+    """Return (total ms, imported module names) for one cold run of ``statement``."""
+    env = dict(os.environ, QUERY_PLAN_CHECK='false')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules.add(name)
+        if len(indent) == 1:  # Top-level import; nested ones are inside its cumulative time
+            total_us += cumulative
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('targets', nargs='*', choices=sorted(TARGETS), help='Targets to check (default: all)')
+    parser.add_argument('--runs', type=int, default=5, help='Cold runs per target; the median is compared')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget, e.g. for slow machines')
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.targets or TARGETS:
+        statement, budget_ms, forbidden = TARGETS[name]
+        budget_ms *= args.scale
+        timings = []
+        imported = set()
+        for _ in range(args.runs):
+            elapsed_ms, modules = measure(statement)
+            timings.append(elapsed_ms)
+            imported |= modules
+
+        median_ms = statistics.median(timings)
+        leaked = sorted(module for module in forbidden if module in imported)
+        ok = median_ms <= budget_ms and not leaked
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:<11} {median_ms:7.1f}ms (budget {budget_ms:.0f}ms)"
+              + (f"  imports {', '.join(leaked)}" if leaked else ''))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
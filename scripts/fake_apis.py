@@ -0,0 +1,394 @@
+"""Local stand-ins for the Graph API and Groq's chat completions API.
+
+Both servers answer in the shapes FacebookService and LLMService expect,
+with configurable latency, error rate and data volume, and count every
+request they serve so benchmarks can report outbound calls. They only use
+the standard library and run in background threads:
+
+    graph = FakeGraphAPI(posts=25, comments_per_post=40, latency_ms=80).start()
+    groq = FakeGroqAPI(latency_ms=300, ms_per_token=2).start()
+    os.environ['GRAPH_API_BASE_URL'] = graph.base_url
+    os.environ['GROQ_BASE_URL'] = groq.base_url
+
+``python scripts/benchmark.py serve`` runs them standalone.
+"""
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+GRAPH_VERSION = 'v18.0'
+PAGE_ID = 'benchpage'
+
+# Comments repeat on real pages; a small pool keeps the caches' hit rates realistic
+COMMENT_POOL = [
+    "When is it coming out on Android?",
+    "Thanks!",
+    "Price?",
+    "This is amazing, love it!",
+    "Still waiting for my refund, terrible support.",
+    "Do you ship to Canada?",
+    "The last update broke the login page.",
+    "Great post, very helpful.",
+    "Is there a student discount?",
+    "Not impressed with the new design.",
+    "Can I use this with my team account?",
+    "Awesome work everyone 🎉",
+]
+POST_POOL = [
+    "Our spring release is here with faster sync and a new dashboard.",
+    "Five tips to get more out of scheduled posts this week.",
+    "We're hiring! Join our support team.",
+    "Behind the scenes at our product offsite.",
+    "Customer story: how a small bakery doubled its reach.",
+]
+
+
+class _FakeServer(ABC):
+    """Shared plumbing: a threaded HTTP server with latency, errors and call counters."""
+
+    def __init__(self, latency_ms: float = 0.0, jitter: float = 0.2, error_rate: float = 0.0,
+                 seed: int = 1, host: str = '127.0.0.1', port: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._counts: Counter = Counter()  # HTTP requests served, by route
+        self._details: Counter = Counter()  # Work done inside them: batch sub-requests, tokens
+        self._counts_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    @abstractmethod
+    def base_url(self) -> str:
+        """What to set GRAPH_API_BASE_URL or GROQ_BASE_URL to."""
+
+    def start(self) -> '_FakeServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real APIs
+
+            def do_GET(self):
+                server._dispatch(self, 'GET')
+
+            def do_POST(self):
+                server._dispatch(self, 'POST')
+
+            def do_DELETE(self):
+                server._dispatch(self, 'DELETE')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            return dict(self._counts)
+
+    def details(self) -> Dict[str, int]:
+        with self._counts_lock:
+            return dict(self._details)
+
+    def reset_counts(self) -> None:
+        with self._counts_lock:
+            self._counts.clear()
+            self._details.clear()
+
+    def _count(self, route: str) -> None:
+        with self._counts_lock:
+            self._counts[route] += 1
+
+    def _note(self, key: str, amount: int = 1) -> None:
+        with self._counts_lock:
+            self._details[key] += amount
+
+    def _roll(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+    def _sleep(self, extra_ms: float = 0.0) -> None:
+        delay = self.latency_ms * (1 + self.jitter * (2 * self._roll() - 1)) + extra_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b''
+        try:
+            self.handle(handler, method, body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    @abstractmethod
+    def handle(self, handler: BaseHTTPRequestHandler, method: str, body: bytes) -> None:
+        """Answer one request; ``body`` is the raw request body."""
+
+    @staticmethod
+    def _send_json(handler: BaseHTTPRequestHandler, status: int, payload: Any) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class FakeGraphAPI(_FakeServer):
+    """The Graph endpoints FacebookService uses: feed, comments, insights, posts, replies and ``?batch=``.
+
+    Data is generated deterministically from the seed: ``posts`` posts on
+    one page, each with ``comments_per_post`` comments, paginated with
+    ``paging.next`` like the real API. ``error_rate`` turns that share of
+    calls (and batch sub-requests) into 500 responses.
+    """
+
+    def __init__(self, posts: int = 25, comments_per_post: int = 20, **kwargs):
+        super().__init__(**kwargs)
+        self.posts = posts
+        self.comments_per_post = comments_per_post
+        self._created = 0
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self._feed = [
+            {
+                "id": f"{PAGE_ID}_{index}",
+                "message": f"{POST_POOL[index % len(POST_POOL)]} #{index}",
+                "created_time": self._format_time(now - timedelta(hours=6 * index)),
+                "permalink_url": f"https://www.facebook.com/{PAGE_ID}/posts/{index}"
+            }
+            for index in range(posts)
+        ]
+        self._comments = {
+            post["id"]: [
+                {
+                    "id": f"{index}_{number}",
+                    "message": COMMENT_POOL[(index * 7 + number) % len(COMMENT_POOL)],
+                    "from": {"name": f"Fan {number}", "id": f"user{number}"},
+                    "created_time": self._format_time(now - timedelta(hours=6 * index, minutes=number))
+                }
+                for number in range(comments_per_post)
+            ]
+            for index, post in enumerate(self._feed)
+        }
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/{GRAPH_VERSION}"
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str, body: bytes) -> None:
+        url = urlsplit(handler.path)
+        path = url.path[len(f"/{GRAPH_VERSION}"):].strip('/')
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == 'POST':
+            params.update({key: values[-1] for key, values in parse_qs(body.decode('utf-8')).items()})
+
+        if method == 'POST' and not path:
+            self._count('POST batch')
+            self._sleep()
+            self._send_json(handler, 200, self._batch(json.loads(params.get('batch', '[]'))))
+            return
+
+        status, payload, route = self._route(method, path, params)
+        self._count(route)
+        self._sleep()
+        self._send_json(handler, status, payload)
+
+    def _batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        results = []
+        for request in requests:
+            url = urlsplit(request.get('relative_url', ''))
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            status, payload, route = self._route(request.get('method', 'GET'), url.path.strip('/'), params)
+            self._note(f"batched {route}")
+            results.append({"code": status, "body": json.dumps(payload)})
+        return results
+
+    def _route(self, method: str, path: str, params: Dict[str, str]) -> Tuple[int, Dict[str, Any], str]:
+        parts = path.split('/')
+        edge = parts[1] if len(parts) > 1 else ''
+        route = f"{method} {'{id}/' + edge if edge else '{id}'}"
+        if self.error_rate and self._roll() < self.error_rate:
+            return 500, {"error": {"message": "An unexpected error has occurred.", "code": 2}}, route
+
+        object_id = parts[0]
+        if method == 'GET' and edge == 'feed':
+            return 200, self._page(self._feed, params, path), route
+        if method == 'GET' and edge == 'comments':
+            comments = self._comments.get(object_id, [])
+            if 'since' in params:
+                since = int(params['since'])
+                comments = [c for c in comments if self._parse_time(c['created_time']) >= since]
+            return 200, self._page(comments, params, path), route
+        if method == 'GET' and edge == 'insights':
+            return 200, {"data": [
+                {"name": "post_impressions", "values": [{"value": 1000 + len(object_id) * 37}]},
+                {"name": "post_engagements", "values": [{"value": 40 + len(object_id)}]}
+            ]}, route
+        if method == 'GET' and not edge:
+            post = next((post for post in self._feed if post['id'] == object_id), None)
+            if post is None:
+                return 404, {"error": {"message": "Unsupported get request.", "code": 100}}, route
+            return 200, post, route
+        if method == 'POST' and edge in ('feed', 'comments'):
+            with self._random_lock:
+                self._created += 1
+                created = self._created
+            return 200, {"id": f"{object_id}_new{created}"}, route
+        if method in ('POST', 'DELETE') and not edge:
+            return 200, {"success": True}, route
+        return 400, {"error": {"message": f"Unknown path {path}", "code": 100}}, route
+
+    def _page(self, items: List[Dict[str, Any]], params: Dict[str, str], path: str) -> Dict[str, Any]:
+        limit = int(params.get('limit', 25))
+        offset = int(params.get('after', 0))
+        page = {"data": items[offset:offset + limit]}
+        if offset + limit < len(items):
+            query = dict(params, after=offset + limit)
+            page["paging"] = {"next": f"{self.base_url}/{path}?{urlencode(query)}"}
+        return page
+
+    @staticmethod
+    def _format_time(value: datetime) -> str:
+        return value.strftime('%Y-%m-%dT%H:%M:%S+0000')
+
+    @staticmethod
+    def _parse_time(value: str) -> int:
+        return int(datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z').timestamp())
+
+
+class FakeGroqAPI(_FakeServer):
+    """Groq's OpenAI-compatible ``/openai/v1/chat/completions``, streaming included.
+
+    Latency is ``latency_ms`` to the first token plus ``ms_per_token`` for
+    each generated token. Answers follow the prompt's expected format:
+    sentiment JSON for sentiment prompts, a summary/topics object for
+    audience feedback and a few lines of text otherwise. ``error_rate``
+    answers that share of calls with 429 rate-limit errors.
+    """
+
+    def __init__(self, ms_per_token: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.ms_per_token = ms_per_token
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str, body: bytes) -> None:
+        if method != 'POST' or not urlsplit(handler.path).path.endswith('/chat/completions'):
+            self._send_json(handler, 404, {"error": {"message": "Unknown path", "type": "invalid_request_error"}})
+            return
+
+        request = json.loads(body or b'{}')
+        stream = bool(request.get('stream'))
+        self._count('chat.completions stream' if stream else 'chat.completions')
+        if self.error_rate and self._roll() < self.error_rate:
+            self._note('rate limited')
+            self._send_json(handler, 429, {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}})
+            return
+
+        prompt = "\n".join(message.get('content', '') for message in request.get('messages', []))
+        content = self._answer(prompt)
+        prompt_tokens = len(prompt) // 4 + 1
+        completion_tokens = len(content) // 4 + 1
+        self._note('prompt tokens', prompt_tokens)
+        self._note('completion tokens', completion_tokens)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+
+        if stream:
+            self._stream(handler, request, content, usage)
+            return
+        self._sleep(completion_tokens * self.ms_per_token)
+        self._send_json(handler, 200, {
+            "id": f"chatcmpl-bench{int(time.time() * 1000)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get('model'),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    def _stream(self, handler: BaseHTTPRequestHandler, request: Dict[str, Any], content: str,
+                usage: Dict[str, int]) -> None:
+        self._sleep()
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/event-stream')
+        handler.send_header('Connection', 'close')
+        handler.end_headers()
+        handler.close_connection = True
+        words = re.findall(r'\S+\s*', content)
+        for index, word in enumerate(words):
+            chunk = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get('model'),
+                "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]
+            }
+            if index == len(words) - 1:
+                chunk["choices"][0]["finish_reason"] = "stop"
+                chunk["x_groq"] = {"usage": usage}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            handler.wfile.flush()
+            if self.ms_per_token:
+                time.sleep(self.ms_per_token * (len(word) // 4 + 1) / 1000)
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+    def _answer(self, prompt: str) -> str:
+        lowered = prompt.lower()
+        if 'classify the sentiment of each' in lowered:
+            match = re.search(r'\[.*\]', prompt, re.DOTALL)
+            items = json.loads(match.group(0)) if match else []
+            return json.dumps([
+                {"id": item["id"], **self._sentiment(item.get("text", ""))} for item in items
+            ])
+        if 'analyze the sentiment' in lowered:
+            return json.dumps(self._sentiment(prompt.rsplit('Text:', 1)[-1]))
+        if 'main topics being discussed' in lowered:
+            return json.dumps({
+                "summary": "Fans like the new release; support response times draw complaints.",
+                "topics": [{"name": "release", "sentiment": "positive"}, {"name": "support", "sentiment": "negative"}]
+            })
+        if 'suggest 3 social media posts' in lowered:
+            return "\n".join(
+                f"Post: Benchmark suggestion {number} with a clear call to action #bench\nWhy: Matches the audience"
+                for number in range(1, 4)
+            )
+        if 'quick, professional, and friendly replies' in lowered:
+            return "Thanks so much for the kind words! 😊\nWe appreciate you sharing this!\nGreat question, we'll DM you the details 🙌"
+        return ("Thanks for reaching out! We're glad you're enjoying it, and we'll share more news soon. "
+                "Stay tuned for updates 🚀")
+
+    @staticmethod
+    def _sentiment(text: str) -> Dict[str, Any]:
+        lowered = text.lower()
+        if any(word in lowered for word in ('terrible', 'broke', 'not impressed', 'waiting')):
+            return {"sentiment": "negative", "confidence": 0.9}
+        if any(word in lowered for word in ('love', 'great', 'awesome', 'amazing', 'thanks')):
+            return {"sentiment": "positive", "confidence": 0.9}
+        return {"sentiment": "neutral", "confidence": 0.7}
@@ -0,0 +1,71 @@
+"""The streamed auto-reply must never post a reply that was cut off mid-stream."""
+from types import SimpleNamespace
+
+import pytest
+
+from app import create_app
+from app.blueprints import comments
+from app.services import llm_service as llm_module
+from app.services.llm_service import LLMService
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class _FakeFacebook:
+    def __init__(self):
+        self.replies = []
+
+    def reply_to_comment(self, comment_id, message, post_id=None):
+        self.replies.append((comment_id, message))
+        return {'id': f"{comment_id}_reply"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = create_app()
+    app.config.update(TESTING=True, LOGIN_DISABLED=True)
+    facebook = _FakeFacebook()
+    app.extensions['services'] = SimpleNamespace(llm=LLMService(), facebook=facebook)
+
+    profile = SimpleNamespace(category='Retail', target_audience='Shoppers', content_language='English')
+    monkeypatch.setattr(comments, 'PageProfile', SimpleNamespace(
+        objects=lambda **kwargs: SimpleNamespace(first=lambda: profile)
+    ))
+    monkeypatch.setattr(comments, 'DashboardSnapshot', SimpleNamespace(mark_stale=lambda user: None))
+    monkeypatch.setattr(comments, '_active_strategy', lambda: None)
+    monkeypatch.setattr(llm_module.response_cache, 'mode', 'off')
+    return app.test_client(), app.extensions['services'].llm, facebook
+
+
+def _events(response):
+    return [block.split('\n', 1)[0][len('event: '):] for block in response.get_data(as_text=True).split('\n\n') if block]
+
+
+def test_interrupted_stream_posts_nothing(client, monkeypatch):
+    test_client, llm, facebook = client
+
+    def broken_stream(request, priority, **options):
+        yield _chunk("Thanks for reaching out, we")
+        raise ConnectionError("stream reset")
+
+    monkeypatch.setattr(llm, '_create', broken_stream)
+    response = test_client.post('/comments/auto-reply/c1/stream', json={'comment': 'Where is my order?'})
+
+    assert _events(response) == ['token', 'error']
+    assert facebook.replies == []
+
+
+def test_finished_stream_posts_the_whole_reply(client, monkeypatch):
+    test_client, llm, facebook = client
+
+    def stream(request, priority, **options):
+        yield _chunk("Thanks for reaching out, ")
+        yield _chunk("we'll check your order.")
+
+    monkeypatch.setattr(llm, '_create', stream)
+    response = test_client.post('/comments/auto-reply/c1/stream', json={'comment': 'Where is my order?'})
+
+    assert _events(response) == ['token', 'token', 'done']
+    assert facebook.replies == [('c1', "Thanks for reaching out, we'll check your order.")]
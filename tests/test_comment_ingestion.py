@@ -0,0 +1,60 @@
+"""Sentiment labels outside positive/negative/neutral must not break the per-post counters."""
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services import comment_ingestion_service as ingestion
+from app.services.comment_ingestion_service import CommentIngestionService
+from app.services.llm_service import LLMService
+
+
+class _FakeLLM:
+    def __init__(self, results):
+        self.results = results
+
+    def analyze_sentiment_batch(self, messages):
+        return self.results[:len(messages)]
+
+
+class _CursorRecorder:
+    def __init__(self):
+        self.updates = []
+
+    def objects(self, **query):
+        return SimpleNamespace(
+            update_one=lambda **update: self.updates.append((query, update)),
+            update=lambda **update: None
+        )
+
+
+def _comment(service, number, message):
+    return service._to_document(
+        {'id': 'post1', 'message': 'Spring sale'},
+        {'id': f"c{number}", 'message': message},
+        datetime(2024, 1, 1, 12, number)
+    )
+
+
+def test_off_label_llm_sentiment_counts_as_neutral(monkeypatch):
+    service = CommentIngestionService(fb_service=object(), llm_service=_FakeLLM([
+        {'sentiment': 'Positive', 'confidence': 0.9},
+        {'sentiment': 'mixed', 'confidence': 0.6},
+    ]))
+    comments = [_comment(service, 1, 'Love it'), _comment(service, 2, 'Nice, but pricey'), _comment(service, 3, '')]
+
+    service._classify(comments)
+    assert [comment.sentiment for comment in comments] == ['positive', 'neutral', 'neutral']
+
+    cursors = _CursorRecorder()
+    monkeypatch.setattr(ingestion, 'PostCommentCursor', cursors)
+    service._update_cursors(comments, ['post1'], datetime(2024, 1, 1, 13))
+
+    (_, update), = cursors.updates
+    assert update['inc__positive_count'] == 1
+    assert update['inc__neutral_count'] == 2
+    assert update['inc__negative_count'] == 0
+
+
+def test_single_sentiment_parse_normalizes_the_label():
+    result = LLMService()._parse_sentiment_result('{"sentiment": "Mixed", "confidence": 0.7}')
+    assert result == {'sentiment': 'neutral', 'confidence': 0.7}
+    assert LLMService()._parse_sentiment_result('{"sentiment": " NEGATIVE "}')['sentiment'] == 'negative'